@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import statistics
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Integer, Select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from . import queries
+from .explain import Explain, summarize_plan
+from .index import INDEX_NAMES, POSTGRES_INDEXES, comparison_queries, index_sizes
+from .models import Base
+
+logger = logging.getLogger(__name__)
+
+TABLE_PATTERN = re.compile(r"\bON (\w+)")
+
+# A query only counts as helped if an index saves more than this fraction of
+# its time, so run-to-run jitter isn't mistaken for a benefit.
+NOISE = 0.10
+
+# Rows inserted into each indexed table per run of the report queries, the
+# default exchange rate between an index's write cost and the time it saves
+WRITES_PER_RUN = 100.0
+
+
+@dataclass(slots=True)
+class Trial:
+    """Query and write timings with one combination of candidate indexes."""
+
+    query_ms: dict[str, float] = field(default_factory=dict)
+    insert_us: dict[str, float] = field(default_factory=dict)
+    sizes: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexAdvice:
+    name: str
+    table: str
+    size_bytes: int
+    # Total query time saved with only this index, against none of them
+    alone_ms: float
+    # Total query time lost by dropping this index from the full set
+    marginal_ms: float
+    # Extra time to insert a row into the indexed table, None if unmeasured
+    write_us: float | None
+    helped: tuple[str, ...]
+    # Marginal time saved less the write cost of `WRITES_PER_RUN` inserts
+    net_ms: float
+
+    @property
+    def benefit_per_mib(self) -> float:
+        return self.net_ms / max(self.size_bytes / 2**20, 1 / 1024)
+
+
+def index_table(sql: str) -> str:
+    match = TABLE_PATTERN.search(sql)
+    if match is None:
+        raise ValueError(f"No table in index statement: {sql}")
+    return match.group(1)
+
+
+def advise(
+    candidates: Mapping[str, str],
+    baseline: Trial,
+    everything: Trial,
+    alone: Mapping[str, Trial],
+    without: Mapping[str, Trial],
+    *,
+    writes_per_run: float = WRITES_PER_RUN,
+) -> list[IndexAdvice]:
+    """Rank candidate indexes by marginal query time saved, less the cost of
+    `writes_per_run` inserts into their table, per MiB of index
+
+    An index whose write cost couldn't be measured is ranked on query time
+    alone.
+    """
+    advice = []
+    for name, sql in candidates.items():
+        table = index_table(sql)
+        marginal_ms = sum(
+            without[name].query_ms[query] - ms
+            for query, ms in everything.query_ms.items()
+        )
+        with_index = alone[name].insert_us.get(table)
+        without_index = baseline.insert_us.get(table)
+        write_us = (
+            None
+            if with_index is None or without_index is None
+            else with_index - without_index
+        )
+        helped = tuple(
+            query
+            for query, ms in baseline.query_ms.items()
+            if ms - alone[name].query_ms[query] > ms * NOISE
+        )
+        advice.append(
+            IndexAdvice(
+                name=name,
+                table=table,
+                size_bytes=alone[name].sizes.get(name, 0),
+                alone_ms=sum(
+                    ms - alone[name].query_ms[query]
+                    for query, ms in baseline.query_ms.items()
+                ),
+                marginal_ms=marginal_ms,
+                write_us=write_us,
+                helped=helped,
+                # A write cost below zero is jitter, not a saving
+                net_ms=marginal_ms - max(write_us or 0.0, 0.0) * writes_per_run / 1000,
+            )
+        )
+
+    return sorted(advice, key=lambda a: (a.benefit_per_mib, a.alone_ms), reverse=True)
+
+
+def advisor_queries(member_id: int, now: datetime) -> dict[str, Select[Any]]:
+    """Every report query, plus the time-range scans the BRIN indexes serve"""
+    return comparison_queries(member_id, now) | {
+        "unpaid-fines": queries.unpaid_fines_members(0.0),
+        "copies-on-loan": queries.copies_on_loan(20),
+        "genre-fine-stats": queries.genre_fine_statistics(),
+    }
+
+
+async def _query_ms(
+    conn: AsyncConnection, stmts: Mapping[str, Select[Any]], repeats: int
+) -> dict[str, float]:
+    """Median planning plus execution time of each query, from EXPLAIN ANALYZE"""
+    timings = {}
+    for name, stmt in stmts.items():
+        samples = []
+        for _ in range(repeats):
+            explained = (await conn.execute(Explain(stmt))).scalar_one()
+            if isinstance(explained, str):
+                explained = json.loads(explained)
+            summary = summarize_plan(explained)
+            samples.append(summary.planning_ms + summary.execution_ms)
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def copy_rows_sql(table: str, rows: int) -> str:
+    """INSERT copying up to `rows` rows of `table` under fresh keys
+
+    Integer keys continue from the table's largest, other unique values get
+    a suffix, or NULL where allowed, so the copies violate no constraint and
+    every column's indexes are written.
+    """
+    columns = []
+    values = []
+    for column in Base.metadata.tables[table].columns:
+        value = column.name
+        if column.primary_key or column.unique:
+            if isinstance(column.type, Integer):
+                value = (
+                    f"(SELECT coalesce(max({column.name}), 0) FROM {table}) "
+                    "+ row_number() OVER ()"
+                )
+            elif column.nullable:
+                value = "NULL"
+            else:
+                value = f"{column.name} || '-' || row_number() OVER ()"
+        columns.append(column.name)
+        values.append(value)
+
+    # Returned loans only, so the copies don't collide with active loans
+    where = " WHERE return_date IS NOT NULL" if table == "loans" else ""
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM {table}{where} LIMIT {rows}"
+    )
+
+
+async def _insert_us(conn: AsyncConnection, table: str, rows: int) -> float | None:
+    """Microseconds per row to copy `rows` existing rows, rolled back after,
+    or None if they couldn't be copied"""
+    savepoint = await conn.begin_nested()
+    try:
+        start = time.perf_counter()
+        result = await conn.execute(text(copy_rows_sql(table, rows)))
+        elapsed = time.perf_counter() - start
+    except DBAPIError as e:
+        logger.warning(f"Could not time inserts into '{table}': {e.orig}")
+        return None
+    finally:
+        await savepoint.rollback()
+
+    if not result.rowcount:
+        logger.warning(f"Could not time inserts into '{table}': it has no rows.")
+        return None
+    return elapsed * 1e6 / result.rowcount
+
+
+async def _trial(
+    engine: AsyncEngine,
+    installed: list[str],
+    stmts: Mapping[str, Select[Any]],
+    tables: set[str],
+    *,
+    repeats: int,
+    write_rows: int,
+) -> Trial:
+    """Time everything with exactly `installed` present, then roll back"""
+    trial = Trial()
+    async with engine.connect() as conn:
+        for name in INDEX_NAMES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for name in installed:
+            await conn.execute(text(POSTGRES_INDEXES[name]))
+
+        trial.sizes = await index_sizes(conn, installed)
+        trial.query_ms = await _query_ms(conn, stmts, repeats)
+        for table in sorted(tables):
+            insert_us = await _insert_us(conn, table, write_rows)
+            if insert_us is not None:
+                trial.insert_us[table] = insert_us
+
+        await conn.rollback()
+    return trial
+
+
+async def index_report(
+    database_url: str,
+    *,
+    member_id: int = 1,
+    repeats: int = 5,
+    write_rows: int = 1000,
+    writes_per_run: float = WRITES_PER_RUN,
+) -> list[IndexAdvice]:
+    """Measure and rank each candidate index by what it saves and what it costs
+
+    Every combination is built and timed inside a transaction that is rolled
+    back, so the database is left as it was. The DDL holds table locks for
+    the length of each trial, so run this away from peak hours.
+    """
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+
+    try:
+        if engine.dialect.name != "postgresql":
+            logger.error("The index report requires PostgreSQL.")
+            return []
+
+        candidates = list(POSTGRES_INDEXES)
+        stmts = advisor_queries(member_id, datetime.now(tz=None))
+        tables = {index_table(sql) for sql in POSTGRES_INDEXES.values()}
+
+        async def run(installed: list[str]) -> Trial:
+            return await _trial(
+                engine,
+                installed,
+                stmts,
+                tables,
+                repeats=repeats,
+                write_rows=write_rows,
+            )
+
+        logger.info("Timing queries with no candidate indexes...")
+        baseline = await run([])
+        logger.info("Timing queries with every candidate index...")
+        everything = await run(candidates)
+
+        alone: dict[str, Trial] = {}
+        without: dict[str, Trial] = {}
+        for name in candidates:
+            logger.info(f"Timing queries with and without '{name}'...")
+            alone[name] = await run([name])
+            without[name] = await run([c for c in candidates if c != name])
+    finally:
+        await engine.dispose()
+
+    advice = advise(
+        POSTGRES_INDEXES,
+        baseline,
+        everything,
+        alone,
+        without,
+        writes_per_run=writes_per_run,
+    )
+
+    lines = [
+        f"\nQuery time (ms, median of {repeats}):\n",
+        f"{'Query':<18} {'No indexes':>11} {'All indexes':>12}",
+        "-" * 43,
+    ]
+    lines.extend(
+        f"{query:<18} {ms:>11.2f} {everything.query_ms[query]:>12.2f}"
+        for query, ms in baseline.query_ms.items()
+    )
+    lines.extend(
+        [
+            "\nIndexes ranked by query time saved, less the cost of "
+            f"{writes_per_run:g} inserts, per MiB:\n",
+            f"{'Index':<32} {'Size KiB':>9} {'Alone ms':>9} {'Marginal ms':>12} "
+            f"{'Write us/row':>13} {'Net ms':>8}  Helps",
+            "-" * 109,
+        ]
+    )
+    lines.extend(
+        f"{a.name:<32} {a.size_bytes / 1024:>9.1f} {a.alone_ms:>9.2f} "
+        f"{a.marginal_ms:>12.2f} "
+        f"{'unknown' if a.write_us is None else f'{a.write_us:.2f}':>13} "
+        f"{a.net_ms:>8.2f}  {', '.join(a.helped) or '-'}"
+        for a in advice
+    )
+    logger.info("\n".join(lines))
+    return advice
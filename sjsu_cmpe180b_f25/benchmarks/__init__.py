@@ -0,0 +1,29 @@
+from .load import LoadStats, run_load
+from .operations import OPERATIONS, Operation
+from .records import RecordCost, format_record_costs, measure_records
+from .runner import (
+    BenchmarkResult,
+    Regression,
+    benchmark_client,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+__all__ = [
+    "OPERATIONS",
+    "BenchmarkResult",
+    "LoadStats",
+    "Operation",
+    "RecordCost",
+    "Regression",
+    "benchmark_client",
+    "compare_results",
+    "format_record_costs",
+    "load_results",
+    "measure_records",
+    "run_load",
+    "run_benchmarks",
+    "save_results",
+]
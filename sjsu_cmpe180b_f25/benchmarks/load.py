@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import multiprocessing
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sjsu_cmpe180b_f25.cache import ReportCache
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.metrics import MetricsRegistry
+from sjsu_cmpe180b_f25.models import Copy, Fine, Loan, Member
+from sjsu_cmpe180b_f25.pool import PoolMonitor
+from sjsu_cmpe180b_f25.profiling import CallProfiler
+
+DEFAULT_MIX: dict[str, int] = {
+    "checkout": 4,
+    "return": 4,
+    "pay-fine": 1,
+    "report": 1,
+}
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+@dataclass(slots=True)
+class Targets:
+    """Rows the operations act on, shared by every worker in a process
+
+    Checkouts draw any copy, available or not, as patrons at a desk would.
+    """
+
+    copies: list[int]
+    members: list[int]
+    open_loans: list[int]
+    unpaid_fines: list[int]
+
+    def take(self, ids: list[int]) -> int | None:
+        """Remove and return a random ID, or None once they're used up"""
+        if not ids:
+            return None
+        i = random.randrange(len(ids))
+        ids[i], ids[-1] = ids[-1], ids[i]
+        return ids.pop()
+
+    def split(self, parts: int) -> list[Targets]:
+        """Deal the loans and fines out so no two processes share one"""
+        return [
+            Targets(
+                self.copies,
+                self.members,
+                self.open_loans[i::parts],
+                self.unpaid_fines[i::parts],
+            )
+            for i in range(parts)
+        ]
+
+
+@dataclass(slots=True)
+class OperationStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    # Calls the Client turned down, such as a checkout of a copy on loan
+    rejected: int = 0
+    # Draws with nothing left to act on, such as a return with no open loans
+    skipped: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def merge(self, other: OperationStats) -> None:
+        self.latencies_ms.extend(other.latencies_ms)
+        self.rejected += other.rejected
+        self.skipped += other.skipped
+        self.errors.update(other.errors)
+
+
+@dataclass(slots=True)
+class LoadStats:
+    elapsed_s: float = 0.0
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> int:
+        return sum(len(op.latencies_ms) for op in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.elapsed_s if self.elapsed_s else 0.0
+
+    def merge(self, other: LoadStats) -> None:
+        # Processes run side by side, so the run lasts as long as the slowest
+        self.elapsed_s = max(self.elapsed_s, other.elapsed_s)
+        for name, stats in other.operations.items():
+            self.operations.setdefault(name, OperationStats()).merge(stats)
+
+
+type Call = Callable[[], Awaitable[object]]
+
+
+def _draw(client: Client, targets: Targets, operation: str) -> Call | None:
+    """The call one draw of `operation` makes, or None if it has no target"""
+    match operation:
+        case "checkout":
+            if not targets.copies or not targets.members:
+                return None
+            copy_id = random.choice(targets.copies)
+            member_id = random.choice(targets.members)
+
+            async def checkout() -> object:
+                loan = await client.request_loan(copy_id=copy_id, member_id=member_id)
+                if loan is not None:
+                    targets.open_loans.append(loan.loan_id)
+                return loan
+
+            return checkout
+        case "return":
+            loan_id = targets.take(targets.open_loans)
+            if loan_id is None:
+                return None
+            return lambda: client.end_loan(loan_id=loan_id)
+        case "pay-fine":
+            fine_id = targets.take(targets.unpaid_fines)
+            if fine_id is None:
+                return None
+            return lambda: client.pay_fine(fine_id=fine_id)
+        case "report":
+            reports: list[Call] = [
+                client.get_top_books,
+                client.get_overdue_members,
+                client.get_unpaid_fines_members,
+                client.get_copies_on_loan,
+                client.get_genre_fine_statistics,
+            ]
+            return random.choice(reports)
+        case _:
+            raise ValueError(f"Unknown load operation '{operation}'")
+
+
+async def _worker(
+    client: Client,
+    targets: Targets,
+    mix: Mapping[str, int],
+    stats: LoadStats,
+    *,
+    deadline: float,
+    remaining: list[int],
+) -> None:
+    names, weights = list(mix), list(mix.values())
+
+    while time.monotonic() < deadline and remaining[0] > 0:
+        remaining[0] -= 1
+        operation = random.choices(names, weights)[0]
+        op_stats = stats.operations.setdefault(operation, OperationStats())
+
+        call = _draw(client, targets, operation)
+        if call is None:
+            op_stats.skipped += 1
+            # Nothing to act on; let the other workers make some progress
+            await asyncio.sleep(0)
+            continue
+
+        start = time.perf_counter()
+        try:
+            outcome = await call()
+        except Exception as e:
+            op_stats.errors[type(e).__name__] += 1
+            continue
+        op_stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+        if outcome is None or outcome is False:
+            op_stats.rejected += 1
+
+
+async def generate_load(
+    client: Client,
+    targets: Targets,
+    mix: Mapping[str, int],
+    *,
+    workers: int = 10,
+    duration: float | None = None,
+    operations: int | None = None,
+) -> LoadStats:
+    """Run `workers` coroutines against one Client and its connection pool"""
+    stats = LoadStats()
+    remaining = [operations if operations is not None else 2**63]
+    start = time.monotonic()
+    deadline = start + duration if duration is not None else float("inf")
+
+    await asyncio.gather(
+        *(
+            _worker(
+                client,
+                targets,
+                mix,
+                stats,
+                deadline=deadline,
+                remaining=remaining,
+            )
+            for _ in range(workers)
+        )
+    )
+
+    stats.elapsed_s = time.monotonic() - start
+    return stats
+
+
+async def _generate_load(
+    database_url: str,
+    targets: Targets,
+    mix: Mapping[str, int],
+    *,
+    workers: int,
+    duration: float | None,
+    operations: int | None,
+    cache: ReportCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    pool_monitor: PoolMonitor | None = None,
+    call_profiler: CallProfiler | None = None,
+) -> LoadStats:
+    # The Client's own warnings for rejected calls would drown out the report
+    client_logger = logging.getLogger("sjsu_cmpe180b_f25.client")
+    level = client_logger.level
+    client_logger.setLevel(logging.ERROR)
+
+    client = Client(
+        database_url,
+        cache=cache,
+        metrics=metrics,
+        pool_monitor=pool_monitor,
+        call_profiler=call_profiler,
+    )
+    try:
+        return await generate_load(
+            client,
+            targets,
+            mix,
+            workers=workers,
+            duration=duration,
+            operations=operations,
+        )
+    finally:
+        await client.dispose()
+        client_logger.setLevel(level)
+
+
+def _generate_load_process(
+    database_url: str,
+    targets: Targets,
+    mix: Mapping[str, int],
+    workers: int,
+    duration: float | None,
+    operations: int | None,
+) -> LoadStats:
+    return asyncio.run(
+        _generate_load(
+            database_url,
+            targets,
+            mix,
+            workers=workers,
+            duration=duration,
+            operations=operations,
+        )
+    )
+
+
+async def _load_targets(database_url: str) -> Targets:
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+    try:
+        async with engine.connect() as conn:
+            copies = await conn.scalars(select(Copy.copy_id))
+            members = await conn.scalars(select(Member.member_id))
+            open_loans = await conn.scalars(
+                select(Loan.loan_id).where(Loan.return_date.is_(None))
+            )
+            unpaid_fines = await conn.scalars(
+                select(Fine.fine_id).where(Fine.paid == False)  # noqa: E712
+            )
+            return Targets(
+                list(copies),
+                list(members),
+                list(open_loans),
+                list(unpaid_fines),
+            )
+    finally:
+        await engine.dispose()
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """Parse an operation mix such as `checkout=4,return=4,report=1`"""
+    mix = {}
+    for part in spec.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip()
+        if not sep or name not in DEFAULT_MIX or not weight.strip().isdigit():
+            raise ValueError(
+                f"Invalid mix entry '{part}', expected NAME=WEIGHT with NAME one "
+                f"of {', '.join(DEFAULT_MIX)}"
+            )
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("At least one operation in the mix needs a weight above 0")
+    return mix
+
+
+def histogram(latencies_ms: list[float]) -> list[int]:
+    """Counts per `BUCKETS_MS` bucket, plus a final bucket for anything slower"""
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for ms in latencies_ms:
+        counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+    return counts
+
+
+def format_load_report(stats: LoadStats, *, bar_width: int = 40) -> str:
+    lines = [
+        f"\nCompleted {stats.completed} operations in {stats.elapsed_s:.1f}s "
+        f"({stats.throughput:.1f} ops/s)\n",
+        f"{'Operation':<10} {'OK':>7} {'Rejected':>9} {'Skipped':>8} {'Errors':>7} "
+        f"{'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}",
+        "-" * 82,
+    ]
+    for name, op in stats.operations.items():
+        latencies = op.latencies_ms
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            p50, p95, p99 = f"{cuts[49]:.2f}", f"{cuts[94]:.2f}", f"{cuts[98]:.2f}"
+        else:
+            p50 = p95 = p99 = f"{latencies[0]:.2f}" if latencies else "-"
+        ok = len(latencies) - op.rejected
+        rate = len(latencies) / stats.elapsed_s if stats.elapsed_s else 0.0
+        lines.append(
+            f"{name:<10} {ok:>7} {op.rejected:>9} {op.skipped:>8} "
+            f"{op.errors.total():>7} {rate:>8.1f} {p50:>8} {p95:>8} {p99:>8}"
+        )
+
+    errors = [
+        (name, error, count)
+        for name, op in stats.operations.items()
+        for error, count in op.errors.most_common()
+    ]
+    if errors:
+        lines.extend(["\nErrors:\n", f"{'Operation':<10} {'Exception':<30} Count"])
+        lines.extend(f"{name:<10} {error:<30} {count}" for name, error, count in errors)
+
+    labels = [f"<= {ms:g} ms" for ms in BUCKETS_MS] + [f">  {BUCKETS_MS[-1]:g} ms"]
+    for name, op in stats.operations.items():
+        if not op.latencies_ms:
+            continue
+        counts = histogram(op.latencies_ms)
+        peak = max(counts)
+        lines.append(f"\n{name} latency:")
+        lines.extend(
+            f"  {label:>12} {count:>7} {'#' * round(bar_width * count / peak)}"
+            for label, count in zip(labels, counts, strict=True)
+            if count
+        )
+
+    return "\n".join(lines)
+
+
+async def run_load(
+    database_url: str,
+    *,
+    mix: Mapping[str, int] = DEFAULT_MIX,
+    workers: int = 10,
+    processes: int = 1,
+    duration: float | None = 10.0,
+    operations: int | None = None,
+    cache: ReportCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    pool_monitor: PoolMonitor | None = None,
+    call_profiler: CallProfiler | None = None,
+) -> LoadStats:
+    """Replay a weighted mix of circulation and report calls until the
+    duration passes or `operations` calls have been drawn.
+
+    Each process runs `workers` coroutines sharing one Client, so they
+    contend for its connection pool as concurrent requests to one app server
+    would. Returns and fine payments act on loans and fines open at the
+    start, plus loans the checkouts open along the way.
+    """
+    logger = logging.getLogger(__name__)
+    targets = await _load_targets(database_url)
+    logger.info(
+        f"Generating load with {processes} x {workers} workers over "
+        f"{len(targets.copies)} copies, {len(targets.open_loans)} open loans and "
+        f"{len(targets.unpaid_fines)} unpaid fines..."
+    )
+
+    if processes == 1:
+        stats = await _generate_load(
+            database_url,
+            targets,
+            mix,
+            workers=workers,
+            duration=duration,
+            operations=operations,
+            cache=cache,
+            metrics=metrics,
+            pool_monitor=pool_monitor,
+            call_profiler=call_profiler,
+        )
+    else:
+        if any(m is not None for m in (metrics, pool_monitor, call_profiler)):
+            logger.warning(
+                "Metrics, pool stats and profiles only cover this process; use "
+                "--processes 1 to measure the load itself."
+            )
+        if cache is not None:
+            logger.warning(
+                "The report cache can't be shared between processes; use "
+                "--processes 1 to load a cached client."
+            )
+        # Each process gets its own share of the operation budget
+        budgets: list[int | None] = [None] * processes
+        if operations is not None:
+            budgets = [
+                operations // processes + (i < operations % processes)
+                for i in range(processes)
+            ]
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        _generate_load_process,
+                        database_url,
+                        share,
+                        dict(mix),
+                        workers,
+                        duration,
+                        budget,
+                    )
+                    for share, budget in zip(
+                        targets.split(processes), budgets, strict=True
+                    )
+                )
+            )
+        stats = LoadStats()
+        for result in results:
+            stats.merge(result)
+
+    logger.info(format_load_report(stats))
+    return stats
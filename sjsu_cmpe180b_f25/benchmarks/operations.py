@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+# Everything an operation is timed against comes from the seeded rows with
+# these IDs or from fresh rows with IDs far past anything seeded.
+SEEDED_ID = 1
+FRESH_IDS_START = 10_000_000
+
+type Timed = Callable[[], Awaitable[object]]
+type Prepare = Callable[[Client, Iterator[int]], Awaitable[Timed]]
+
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """A `Client` method to time, and the untimed setup each call needs.
+
+    `prepare` does the setup for one call and returns the call itself, so
+    only the call is timed.
+    """
+
+    name: str
+    group: str
+    prepare: Prepare
+
+
+def _required[T](value: T | None, what: str) -> T:
+    if value is None:
+        raise RuntimeError(f"Could not create the {what} a benchmark needs.")
+    return value
+
+
+async def _fresh_member(client: Client, ids: Iterator[int]) -> int:
+    member_id = next(ids)
+    member = await client.create_member(
+        member_id=member_id,
+        name=f"Benchmark Member {member_id}",
+        email=f"benchmark.{member_id}@example.com",
+        joined_at=datetime.now(tz=None),
+    )
+    return _required(member, "member").member_id
+
+
+async def _fresh_copy(client: Client, ids: Iterator[int]) -> int:
+    copy = await client.create_copy(
+        copy_id=next(ids), book_id=SEEDED_ID, status=CopyStatus.AVAILABLE
+    )
+    return _required(copy, "copy").copy_id
+
+
+async def _fresh_loan(client: Client, ids: Iterator[int]) -> int:
+    copy_id = await _fresh_copy(client, ids)
+    loan = await client.request_loan(copy_id=copy_id, member_id=SEEDED_ID)
+    return _required(loan, "loan").loan_id
+
+
+def _read(call: Callable[[Client], Awaitable[object]]) -> Prepare:
+    """Prepare for a read, which needs no setup"""
+
+    async def prepare(client: Client, ids: Iterator[int]) -> Timed:
+        return lambda: call(client)
+
+    return prepare
+
+
+async def _create_author(client: Client, ids: Iterator[int]) -> Timed:
+    author_id = next(ids)
+    return lambda: client.create_author(id=author_id, name="Benchmark Author")
+
+
+async def _create_book(client: Client, ids: Iterator[int]) -> Timed:
+    book_id = next(ids)
+    return lambda: client.create_book(book_id=book_id, title="Benchmark Book")
+
+
+async def _create_book_author(client: Client, ids: Iterator[int]) -> Timed:
+    book = _required(
+        await client.create_book(book_id=next(ids), title="Benchmark Book"), "book"
+    )
+    return lambda: client.create_book_author(book_id=book.book_id, author_id=SEEDED_ID)
+
+
+async def _create_member(client: Client, ids: Iterator[int]) -> Timed:
+    member_id = next(ids)
+    return lambda: client.create_member(
+        member_id=member_id,
+        name="Benchmark Member",
+        email=f"benchmark.{member_id}@example.com",
+        joined_at=datetime.now(tz=None),
+    )
+
+
+async def _create_copy(client: Client, ids: Iterator[int]) -> Timed:
+    copy_id = next(ids)
+    return lambda: client.create_copy(
+        copy_id=copy_id, book_id=SEEDED_ID, status=CopyStatus.AVAILABLE
+    )
+
+
+async def _create_loan(client: Client, ids: Iterator[int]) -> Timed:
+    copy_id = await _fresh_copy(client, ids)
+    now = datetime.now(tz=None)
+    return lambda: client.create_loan(
+        copy_id=copy_id,
+        member_id=SEEDED_ID,
+        loan_date=now,
+        due_date=now + timedelta(days=14),
+        status=LoanStatus.ACTIVE,
+    )
+
+
+async def _create_fine(client: Client, ids: Iterator[int]) -> Timed:
+    loan_id = await _fresh_loan(client, ids)
+    return lambda: client.create_fine(
+        member_id=SEEDED_ID,
+        loan_id=loan_id,
+        amount=1.0,
+        assessed_at=datetime.now(tz=None),
+    )
+
+
+async def _request_loan(client: Client, ids: Iterator[int]) -> Timed:
+    copy_id = await _fresh_copy(client, ids)
+    return lambda: client.request_loan(copy_id=copy_id, member_id=SEEDED_ID)
+
+
+async def _end_loan(client: Client, ids: Iterator[int]) -> Timed:
+    loan_id = await _fresh_loan(client, ids)
+    return lambda: client.end_loan(loan_id=loan_id)
+
+
+async def _place_hold(client: Client, ids: Iterator[int]) -> Timed:
+    member_id = await _fresh_member(client, ids)
+    return lambda: client.place_hold(book_id=SEEDED_ID, member_id=member_id)
+
+
+async def _cancel_hold(client: Client, ids: Iterator[int]) -> Timed:
+    member_id = await _fresh_member(client, ids)
+    hold = await client.place_hold(book_id=SEEDED_ID, member_id=member_id)
+    hold_id = _required(hold, "hold").hold_id
+    return lambda: client.cancel_hold(hold_id=hold_id)
+
+
+async def _pay_fine(client: Client, ids: Iterator[int]) -> Timed:
+    loan_id = await _fresh_loan(client, ids)
+    fine = await client.create_fine(
+        member_id=SEEDED_ID,
+        loan_id=loan_id,
+        amount=1.0,
+        assessed_at=datetime.now(tz=None),
+    )
+    fine_id = _required(fine, "fine").fine_id
+    return lambda: client.pay_fine(fine_id=fine_id)
+
+
+# Reports run first so they see the seeded data rather than what the write
+# benchmarks add to it.
+OPERATIONS: list[Operation] = [
+    Operation("get_top_books", "reports", _read(lambda c: c.get_top_books())),
+    Operation(
+        "get_overdue_members", "reports", _read(lambda c: c.get_overdue_members())
+    ),
+    Operation(
+        "get_unpaid_fines_members",
+        "reports",
+        _read(lambda c: c.get_unpaid_fines_members()),
+    ),
+    Operation("get_copies_on_loan", "reports", _read(lambda c: c.get_copies_on_loan())),
+    Operation(
+        "get_genre_fine_statistics",
+        "reports",
+        _read(lambda c: c.get_genre_fine_statistics()),
+    ),
+    Operation(
+        "get_member_history",
+        "reports",
+        _read(lambda c: c.get_member_history(SEEDED_ID)),
+    ),
+    Operation(
+        "get_member_history_page",
+        "reports",
+        _read(lambda c: c.get_member_history_page(SEEDED_ID)),
+    ),
+    Operation("search_books", "reports", _read(lambda c: c.search_books("last"))),
+    Operation(
+        "check_member_balances",
+        "reports",
+        _read(lambda c: c.check_member_balances()),
+    ),
+    Operation("create_author", "creates", _create_author),
+    Operation("create_book", "creates", _create_book),
+    Operation("create_book_author", "creates", _create_book_author),
+    Operation("create_member", "creates", _create_member),
+    Operation("create_copy", "creates", _create_copy),
+    Operation("create_loan", "creates", _create_loan),
+    Operation("create_fine", "creates", _create_fine),
+    Operation("request_loan", "circulation", _request_loan),
+    Operation("end_loan", "circulation", _end_loan),
+    Operation("place_hold", "circulation", _place_hold),
+    Operation("cancel_hold", "circulation", _cancel_hold),
+    Operation("pay_fine", "circulation", _pay_fine),
+]
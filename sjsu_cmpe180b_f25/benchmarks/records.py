@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import statistics
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from sqlalchemy import CursorResult, Row, Select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from sjsu_cmpe180b_f25 import queries
+from sjsu_cmpe180b_f25.records import (
+    BookUtilization,
+    OverdueMember,
+    TopBook,
+    UnpaidFines,
+    as_records,
+)
+
+logger = logging.getLogger(__name__)
+
+# Large enough to fetch every row of the limited reports
+_ALL = 2**31 - 1
+
+
+type Record = type[tuple[Any, ...]]
+
+type Build = Callable[[CursorResult[Any]], list[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class RecordCost:
+    query: str
+    rows: int
+    row_bytes: float
+    record_bytes: float
+    row_build_us: float
+    record_build_us: float
+
+
+def record_queries(now: datetime) -> dict[str, tuple[Select[Any], Record]]:
+    return {
+        "top-books": (queries.top_books(_ALL), TopBook),
+        "overdue-members": (queries.overdue_members(now), OverdueMember),
+        "unpaid-fines": (queries.unpaid_fines_members(0.0), UnpaidFines),
+        "copies-on-loan": (queries.copies_on_loan(_ALL), BookUtilization),
+    }
+
+
+def _as_rows(result: CursorResult[Any]) -> list[Any]:
+    return list(result.all())
+
+
+def _row_bytes(row: Sequence[Any]) -> int:
+    """Bytes a row holds beyond its values, which Rows and records share.
+
+    A Row is a slotted object over a tuple of its values; a record is a tuple.
+    """
+    if isinstance(row, Row):
+        return sys.getsizeof(row) + sys.getsizeof(tuple(row))
+    return sys.getsizeof(row)
+
+
+async def _build(
+    conn: AsyncConnection,
+    stmt: Select[Any],
+    build: Build,
+    repeats: int,
+) -> tuple[list[Any], float]:
+    """Build the rows of `stmt` and return them with the median seconds it
+    took to build them.
+
+    The query runs untimed before each build. Buffered results have every raw
+    row fetched by then, so only the conversion from driver rows is timed.
+    """
+    rows: list[Any] = []
+    seconds = []
+    for _ in range(repeats):
+        result = await conn.execute(stmt)
+        start = time.perf_counter()
+        rows = build(result)
+        seconds.append(time.perf_counter() - start)
+    return rows, statistics.median(seconds)
+
+
+async def measure_records(database_url: str, *, repeats: int = 5) -> list[RecordCost]:
+    """Compare holding report rows as SQLAlchemy Rows against the records
+    `as_records` builds"""
+    engine = create_async_engine(database_url)
+    costs = []
+    try:
+        async with engine.connect() as conn:
+            for name, (stmt, record) in record_queries(datetime.now(tz=None)).items():
+                as_built: Build = partial(as_records, stmt=stmt, record=record)
+                # Compile the statement and cache what fetching needs first
+                for build in (_as_rows, as_built):
+                    build(await conn.execute(stmt))
+
+                rows, row_s = await _build(conn, stmt, _as_rows, repeats)
+                records, record_s = await _build(conn, stmt, as_built, repeats)
+                if not rows:
+                    logger.warning(f"'{name}' returned no rows; skipping it.")
+                    continue
+                costs.append(
+                    RecordCost(
+                        query=name,
+                        rows=len(rows),
+                        row_bytes=statistics.fmean(map(_row_bytes, rows)),
+                        record_bytes=statistics.fmean(map(_row_bytes, records)),
+                        row_build_us=row_s / len(rows) * 1e6,
+                        record_build_us=record_s / len(rows) * 1e6,
+                    )
+                )
+    finally:
+        await engine.dispose()
+    return costs
+
+
+def format_record_costs(costs: list[RecordCost]) -> str:
+    lines = [
+        "\nBytes held beyond the values and build time per row, Row vs record:\n",
+        f"{'Query':<16} {'Rows':>8} {'Row B':>7} {'Record B':>9} {'Saved':>6} "
+        f"{'Row us':>7} {'Record us':>10}",
+        "-" * 70,
+    ]
+    lines.extend(
+        f"{c.query:<16} {c.rows:>8} {c.row_bytes:>7.0f} {c.record_bytes:>9.0f} "
+        f"{1 - c.record_bytes / c.row_bytes if c.row_bytes else 0.0:>6.0%} "
+        f"{c.row_build_us:>7.2f} {c.record_build_us:>10.2f}"
+        for c in costs
+    )
+    return "\n".join(lines)
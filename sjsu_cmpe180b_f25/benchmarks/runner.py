@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import random
+import statistics
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.index import create_indexes
+from sjsu_cmpe180b_f25.metrics import MetricsRegistry
+from sjsu_cmpe180b_f25.pool import PoolMonitor
+from sjsu_cmpe180b_f25.population import populate_db
+from sjsu_cmpe180b_f25.profiling import CallProfiler, SqlProfiler
+
+from .operations import FRESH_IDS_START, OPERATIONS, Operation
+
+# Rows seeded per unit of scale factor, passed through to `populate_db`
+SEED_SIZES: dict[str, int] = {
+    "num_authors": 100,
+    "num_books": 100,
+    "num_members": 100,
+    "num_loans": 300,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    scale: int
+    operation: str
+    group: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    ops_per_sec: float
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    scale: int
+    operation: str
+    metric: str
+    before_ms: float
+    after_ms: float
+
+    @property
+    def change(self) -> float:
+        return (self.after_ms - self.before_ms) / self.before_ms
+
+
+def summarize(
+    scale: int, operation: Operation, samples_ms: Sequence[float]
+) -> BenchmarkResult:
+    """Latency percentiles and serial throughput of one operation's samples"""
+    if len(samples_ms) > 1:
+        cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = samples_ms[0]
+
+    total_ms = sum(samples_ms)
+    return BenchmarkResult(
+        scale=scale,
+        operation=operation.name,
+        group=operation.group,
+        iterations=len(samples_ms),
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        mean_ms=total_ms / len(samples_ms),
+        ops_per_sec=len(samples_ms) * 1000 / total_ms if total_ms else 0.0,
+    )
+
+
+async def benchmark_client(
+    client: Client,
+    scale: int,
+    *,
+    iterations: int = 100,
+    warmup: int = 5,
+    operations: Iterable[Operation] = OPERATIONS,
+) -> list[BenchmarkResult]:
+    """Time each operation against an already seeded database"""
+    logger = logging.getLogger(__name__)
+    ids = itertools.count(FRESH_IDS_START)
+
+    results = []
+    for operation in operations:
+        logger.info(f"Benchmarking {operation.name} at scale {scale}...")
+        samples_ms = []
+        for i in range(warmup + iterations):
+            call = await operation.prepare(client, ids)
+            start = time.perf_counter()
+            await call()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if i >= warmup:
+                samples_ms.append(elapsed_ms)
+        results.append(summarize(scale, operation, samples_ms))
+
+    return results
+
+
+async def run_benchmarks(
+    database_url: str,
+    *,
+    scales: Sequence[int] = (1,),
+    iterations: int = 100,
+    warmup: int = 5,
+    profiler: SqlProfiler | None = None,
+    metrics: MetricsRegistry | None = None,
+    pool_monitor: PoolMonitor | None = None,
+    call_profiler: CallProfiler | None = None,
+) -> list[BenchmarkResult]:
+    """Reseed the database at each scale factor and time every operation.
+
+    Every table is dropped and recreated for each scale, so point this at a
+    database whose contents can be thrown away.
+    """
+    logger = logging.getLogger(__name__)
+
+    results = []
+    for scale in scales:
+        client = Client(
+            database_url,
+            profiler=profiler,
+            metrics=metrics,
+            pool_monitor=pool_monitor,
+            call_profiler=call_profiler,
+        )
+        try:
+            logger.info(f"Seeding the database at scale {scale}...")
+            await client.drop_tables()
+            await populate_db(
+                client,
+                num_authors=SEED_SIZES["num_authors"] * scale,
+                num_books=SEED_SIZES["num_books"] * scale,
+                num_members=SEED_SIZES["num_members"] * scale,
+                num_loans=SEED_SIZES["num_loans"] * scale,
+                # The same scale always seeds the same data, so runs compare
+                rng=random.Random(scale),
+            )
+            await create_indexes(database_url)
+
+            results.extend(
+                await benchmark_client(
+                    client, scale, iterations=iterations, warmup=warmup
+                )
+            )
+        finally:
+            await client.dispose()
+
+    lines = [
+        f"\nBenchmark results ({iterations} iterations after {warmup} warmup):\n",
+        f"{'Scale':>5}  {'Operation':<26} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'ops/s':>9}",
+        "-" * 71,
+    ]
+    lines.extend(
+        f"{r.scale:>5}  {r.operation:<26} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} "
+        f"{r.p99_ms:>8.2f} {r.ops_per_sec:>9.1f}"
+        for r in results
+    )
+    logger.info("\n".join(lines))
+    return results
+
+
+def save_results(
+    path: Path, results: Sequence[BenchmarkResult], *, database: str
+) -> None:
+    document = {
+        "created_at": datetime.now(tz=None).isoformat(),
+        "database": database,
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+    logging.getLogger(__name__).info(f"Saved benchmark results to '{path}'.")
+
+
+def load_results(path: Path) -> list[BenchmarkResult]:
+    document = json.loads(path.read_text())
+    return [BenchmarkResult(**result) for result in document["results"]]
+
+
+def compare_results(
+    baseline: Sequence[BenchmarkResult],
+    current: Sequence[BenchmarkResult],
+    *,
+    threshold: float = 0.10,
+) -> list[Regression]:
+    """Flag operations whose p50 or p95 grew by more than `threshold`.
+
+    p99 is reported but not compared, since a hundred samples leave it at the
+    mercy of a single slow call.
+    """
+    before = {(r.scale, r.operation): r for r in baseline}
+
+    regressions = []
+    lines = [
+        f"\nCompared with the baseline (regression above {threshold:.0%}):\n",
+        f"{'Scale':>5}  {'Operation':<26} {'p50 change':>10} {'p95 change':>10}",
+        "-" * 55,
+    ]
+    for result in current:
+        old = before.get((result.scale, result.operation))
+        if old is None:
+            continue
+
+        changes = []
+        regressed = False
+        for metric in ("p50_ms", "p95_ms"):
+            regression = Regression(
+                scale=result.scale,
+                operation=result.operation,
+                metric=metric,
+                before_ms=getattr(old, metric),
+                after_ms=getattr(result, metric),
+            )
+            changes.append(f"{regression.change:>+10.1%}")
+            if regression.change > threshold:
+                regressions.append(regression)
+                regressed = True
+
+        flag = "  REGRESSED" if regressed else ""
+        lines.append(
+            f"{result.scale:>5}  {result.operation:<26} {' '.join(changes)}{flag}"
+        )
+
+    logger = logging.getLogger(__name__)
+    logger.info("\n".join(lines))
+    if regressions:
+        logger.error(f"{len(regressions)} benchmark metrics regressed.")
+    return regressions
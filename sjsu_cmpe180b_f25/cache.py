@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine, Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
+
+# Seconds a cached report stays fresh, keyed by `Client` method name.
+DEFAULT_TTLS: dict[str, float] = {
+    "get_top_books": 300.0,
+    "get_overdue_members": 60.0,
+    "get_unpaid_fines_members": 60.0,
+    "get_copies_on_loan": 60.0,
+    "get_genre_fine_statistics": 300.0,
+    "get_member_history": 30.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: object
+    expires_at: float
+    tables: tuple[str, ...]
+
+
+class ReportCache:
+    """Size-bounded LRU of report results with per-report TTLs.
+
+    Entries are tagged with the tables they were computed from so that writes
+    can invalidate exactly the reports they affect.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttls: Mapping[str, float] | None = None,
+        default_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.__entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.__ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.__default_ttl = default_ttl
+        self.__max_entries = max_entries
+        self.__clock = clock
+        # Bumped on every write to a table; a result is only stored if none of
+        # its tables were written while it was being computed.
+        self.__generations: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def ttl_for(self, report: str) -> float:
+        return self.__ttls.get(report, self.__default_ttl)
+
+    def lookup(self, key: Hashable) -> tuple[bool, object]:
+        """Return `(True, value)` for a fresh entry, `(False, None)` otherwise."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        if entry.expires_at <= self.__clock():
+            del self.__entries[key]
+            self.misses += 1
+            return False, None
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def generation(self, tables: Iterable[str]) -> tuple[int, ...]:
+        return tuple(self.__generations.get(table, 0) for table in tables)
+
+    def store(
+        self,
+        key: Hashable,
+        value: object,
+        *,
+        report: str,
+        tables: tuple[str, ...],
+        generation: tuple[int, ...],
+    ) -> None:
+        if self.generation(tables) != generation:
+            return
+
+        ttl = self.ttl_for(report)
+        if ttl <= 0:
+            return
+
+        self.__entries[key] = _Entry(value, self.__clock() + ttl, tables)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *tables: str) -> int:
+        """Drop every entry computed from any of `tables`, returning the count."""
+        for table in tables:
+            self.__generations[table] = self.__generations.get(table, 0) + 1
+
+        stale = [
+            key
+            for key, entry in self.__entries.items()
+            if not entry.tables or any(table in entry.tables for table in tables)
+        ]
+        for key in stale:
+            del self.__entries[key]
+
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            size=len(self.__entries),
+        )
+
+
+class _HasCache(Protocol):
+    @property
+    def cache(self) -> ReportCache | None: ...
+
+
+C = TypeVar("C", bound=_HasCache)
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def cached_report(
+    *tables: str,
+) -> Callable[
+    [Callable[Concatenate[C, P], Awaitable[R]]],
+    Callable[Concatenate[C, P], Coroutine[Any, Any, R]],
+]:
+    """Serve a report method from `self.cache` when one is configured.
+
+    The cache key is the method name plus its arguments bound against the
+    signature, so `get_top_books(10)` and `get_top_books(limit=10)` share an
+    entry. List results are stored as tuples and copied on every hit, so a
+    caller mutating its list can't change what later callers see.
+    """
+
+    def decorator(
+        fn: Callable[Concatenate[C, P], Awaitable[R]],
+    ) -> Callable[Concatenate[C, P], Coroutine[Any, Any, R]]:
+        report = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self: C, /, *args: P.args, **kwargs: P.kwargs) -> R:
+            cache = self.cache
+            if cache is None:
+                return await fn(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (report, *list(bound.arguments.values())[1:])
+
+            hit, value = cache.lookup(key)
+            if hit:
+                if isinstance(value, tuple):
+                    value = list(value)
+                return value  # type: ignore[return-value]
+
+            generation = cache.generation(tables)
+            result = await fn(self, *args, **kwargs)
+            cache.store(
+                key,
+                tuple(result) if isinstance(result, list) else result,
+                report=report,
+                tables=tables,
+                generation=generation,
+            )
+            return result
+
+        return wrapper
+
+    return decorator
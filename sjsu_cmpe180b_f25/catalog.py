@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+from sqlalchemy import Select
+
+from . import queries
+from .columns import Frame, positions
+
+if TYPE_CHECKING:
+    from .client import Client
+
+# Identifies a catalog file and the version of its layout
+MAGIC = b"LIBCAT01"
+
+# Arrays start on multiples of this, so every dtype can be viewed in place
+_ALIGN = 8
+
+type Arrays = dict[str, NDArray[Any]]
+
+
+class CatalogBook(NamedTuple):
+    book_id: int
+    title: str
+    genre: str | None
+    authors: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogCounts:
+    books: int
+    authors: int
+    book_authors: int
+    copies: int
+
+
+def format_counts(counts: CatalogCounts) -> str:
+    return (
+        f"{counts.books} books, {counts.authors} authors, "
+        f"{counts.book_authors} book authors and {counts.copies} copies"
+    )
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _pack(strings: Sequence[str]) -> tuple[NDArray[np.uint8], NDArray[np.int64]]:
+    """UTF-8 encode `strings` into one blob, with where each starts and, last,
+    where the blob ends."""
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), np.int64, len(encoded)), out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack(blob: NDArray[np.uint8], offsets: NDArray[np.int64], i: int) -> str:
+    start, end = offsets[i : i + 2].tolist()
+    return blob[start:end].tobytes().decode()
+
+
+def _find(ids: NDArray[np.int64], id_: int) -> int | None:
+    i = int(ids.searchsorted(id_))
+    return i if i < len(ids) and ids[i] == id_ else None
+
+
+def _empty() -> Arrays:
+    ids = np.empty(0, dtype=np.int64)
+    blob, offsets = _pack([])
+    return {
+        "book_id": ids,
+        "title_offsets": offsets,
+        "titles": blob,
+        "genre": np.empty(0, dtype=np.int32),
+        "genre_offsets": offsets,
+        "genres": blob,
+        "author_offsets": offsets,
+        "book_authors": np.empty(0, dtype=np.int32),
+        "author_id": ids,
+        "name_offsets": offsets,
+        "names": blob,
+        "copy_id": ids,
+        "copy_book": np.empty(0, dtype=np.int32),
+    }
+
+
+def _append_strings(
+    blob: NDArray[np.uint8], offsets: NDArray[np.int64], strings: Sequence[str]
+) -> tuple[NDArray[np.uint8], NDArray[np.int64]]:
+    new_blob, new_offsets = _pack(strings)
+    return (
+        np.concatenate((blob, new_blob)),
+        np.concatenate((offsets, new_offsets[1:] + offsets[-1])),
+    )
+
+
+def _merge(base: Arrays, frames: dict[str, Frame]) -> Arrays:
+    """`base` with the rows of `frames` added, whose IDs all follow its own."""
+    books, authors = frames["books"], frames["authors"]
+    book_authors, copies = frames["book_authors"], frames["copies"]
+    arrays = dict(base)
+
+    book_ids = np.concatenate((base["book_id"], books["book_id"]))
+    arrays["book_id"] = book_ids
+    arrays["titles"], arrays["title_offsets"] = _append_strings(
+        base["titles"], base["title_offsets"], books["title"].tolist()
+    )
+
+    # Genres are few, so books hold a code into a list of them, -1 for none
+    genres = [
+        _unpack(base["genres"], base["genre_offsets"], i)
+        for i in range(len(base["genre_offsets"]) - 1)
+    ]
+    codes = {genre: code for code, genre in enumerate(genres)}
+    for genre in books["genre"].tolist():
+        if genre is not None and genre not in codes:
+            codes[genre] = len(codes)
+    new_codes = [-1 if g is None else codes[g] for g in books["genre"].tolist()]
+    arrays["genre"] = np.concatenate(
+        (base["genre"], np.array(new_codes, dtype=np.int32))
+    )
+    arrays["genres"], arrays["genre_offsets"] = _pack(list(codes))
+
+    author_ids = np.concatenate((base["author_id"], authors["author_id"]))
+    arrays["author_id"] = author_ids
+    arrays["names"], arrays["name_offsets"] = _append_strings(
+        base["names"], base["name_offsets"], authors["name"].tolist()
+    )
+
+    # Each book's authors are a run of author positions, `author_offsets`
+    # marking where each book's run starts
+    linked_books = np.concatenate(
+        (
+            np.repeat(np.arange(len(base["book_id"])), np.diff(base["author_offsets"])),
+            positions(book_ids, book_authors["book_id"]),
+        )
+    )
+    linked_authors = np.concatenate(
+        (base["book_authors"], positions(author_ids, book_authors["author_id"]))
+    )
+    order = np.lexsort((linked_authors, linked_books))
+    arrays["book_authors"] = linked_authors[order].astype(np.int32)
+    arrays["author_offsets"] = np.searchsorted(
+        linked_books[order], np.arange(len(book_ids) + 1)
+    ).astype(np.int64)
+
+    arrays["copy_id"] = np.concatenate((base["copy_id"], copies["copy_id"]))
+    arrays["copy_book"] = np.concatenate(
+        (
+            base["copy_book"],
+            positions(book_ids, copies["book_id"]).astype(np.int32),
+        )
+    )
+    return arrays
+
+
+def _write(path: Path, arrays: Arrays) -> None:
+    """Write `arrays` to a new file and move it over `path`, so open catalogs
+    keep reading the file they mapped."""
+    layout: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, values in arrays.items():
+        layout[name] = {
+            "dtype": values.dtype.str,
+            "length": len(values),
+            "offset": offset,
+        }
+        offset += _aligned(values.nbytes)
+    header = json.dumps(layout).encode()
+    start = _aligned(len(MAGIC) + 8 + len(header))
+
+    temporary = path.with_name(f"{path.name}.tmp")
+    with temporary.open("wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header.ljust(start - len(MAGIC) - 8, b"\0"))
+        for values in arrays.values():
+            np.ascontiguousarray(values).tofile(f)
+            f.write(b"\0" * (_aligned(values.nbytes) - values.nbytes))
+    os.replace(temporary, path)
+
+
+def _read(buffer: mmap.mmap) -> Arrays:
+    if buffer[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a catalog file, or one from another version")
+    size = int.from_bytes(buffer[len(MAGIC) : len(MAGIC) + 8], "little")
+    layout = json.loads(buffer[len(MAGIC) + 8 : len(MAGIC) + 8 + size])
+    start = _aligned(len(MAGIC) + 8 + size)
+    return {
+        name: np.frombuffer(
+            buffer,
+            dtype=np.dtype(array["dtype"]),
+            count=array["length"],
+            offset=start + array["offset"],
+        )
+        for name, array in layout.items()
+    }
+
+
+class Catalog:
+    """A catalog file, memory-mapped, answering book, author and copy lookups
+    by binary search without touching the database."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.arrays = arrays = _read(buffer)
+
+        self.__book_ids = arrays["book_id"]
+        self.__titles = arrays["titles"]
+        self.__title_offsets = arrays["title_offsets"]
+        self.__genre = arrays["genre"]
+        self.__genres = [
+            _unpack(arrays["genres"], arrays["genre_offsets"], i)
+            for i in range(len(arrays["genre_offsets"]) - 1)
+        ]
+        self.__author_offsets = arrays["author_offsets"]
+        self.__book_authors = arrays["book_authors"]
+        self.__author_ids = arrays["author_id"]
+        self.__names = arrays["names"]
+        self.__name_offsets = arrays["name_offsets"]
+        self.__copy_ids = arrays["copy_id"]
+        self.__copy_book = arrays["copy_book"]
+
+    def __len__(self) -> int:
+        return len(self.__book_ids)
+
+    def book(self, book_id: int) -> CatalogBook | None:
+        """A book's title, genre and authors, or None if it isn't indexed"""
+        i = _find(self.__book_ids, book_id)
+        if i is None:
+            return None
+        return self.__book(i)
+
+    def title(self, book_id: int) -> str | None:
+        i = _find(self.__book_ids, book_id)
+        return None if i is None else _unpack(self.__titles, self.__title_offsets, i)
+
+    def author(self, author_id: int) -> str | None:
+        i = _find(self.__author_ids, author_id)
+        return None if i is None else _unpack(self.__names, self.__name_offsets, i)
+
+    def copy_title(self, copy_id: int) -> str | None:
+        """Title of the book `copy_id` is a copy of"""
+        i = _find(self.__copy_ids, copy_id)
+        if i is None:
+            return None
+        return _unpack(self.__titles, self.__title_offsets, int(self.__copy_book[i]))
+
+    def __book(self, i: int) -> CatalogBook:
+        genre = int(self.__genre[i])
+        first, last = self.__author_offsets[i : i + 2].tolist()
+        return CatalogBook(
+            book_id=int(self.__book_ids[i]),
+            title=_unpack(self.__titles, self.__title_offsets, i),
+            genre=None if genre < 0 else self.__genres[genre],
+            authors=tuple(
+                _unpack(self.__names, self.__name_offsets, author)
+                for author in self.__book_authors[first:last].tolist()
+            ),
+        )
+
+
+def _last(ids: NDArray[np.int64]) -> int | None:
+    return int(ids[-1]) if len(ids) else None
+
+
+def _tables(
+    books: int | None, authors: int | None, copies: int | None
+) -> dict[str, Select[Any]]:
+    linked_after = None
+    if books is not None or authors is not None:
+        # IDs start at 1, so 0 admits every row on an empty side
+        linked_after = (books or 0, authors or 0)
+    return {
+        "books": queries.catalog_books(books),
+        "authors": queries.catalog_authors(authors),
+        "book_authors": queries.catalog_book_authors(linked_after),
+        "copies": queries.catalog_copies(copies),
+    }
+
+
+async def _update(client: Client, path: Path, base: Arrays) -> CatalogCounts:
+    frames = await client.fetch_tables(
+        _tables(
+            _last(base["book_id"]), _last(base["author_id"]), _last(base["copy_id"])
+        )
+    )
+    _write(path, _merge(base, frames))
+    return CatalogCounts(
+        books=len(frames["books"]["book_id"]),
+        authors=len(frames["authors"]["author_id"]),
+        book_authors=len(frames["book_authors"]["book_id"]),
+        copies=len(frames["copies"]["copy_id"]),
+    )
+
+
+async def build_catalog(client: Client, path: Path) -> CatalogCounts:
+    """Index every book, author and copy in a catalog file at `path`"""
+    return await _update(client, path, _empty())
+
+
+async def refresh_catalog(client: Client, path: Path) -> CatalogCounts:
+    """Add the books, authors and copies created since `path` was written,
+    returning how many were added.
+
+    New rows are found by ID, so edits and deletions need `build_catalog`.
+    """
+    if not path.exists():
+        return await build_catalog(client, path)
+    return await _update(client, path, Catalog(path).arrays)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import argparse
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -17,17 +19,69 @@ class CommandLineArguments:
     request_loan: tuple[int, int] | None = None
     end_loan: int | None = None
     pay_fine: int | None = None
+    place_hold: tuple[int, int] | None = None
+    cancel_hold: int | None = None
 
+    search: str | None = None
+    search_limit: int = 20
     top_books: int | None = None
     overdue_members: bool = False
     unpaid_fines_members: float | None = None
     copies_on_loans: int | None = None
     genre_fine_stats: bool = False
+    export_snapshot: Path | None = None
+    snapshot: Path | None = None
+    build_catalog: Path | None = None
+    refresh_catalog: Path | None = None
+    catalog: Path | None = None
     member_history: int | None = None
+    history_limit: int = 50
+    history_cursor: str | None = None
     create_indexes: bool = False
     drop_indexes: bool = False
+    compare_indexes: bool = False
+    index_report: bool = False
+    writes_per_run: float = 100.0
+    repeats: int = 5
     explain: str | None = None
     explain_member_history: int | None = None
+    explain_limit: int | None = None
+    explain_min_total: float | None = None
+    stream: bool = False
+    max_concurrency: int = 5
+    output_format: str = "text"
+    batch_size: int = 1000
+    report_cache: int | None = None
+    sweep_overdue: bool = False
+    fine_per_day: float = 0.50
+    check_balances: bool = False
+    rebuild_balances: bool = False
+    partition_loans: bool = False
+    manage_partitions: bool = False
+    months_ahead: int = 3
+    archive_before: date | None = None
+    benchmark: bool = False
+    benchmark_records: bool = False
+    scales: list[int] = field(default_factory=lambda: [1])
+    iterations: int = 100
+    warmup: int = 5
+    benchmark_out: Path | None = None
+    benchmark_baseline: Path | None = None
+    regression_threshold: float = 0.10
+    load: bool = False
+    workers: int = 10
+    processes: int = 1
+    duration: float = 10.0
+    operations: int | None = None
+    mix: str | None = None
+    profile_sql: bool = False
+    slow_query_ms: float = 100.0
+    profile_out: Path | None = None
+    trace_memory: bool = False
+    metrics_file: Path | None = None
+    metrics_interval: float = 15.0
+    metrics_port: int | None = None
+    pool_stats: bool = False
 
 
 def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
@@ -71,6 +125,33 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         metavar="FINE_ID",
         help="Pay the fine with the specified ID.",
     )
+    parser.add_argument(
+        "--place-hold",
+        nargs=2,
+        type=int,
+        metavar=("BOOK_ID", "MEMBER_ID"),
+        help="Queue the member for the next returned copy of the book.",
+    )
+    parser.add_argument(
+        "--cancel-hold",
+        type=int,
+        metavar="HOLD_ID",
+        help="Cancel the hold with the specified ID.",
+    )
+
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help="Search book titles and author names, best match first.",
+    )
+
+    parser.add_argument(
+        "--search-limit",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Maximum number of --search results. Defaults to 20.",
+    )
 
     parser.add_argument(
         "--top-books",
@@ -105,6 +186,45 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         help="Show fine statistics grouped by book genre.",
     )
 
+    parser.add_argument(
+        "--export-snapshot",
+        type=Path,
+        metavar="DIR",
+        help="Save books, copies, loans and fines as memory-mappable NumPy "
+        "columns under this directory. Requires the analytics extra.",
+    )
+
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        metavar="DIR",
+        help="Answer --top-books, --copies-on-loans and --genre-fine-stats from a "
+        "saved --export-snapshot instead of the database.",
+    )
+
+    parser.add_argument(
+        "--build-catalog",
+        type=Path,
+        metavar="PATH",
+        help="Index books, authors and copies in a memory-mapped catalog file. "
+        "Requires the analytics extra.",
+    )
+
+    parser.add_argument(
+        "--refresh-catalog",
+        type=Path,
+        metavar="PATH",
+        help="Add books, authors and copies created since a catalog file was "
+        "written. Edits and deletions need --build-catalog.",
+    )
+
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        metavar="PATH",
+        help="Show book titles in --member-history from this catalog file.",
+    )
+
     parser.add_argument(
         "--member-history",
         type=int,
@@ -112,6 +232,20 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         help="Show loan history for the given member_id",
     )
 
+    parser.add_argument(
+        "--history-limit",
+        type=int,
+        default=50,
+        metavar="N",
+        help="Number of loans per --member-history page. Defaults to 50.",
+    )
+
+    parser.add_argument(
+        "--history-cursor",
+        metavar="CURSOR",
+        help="Resume --member-history from the cursor printed with the previous page.",
+    )
+
     parser.add_argument(
         "--create-indexes",
         action="store_true",
@@ -122,10 +256,48 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         "--drop-indexes", action="store_true", help="Drop all created indexes."
     )
 
+    parser.add_argument(
+        "--compare-indexes",
+        action="store_true",
+        help="Compare index size and query time of the B-tree and covering/BRIN "
+        "index sets (PostgreSQL).",
+    )
+
+    parser.add_argument(
+        "--index-report",
+        action="store_true",
+        help="Rank each candidate index by the query time it saves against its size "
+        "and write cost, measured in rolled-back transactions (PostgreSQL).",
+    )
+
+    parser.add_argument(
+        "--writes-per-run",
+        type=float,
+        default=100.0,
+        metavar="N",
+        help="Rows inserted into each table per run of the report queries, which "
+        "--index-report weighs each index's write cost by. Defaults to 100.",
+    )
+
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Timed runs per query for --compare-indexes, --index-report and "
+        "--benchmark-records. Defaults to 5.",
+    )
+
     parser.add_argument(
         "--explain",
-        choices=["top-books", "overdue-members", "unpaid-fines"],
-        help="Run EXPLAIN ANALYZE on a complex query.",
+        choices=[
+            "top-books",
+            "overdue-members",
+            "unpaid-fines",
+            "copies-on-loan",
+            "genre-fine-stats",
+        ],
+        help="Run EXPLAIN (ANALYZE, BUFFERS) on a report query and summarize the plan.",
     )
 
     parser.add_argument(
@@ -134,8 +306,290 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         help="Run EXPLAIN ANALYZE loan history query for the given member_id",
     )
 
+    parser.add_argument(
+        "--explain-limit",
+        type=int,
+        metavar="N",
+        help="Row limit for the explained query. Defaults to the report's default.",
+    )
+
+    parser.add_argument(
+        "--explain-min-total",
+        type=float,
+        metavar="AMOUNT",
+        help="Minimum unpaid total for --explain unpaid-fines. Defaults to 0.",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print --overdue-members and --unpaid-fines-members rows in batches as they are fetched.",
+    )
+
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        default="text",
+        choices=("text", "json", "jsonl", "csv"),
+        help="Output format for reports, --search and --member-history. Formats "
+        "other than text are written to stdout as rows arrive. Defaults to text.",
+    )
+
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Maximum number of reports queried at once. Defaults to 5.",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="Rows per batch for --stream and --sweep-overdue. Defaults to 1000.",
+    )
+
+    parser.add_argument(
+        "--report-cache",
+        type=int,
+        metavar="N",
+        help="Cache up to N report results in memory, each for its report's TTL, "
+        "for reports and --load, and print hit rates at exit.",
+    )
+
+    parser.add_argument(
+        "--sweep-overdue",
+        action="store_true",
+        help="Mark past-due loans overdue and accrue their fines in batches.",
+    )
+
+    parser.add_argument(
+        "--fine-per-day",
+        type=float,
+        default=0.50,
+        metavar="RATE",
+        help="Fine per day overdue assessed by --sweep-overdue. Defaults to 0.50.",
+    )
+
+    parser.add_argument(
+        "--check-balances",
+        action="store_true",
+        help="Report members whose stored unpaid balance disagrees with their fines.",
+    )
+
+    parser.add_argument(
+        "--rebuild-balances",
+        action="store_true",
+        help="Recompute every member's unpaid balance from their fines.",
+    )
+
+    parser.add_argument(
+        "--partition-loans",
+        action="store_true",
+        help="Convert the loans table into monthly partitions on loan_date (PostgreSQL).",
+    )
+
+    parser.add_argument(
+        "--manage-partitions",
+        action="store_true",
+        help="Create upcoming loan partitions and archive old ones (PostgreSQL).",
+    )
+
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Months of future loan partitions to keep created. Defaults to 3.",
+    )
+
+    parser.add_argument(
+        "--archive-before",
+        type=date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="With --manage-partitions, archive returned loan partitions ending by this date.",
+    )
+
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Time every Client operation, reseeding the database at each of --scales. "
+        "Drops all tables first, so use a scratch database.",
+    )
+
+    parser.add_argument(
+        "--benchmark-records",
+        action="store_true",
+        help="Compare the bytes per row and build time of report rows held as "
+        "SQLAlchemy Rows against the Client's result records.",
+    )
+
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1],
+        metavar="N",
+        help="Scale factors to seed for --benchmark, each 100 authors, books and "
+        "members and 300 loans per unit. Defaults to 1.",
+    )
+
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Timed calls per operation for --benchmark. Defaults to 100.",
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Untimed calls per operation before --benchmark starts timing. Defaults to 5.",
+    )
+
+    parser.add_argument(
+        "--benchmark-out",
+        type=Path,
+        metavar="PATH",
+        help="Save --benchmark results as JSON to this file.",
+    )
+
+    parser.add_argument(
+        "--benchmark-baseline",
+        type=Path,
+        metavar="PATH",
+        help="Compare --benchmark results with a saved JSON run, exiting non-zero "
+        "on regressions.",
+    )
+
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.10,
+        metavar="FRACTION",
+        help="Slowdown in p50 or p95 that --benchmark-baseline flags. Defaults to 0.10.",
+    )
+
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Generate concurrent load from a weighted mix of checkouts, returns, "
+        "fine payments and reports, then report throughput, errors and latency.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Concurrent --load workers per process, sharing one connection pool. "
+        "Defaults to 10.",
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        metavar="M",
+        help="Processes to spread --load workers across. Defaults to 1.",
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        metavar="SECONDS",
+        help="How long --load runs for. Defaults to 10.",
+    )
+
+    parser.add_argument(
+        "--operations",
+        type=int,
+        metavar="N",
+        help="Stop --load after N operations in total instead of after --duration.",
+    )
+
+    parser.add_argument(
+        "--mix",
+        metavar="NAME=WEIGHT,...",
+        help="Relative weights of checkout, return, pay-fine and report for --load. "
+        "Defaults to checkout=4,return=4,pay-fine=1,report=1.",
+    )
+
+    parser.add_argument(
+        "--profile-sql",
+        action="store_true",
+        help="Time every SQL statement the client runs and print a summary at exit.",
+    )
+
+    parser.add_argument(
+        "--slow-query-ms",
+        type=float,
+        default=100.0,
+        metavar="MS",
+        help="With --profile-sql, log statements slower than this. Defaults to 100.",
+    )
+
+    parser.add_argument(
+        "--profile-out",
+        type=Path,
+        metavar="PATH",
+        help="Profile the run into PATH: sampled collapsed stacks for flame graphs "
+        "when it ends in .folded or .collapsed, otherwise cProfile pstats. Also "
+        "prints each client call's split between pool, database and Python at exit.",
+    )
+
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Trace allocations with tracemalloc and log peak memory, top allocation "
+        "sites and bytes per row after each populated table and report.",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        metavar="PATH",
+        help="Write Prometheus metrics to this file every --metrics-interval and at "
+        "exit, for a textfile collector.",
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        metavar="SECONDS",
+        help="How often --metrics-file is rewritten. Defaults to 15.",
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve Prometheus metrics on http://0.0.0.0:PORT/metrics while running.",
+    )
+
+    parser.add_argument(
+        "--pool-stats",
+        action="store_true",
+        help="Record connection pool checkouts, wait times and pre-ping cost and "
+        "print a summary at exit.",
+    )
+
     args = parser.parse_args(argv)
 
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.report_cache is not None and args.report_cache < 1:
+        parser.error("--report-cache must be at least 1")
+
     return CommandLineArguments(
         database_url=args.database_url,
         log_level=args.log_level.upper(),
@@ -143,14 +597,66 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         request_loan=tuple(args.request_loan) if args.request_loan else None,
         end_loan=args.end_loan,
         pay_fine=args.pay_fine,
+        place_hold=tuple(args.place_hold) if args.place_hold else None,
+        cancel_hold=args.cancel_hold,
+        search=args.search,
+        search_limit=args.search_limit,
         top_books=args.top_books,
         overdue_members=args.overdue_members,
         unpaid_fines_members=args.unpaid_fines_members,
         copies_on_loans=args.copies_on_loans,
         genre_fine_stats=args.genre_fine_stats,
+        export_snapshot=args.export_snapshot,
+        snapshot=args.snapshot,
+        build_catalog=args.build_catalog,
+        refresh_catalog=args.refresh_catalog,
+        catalog=args.catalog,
         member_history=args.member_history,
+        history_limit=args.history_limit,
+        history_cursor=args.history_cursor,
         create_indexes=args.create_indexes,
         drop_indexes=args.drop_indexes,
+        compare_indexes=args.compare_indexes,
+        index_report=args.index_report,
+        writes_per_run=args.writes_per_run,
+        repeats=args.repeats,
         explain=args.explain,
         explain_member_history=args.explain_member_history,
+        explain_limit=args.explain_limit,
+        explain_min_total=args.explain_min_total,
+        stream=args.stream,
+        max_concurrency=args.max_concurrency,
+        output_format=args.output_format,
+        batch_size=args.batch_size,
+        report_cache=args.report_cache,
+        sweep_overdue=args.sweep_overdue,
+        fine_per_day=args.fine_per_day,
+        check_balances=args.check_balances,
+        rebuild_balances=args.rebuild_balances,
+        partition_loans=args.partition_loans,
+        manage_partitions=args.manage_partitions,
+        months_ahead=args.months_ahead,
+        archive_before=args.archive_before,
+        benchmark=args.benchmark,
+        benchmark_records=args.benchmark_records,
+        scales=args.scales,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        benchmark_out=args.benchmark_out,
+        benchmark_baseline=args.benchmark_baseline,
+        regression_threshold=args.regression_threshold,
+        load=args.load,
+        workers=args.workers,
+        processes=args.processes,
+        duration=args.duration,
+        operations=args.operations,
+        mix=args.mix,
+        profile_sql=args.profile_sql,
+        slow_query_ms=args.slow_query_ms,
+        profile_out=args.profile_out,
+        trace_memory=args.trace_memory,
+        metrics_file=args.metrics_file,
+        metrics_interval=args.metrics_interval,
+        metrics_port=args.metrics_port,
+        pool_stats=args.pool_stats,
     )
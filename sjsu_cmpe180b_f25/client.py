@@ -1,24 +1,37 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
+import math
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from sqlalchemy import (
-    Float,
-    Integer,
+    BindParameter,
+    Executable,
     Row,
+    Select,
+    Update,
+    bindparam,
     case,
-    desc,
-    func,
+    delete,
+    insert,
     select,
-    type_coerce,
+    text,
     update,
 )
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from . import queries
+from .cache import ReportCache, cached_report
+from .metrics import MetricsRegistry
 from .models import (
     Author,
     Base,
@@ -27,22 +40,95 @@ from .models import (
     Copy,
     CopyStatus,
     Fine,
+    Hold,
+    HoldStatus,
     Loan,
     LoanStatus,
     Member,
+    MemberBalance,
+)
+from .pagination import Page, decode_cursor, encode_cursor
+from .partition import is_partitioned, open_loans_since
+from .pool import PoolMonitor
+from .profiling import CallProfiler, SqlProfiler, instrumented
+from .records import (
+    BalanceDrift,
+    BookUtilization,
+    GenreFines,
+    LoanHistory,
+    OverdueMember,
+    SearchHit,
+    TopBook,
+    UnpaidFines,
+    as_records,
 )
 
-M = TypeVar("M", Author, Book, BookAuthor, Copy, Fine, Loan, Member)
+if TYPE_CHECKING:
+    from .columns import Frame
+
+M = TypeVar("M", Author, Book, BookAuthor, Copy, Fine, Hold, Loan, Member)
+
+DAY = timedelta(days=1)
+
+
+def adjust_balance(
+    member_id: int | BindParameter[int],
+    amount: float | BindParameter[float],
+    count: int | BindParameter[int],
+) -> Update:
+    """Statement that moves a member's unpaid balance by `amount` and `count`."""
+    return (
+        update(MemberBalance)
+        .where(MemberBalance.member_id == member_id)
+        .values(
+            unpaid_total=MemberBalance.unpaid_total + amount,
+            unpaid_count=MemberBalance.unpaid_count + count,
+        )
+    )
+
+
+@dataclass(slots=True)
+class SweepResult:
+    batches: int = 0
+    loans_marked: int = 0
+    fines_created: int = 0
+    # Unpaid fines raised to what their loan owes now
+    fines_accrued: int = 0
 
 
 class Client:
-    def __init__(self, database_url: str) -> None:
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        cache: ReportCache | None = None,
+        profiler: SqlProfiler | None = None,
+        metrics: MetricsRegistry | None = None,
+        pool_monitor: PoolMonitor | None = None,
+        call_profiler: CallProfiler | None = None,
+    ) -> None:
+        self.__cache = cache
+        self.__metrics = metrics
+        self.__call_profiler = call_profiler
+        self.__trigram: bool | None = None
+        self.__partitioned: bool | None = None
         self.__engine = create_async_engine(
             database_url,
             pool_pre_ping=True,
             echo=False,
         )
 
+        if profiler is not None:
+            profiler.attach(self.__engine.sync_engine)
+        if pool_monitor is not None:
+            pool_monitor.attach(self.__engine.sync_engine)
+        if call_profiler is not None:
+            call_profiler.attach(self.__engine.sync_engine)
+        if metrics is not None:
+            metrics.register_engine(self.__engine.sync_engine)
+            if cache is not None:
+                metrics.register_cache(cache)
+
         self.__session_factory = async_sessionmaker(
             bind=self.__engine,
             autoflush=False,
@@ -50,11 +136,35 @@ class Client:
             expire_on_commit=False,
         )
 
-    async def __generic_create(self, model: M) -> M | None:
+    @property
+    def cache(self) -> ReportCache | None:
+        """Report cache, or None when reports always hit the database."""
+        return self.__cache
+
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """Metrics registry, or None when calls aren't being measured."""
+        return self.__metrics
+
+    @property
+    def call_profiler(self) -> CallProfiler | None:
+        """Call profiler, or None when calls aren't being broken down."""
+        return self.__call_profiler
+
+    def __invalidate(self, *tables: str) -> None:
+        if self.__cache is not None:
+            self.__cache.invalidate(*tables)
+
+    async def __generic_create(self, model: M, *also: Executable) -> M | None:
+        """Inserts `model`, running `also` in the same transaction."""
         async with self.__session_factory() as db:
             db.add(model)
             try:
+                await db.flush()
+                for stmt in also:
+                    await db.execute(stmt)
                 await db.commit()
+                self.__invalidate(model.__tablename__)
                 await db.refresh(model)
                 return model
             except IntegrityError as e:
@@ -66,9 +176,14 @@ class Client:
         async with self.__engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    async def drop_tables(self) -> None:
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
     async def dispose(self) -> None:
         await self.__engine.dispose()
 
+    @instrumented
     async def create_author(
         self,
         *,
@@ -82,6 +197,7 @@ class Client:
         )
         return await self.__generic_create(author)
 
+    @instrumented
     async def create_book(
         self,
         *,
@@ -101,6 +217,7 @@ class Client:
         )
         return await self.__generic_create(book)
 
+    @instrumented
     async def create_book_author(
         self,
         *,
@@ -114,6 +231,7 @@ class Client:
         )
         return await self.__generic_create(book_author)
 
+    @instrumented
     async def create_member(
         self,
         *,
@@ -129,8 +247,14 @@ class Client:
             email=email,
             joined_at=joined_at,
         )
-        return await self.__generic_create(member)
+        return await self.__generic_create(
+            member,
+            insert(MemberBalance).values(
+                member_id=member_id, unpaid_total=0.0, unpaid_count=0
+            ),
+        )
 
+    @instrumented
     async def create_copy(
         self,
         *,
@@ -146,6 +270,7 @@ class Client:
         )
         return await self.__generic_create(copy)
 
+    @instrumented
     async def create_loan(
         self,
         *,
@@ -168,18 +293,22 @@ class Client:
         )
         return await self.__generic_create(loan)
 
+    @instrumented
     async def create_fine(
         self,
         *,
-        fine_id: int,
+        fine_id: int | None = None,
         member_id: int,
-        loan_id: int,
+        loan_id: int | None,
         amount: float,
         assessed_at: datetime,
         paid: bool = False,
         paid_at: datetime | None = None,
     ) -> Fine | None:
-        """Creates a fine, returning the fine or None if it exists."""
+        """Creates a fine, returning the fine or None if it exists.
+
+        The fine ID is assigned by the database when `fine_id` is omitted.
+        """
         fine = Fine(
             fine_id=fine_id,
             member_id=member_id,
@@ -189,8 +318,10 @@ class Client:
             paid=paid,
             paid_at=paid_at,
         )
-        return await self.__generic_create(fine)
+        also = () if paid else (adjust_balance(member_id, amount, 1),)
+        return await self.__generic_create(fine, *also)
 
+    @instrumented
     async def request_loan(
         self,
         *,
@@ -203,7 +334,23 @@ class Client:
             result = await db.execute(stmt)
             copy = result.scalar_one_or_none()
 
-            if not copy or copy.status != CopyStatus.AVAILABLE:
+            held_for_member = False
+            if copy and copy.status == CopyStatus.ON_HOLD:
+                fulfilled = await db.execute(
+                    update(Hold)
+                    .where(
+                        Hold.copy_id == copy_id,
+                        Hold.member_id == member_id,
+                        Hold.status == HoldStatus.READY,
+                    )
+                    .values(status=HoldStatus.FULFILLED)
+                    .returning(Hold.hold_id)
+                )
+                held_for_member = fulfilled.first() is not None
+
+            if not copy or (
+                copy.status != CopyStatus.AVAILABLE and not held_for_member
+            ):
                 logging.getLogger(__name__).warning(
                     f"Copy '{copy_id}' is not available for loan."
                 )
@@ -222,6 +369,7 @@ class Client:
 
             try:
                 await db.commit()
+                self.__invalidate("loans", "copies", "holds")
                 await db.refresh(loan)
                 return loan
             except IntegrityError as e:
@@ -231,6 +379,7 @@ class Client:
                 await db.rollback()
                 return None
 
+    @instrumented
     async def end_loan(
         self,
         *,
@@ -242,7 +391,7 @@ class Client:
                 update(Loan)
                 .where(
                     Loan.loan_id == loan_id,
-                    Loan.status == LoanStatus.ACTIVE,
+                    Loan.status.in_((LoanStatus.ACTIVE, LoanStatus.OVERDUE)),
                 )
                 .values(return_date=datetime.now(tz=None), status=LoanStatus.RETURNED)
                 .returning(Loan.copy_id)
@@ -255,24 +404,115 @@ class Client:
                 )
                 return False
 
-            copy_id = row[0]
+            await self.__allocate_copy(db, row.copy_id)
+
+            try:
+                await db.commit()
+                self.__invalidate("loans", "copies", "holds")
+                return True
+            except IntegrityError as e:
+                logging.getLogger(__name__).error(
+                    f"Unable to end loan '{loan_id}': {e}"
+                )
+                await db.rollback()
+                return False
+
+    async def __allocate_copy(self, db: AsyncSession, copy_id: int) -> None:
+        """Hands a freed copy to the oldest waiting hold on its book, or shelves it.
+
+        The queue head is claimed with `FOR UPDATE SKIP LOCKED`, so concurrent
+        returns of the same book each take the next unclaimed hold instead of
+        waiting on one another.
+        """
+        book_id = select(Copy.book_id).where(Copy.copy_id == copy_id).scalar_subquery()
+        next_hold = (
+            select(Hold.hold_id)
+            .where(Hold.book_id == book_id, Hold.status == HoldStatus.WAITING)
+            .order_by(Hold.placed_at, Hold.hold_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(Hold)
+            .where(Hold.hold_id == next_hold)
+            .values(
+                status=HoldStatus.READY,
+                copy_id=copy_id,
+                ready_at=datetime.now(tz=None),
+            )
+            .returning(Hold.hold_id, Hold.member_id)
+        )
+        hold = result.first()
+
+        await db.execute(
+            update(Copy)
+            .where(Copy.copy_id == copy_id)
+            .values(status=CopyStatus.AVAILABLE if hold is None else CopyStatus.ON_HOLD)
+        )
 
-            await db.execute(
-                update(Copy)
-                .where(Copy.copy_id == copy_id)
-                .values(status=CopyStatus.AVAILABLE)
+        if hold is not None:
+            logging.getLogger(__name__).info(
+                f"Copy '{copy_id}' is held for member '{hold.member_id}' "
+                f"(hold '{hold.hold_id}')."
             )
 
+    @instrumented
+    async def place_hold(
+        self,
+        *,
+        book_id: int,
+        member_id: int,
+    ) -> Hold | None:
+        """Queues a member for the next returned copy of a book, returning the hold or None if not possible."""
+        hold = Hold(
+            book_id=book_id,
+            member_id=member_id,
+            placed_at=datetime.now(tz=None),
+            status=HoldStatus.WAITING,
+        )
+        return await self.__generic_create(hold)
+
+    @instrumented
+    async def cancel_hold(
+        self,
+        *,
+        hold_id: int,
+    ) -> bool:
+        """Cancels a hold, passing on any copy set aside for it. Returns True if successful."""
+        async with self.__session_factory() as db:
+            result = await db.execute(
+                update(Hold)
+                .where(
+                    Hold.hold_id == hold_id,
+                    Hold.status.in_((HoldStatus.WAITING, HoldStatus.READY)),
+                )
+                .values(status=HoldStatus.CANCELLED)
+                .returning(Hold.copy_id)
+            )
+
+            row = result.first()
+            if not row:
+                logging.getLogger(__name__).warning(
+                    f"Hold '{hold_id}' is not open and cannot be cancelled."
+                )
+                return False
+
+            if row.copy_id is not None:
+                await self.__allocate_copy(db, row.copy_id)
+
             try:
                 await db.commit()
+                self.__invalidate("holds", "copies")
                 return True
             except IntegrityError as e:
                 logging.getLogger(__name__).error(
-                    f"Unable to end loan '{loan_id}': {e}"
+                    f"Unable to cancel hold '{hold_id}': {e}"
                 )
                 await db.rollback()
                 return False
 
+    @instrumented
     async def pay_fine(
         self,
         *,
@@ -287,7 +527,7 @@ class Client:
                     Fine.paid == False,  # noqa: E712
                 )
                 .values(paid=True, paid_at=datetime.now(tz=None))
-                .returning(Fine.fine_id)
+                .returning(Fine.member_id, Fine.amount)
             )
 
             row = result.first()
@@ -297,8 +537,11 @@ class Client:
                 )
                 return False
 
+            await db.execute(adjust_balance(row.member_id, -row.amount, -1))
+
             try:
                 await db.commit()
+                self.__invalidate("fines", "member_balances")
                 return True
             except IntegrityError as e:
                 logging.getLogger(__name__).error(
@@ -307,164 +550,376 @@ class Client:
                 await db.rollback()
                 return False
 
-    async def get_top_books(
-        self, limit: int = 10
-    ) -> Sequence[Row[tuple[int, str, int]]]:
-        """Return the top N most loaned books"""
-        async with self.__session_factory() as db:
-            stmt = (
-                select(
-                    Book.book_id,
-                    Book.title,
-                    func.count(Loan.loan_id).label("total_loans"),
-                )
-                .join(Copy, Copy.book_id == Book.book_id)
-                .join(Loan, Loan.copy_id == Copy.copy_id)
-                .group_by(Book.book_id, Book.title)
-                .order_by(desc("total_loans"), Book.title)
-                .limit(limit)
-            )
-
-            result = await db.execute(stmt)
-            return result.all()
-
-    async def get_overdue_members(
+    @instrumented
+    async def sweep_overdue(
         self,
-    ) -> Sequence[Row[tuple[int, str, str, int, datetime]]]:
-        """Return members who currently have overdue loans"""
-        async with self.__session_factory() as db:
-            stmt = (
-                select(
-                    Member.member_id,
-                    Member.name,
-                    Member.email,
-                    func.count(Loan.loan_id).label("overdue_count"),
-                    func.min(Loan.due_date).label("earliest_due_date"),
-                )
-                .join(Loan, Loan.member_id == Member.member_id)
+        *,
+        fine_per_day: float = 0.50,
+        batch_size: int = 1000,
+        now: datetime | None = None,
+    ) -> SweepResult:
+        """Marks past-due active loans overdue, then fines every open overdue
+        loan `fine_per_day` for each started day past due, in bounded batches.
+
+        Each batch claims up to `batch_size` loans with `FOR UPDATE SKIP
+        LOCKED` (skipping rows locked by concurrent checkouts and returns) and
+        commits before the next, so row locks are held only briefly. Fines
+        accrue: a loan fined less than it now owes has the difference added
+        to its latest unpaid fine, or a new fine if it has none. What a loan
+        owes depends only on `now`, so re-running is safe.
+        """
+        now = now or datetime.now(tz=None)
+        sweep = SweepResult()
+
+        while True:
+            candidates = (
+                select(Loan.loan_id)
                 .where(
                     Loan.status == LoanStatus.ACTIVE,
                     Loan.return_date.is_(None),
-                    Loan.due_date < datetime.now(tz=None),
+                    Loan.due_date < now,
                 )
-                .group_by(
-                    Member.member_id,
-                    Member.name,
-                    Member.email,
-                )
-                .order_by(
-                    desc("overdue_count"),
-                    func.min(Loan.due_date),
+                .order_by(Loan.loan_id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+
+            async with self.__engine.begin() as conn:
+                result = await conn.execute(
+                    update(Loan)
+                    .where(Loan.loan_id.in_(candidates.scalar_subquery()))
+                    .values(status=LoanStatus.OVERDUE)
+                    .returning(Loan.loan_id)
                 )
+                marked = len(result.all())
+            if not marked:
+                break
+
+            sweep.batches += 1
+            sweep.loans_marked += marked
+            self.__invalidate("loans")
+            logging.getLogger(__name__).debug(
+                f"Sweep batch {sweep.batches}: marked {marked} loans overdue"
             )
 
-            result = await db.execute(stmt)
-            return result.all()
+            if marked < batch_size:
+                break
 
-    async def get_unpaid_fines_members(
-        self,
-        min_total: float = 0.0,
-    ) -> Sequence[Row[tuple[int, str, str, float, int]]]:
-        """Return members with unpaid fines with optional min threshold"""
-        async with self.__session_factory() as db:
-            total_unpaid = func.sum(Fine.amount).label("total_unpaid")
-            fine_count = func.count(Fine.fine_id).label("unpaid_fine_count")
-
-            stmt = (
-                select(
-                    Member.member_id,
-                    Member.name,
-                    Member.email,
-                    total_unpaid,
-                    fine_count,
-                )
-                .join(Fine, Fine.member_id == Member.member_id)
-                .where(Fine.paid.is_(False))
-                .group_by(
-                    Member.member_id,
-                    Member.name,
-                    Member.email,
+        after = 0
+        while True:
+            candidates = (
+                select(Loan.loan_id)
+                .where(
+                    Loan.status == LoanStatus.OVERDUE,
+                    Loan.return_date.is_(None),
+                    Loan.loan_id > after,
                 )
+                .order_by(Loan.loan_id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
             )
 
-            if min_total > 0:
-                stmt = stmt.having(total_unpaid >= min_total)
+            async with self.__engine.begin() as conn:
+                loan_ids = list((await conn.execute(candidates)).scalars())
+                if not loan_ids:
+                    break
+                after = loan_ids[-1]
+
+                fines: list[dict[str, Any]] = []
+                shortfalls: dict[int, float] = {}
+                for row in await conn.execute(queries.loan_fines(loan_ids)):
+                    owed = round(
+                        fine_per_day * math.ceil((now - row.due_date) / DAY), 2
+                    )
+                    shortfall = round(owed - row.fined, 2)
+                    if shortfall <= 0:
+                        continue
+                    if row.unpaid_fine_id is not None:
+                        shortfalls[row.unpaid_fine_id] = shortfall
+                        continue
+                    fines.append(
+                        {
+                            "member_id": row.member_id,
+                            "loan_id": row.loan_id,
+                            "amount": shortfall,
+                            "assessed_at": now,
+                            "paid": False,
+                        }
+                    )
+
+                owed_by: dict[int, tuple[float, int]] = {}
+                accrued = 0
+                if shortfalls:
+                    # Fines paid since they were read are left for the next sweep
+                    raised = await conn.execute(
+                        update(Fine)
+                        .where(Fine.fine_id.in_(shortfalls), Fine.paid.is_(False))
+                        .values(
+                            amount=Fine.amount + case(shortfalls, value=Fine.fine_id)
+                        )
+                        .returning(Fine.fine_id, Fine.member_id)
+                    )
+                    for fine_id, member_id in raised:
+                        total, count = owed_by.get(member_id, (0.0, 0))
+                        owed_by[member_id] = (total + shortfalls[fine_id], count)
+                        accrued += 1
+                if fines:
+                    await conn.execute(insert(Fine), fines)
+                    for fine in fines:
+                        total, count = owed_by.get(fine["member_id"], (0.0, 0))
+                        owed_by[fine["member_id"]] = (total + fine["amount"], count + 1)
+                if owed_by:
+                    await conn.execute(
+                        adjust_balance(
+                            bindparam("b_member_id"),
+                            bindparam("b_amount"),
+                            bindparam("b_count"),
+                        ),
+                        [
+                            {"b_member_id": member, "b_amount": total, "b_count": count}
+                            for member, (total, count) in owed_by.items()
+                        ],
+                    )
+
+            sweep.batches += 1
+            sweep.fines_created += len(fines)
+            sweep.fines_accrued += accrued
+            self.__invalidate("fines", "member_balances")
+            logging.getLogger(__name__).debug(
+                f"Sweep batch {sweep.batches}: created {len(fines)} fines and "
+                f"accrued {accrued} for {len(loan_ids)} overdue loans"
+            )
 
-            stmt = stmt.order_by(desc("total_unpaid"), desc("unpaid_fine_count"))
+            if len(loan_ids) < batch_size:
+                break
 
-            result = await db.execute(stmt)
-            return result.all()
+        return sweep
 
-    async def get_copies_on_loan(
+    @instrumented
+    async def check_member_balances(
         self,
-        limit: int = 20,
-    ) -> Sequence[Row[tuple[int, str, int, int, float]]]:
-        """Return loan stats per book title"""
-        async with self.__session_factory() as db:
-            total_copies = func.count(Copy.copy_id)
-            copies_on_loan = func.sum(
-                case((Copy.status == CopyStatus.ON_LOAN, 1), else_=0)
+    ) -> list[BalanceDrift]:
+        """Return members whose stored balance disagrees with their unpaid fines."""
+        async with self.__engine.connect() as conn:
+            stmt = queries.member_balance_drift()
+            return as_records(await conn.execute(stmt), stmt, BalanceDrift)
+
+    @instrumented
+    async def rebuild_member_balances(self) -> int:
+        """Recomputes every member balance from `fines`, returning the row count."""
+        async with self.__engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # Writers that commit a fine after this snapshot would otherwise
+                # adjust a balance row that is about to be replaced.
+                await conn.execute(text("LOCK TABLE member_balances IN EXCLUSIVE MODE"))
+
+            await conn.execute(delete(MemberBalance))
+            result = await conn.execute(
+                insert(MemberBalance).from_select(
+                    ["member_id", "unpaid_total", "unpaid_count"],
+                    queries.unpaid_fine_totals(),
+                )
             )
 
-            stmt = (
-                select(
-                    Book.book_id,
-                    Book.title,
-                    type_coerce(total_copies, Integer).label("total_copies"),
-                    type_coerce(copies_on_loan, Integer).label("copies_on_loan"),
-                    type_coerce(
-                        copies_on_loan * 100.0 / func.nullif(total_copies, 0), Float
-                    ).label("utilization_percent"),
+        self.__invalidate("member_balances")
+        return result.rowcount
+
+    async def __stream[T: tuple[Any, ...], R](
+        self, stmt: Select[T], batch_size: int, record: Callable[[Row[T]], R]
+    ) -> AsyncIterator[list[R]]:
+        """Yield the rows of `stmt` as records in batches from a server-side cursor."""
+        async with self.__engine.connect() as conn:
+            result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+            async for batch in result.partitions(batch_size):
+                yield [record(row) for row in batch]
+
+    async def __open_loans_since(self, conn: AsyncConnection) -> datetime | None:
+        """`open_loans_since`, checking whether `loans` is partitioned once."""
+        if conn.dialect.name != "postgresql":
+            return None
+        if self.__partitioned is None:
+            self.__partitioned = await is_partitioned(conn)
+        return await open_loans_since(conn, partitioned=self.__partitioned)
+
+    async def __has_trigram(self, conn: AsyncConnection) -> bool:
+        """Whether the pg_trgm extension is installed, checked once."""
+        if self.__trigram is None:
+            result = await conn.execute(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
                 )
-                .join(Copy, Copy.book_id == Book.book_id)
-                .group_by(Book.book_id, Book.title)
-                .order_by(
-                    desc("utilization_percent"),
-                    desc("total_copies"),
-                )
-                .limit(limit)
             )
+            self.__trigram = bool(result.scalar_one())
+        return self.__trigram
+
+    @instrumented
+    @cached_report("books", "authors", "book_authors")
+    async def search_books(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """Return books whose title or authors match a query, best match first"""
+        if not query.strip():
+            return []
+
+        async with self.__engine.connect() as conn:
+            full_text = conn.dialect.name == "postgresql"
+            trigram = full_text and await self.__has_trigram(conn)
+            stmt = queries.search_books(
+                query, limit, full_text=full_text, trigram=trigram
+            )
+            return as_records(await conn.execute(stmt), stmt, SearchHit)
 
-            result = await db.execute(stmt)
-            return result.all()
+    @instrumented
+    @cached_report("books", "copies", "loans")
+    async def get_top_books(self, limit: int = 10) -> list[TopBook]:
+        """Return the top N most loaned books"""
+        async with self.__engine.connect() as conn:
+            stmt = queries.top_books(limit)
+            return as_records(await conn.execute(stmt), stmt, TopBook)
 
-    async def get_genre_fine_statistics(
+    @instrumented
+    @cached_report("members", "loans")
+    async def get_overdue_members(self) -> list[OverdueMember]:
+        """Return members who currently have overdue loans"""
+        async with self.__engine.connect() as conn:
+            open_since = await self.__open_loans_since(conn)
+            stmt = queries.overdue_members(datetime.now(tz=None), open_since)
+            return as_records(await conn.execute(stmt), stmt, OverdueMember)
+
+    async def stream_overdue_members(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[OverdueMember]]:
+        """Yield members who currently have overdue loans in batches"""
+        async with self.__engine.connect() as conn:
+            open_since = await self.__open_loans_since(conn)
+        async for batch in self.__stream(
+            queries.overdue_members(datetime.now(tz=None), open_since),
+            batch_size,
+            OverdueMember._make,
+        ):
+            yield batch
+
+    @instrumented
+    @cached_report("members", "fines", "member_balances")
+    async def get_unpaid_fines_members(
         self,
-    ) -> Sequence[Row[tuple[str | None, int, float]]]:
-        """Return fine stats aggregated by book genre"""
-        async with self.__session_factory() as db:
-            stmt = (
-                select(
-                    Book.genre,
-                    func.count(Fine.fine_id).label("fine_count"),
-                    func.sum(Fine.amount).label("total_fines"),
-                )
-                .join(Loan, Loan.loan_id == Fine.loan_id)
-                .join(Copy, Copy.copy_id == Loan.copy_id)
-                .join(Book, Book.book_id == Copy.book_id)
-                .group_by(Book.genre)
-                .order_by(desc("total_fines"))
-            )
+        min_total: float = 0.0,
+    ) -> list[UnpaidFines]:
+        """Return members with unpaid fines with optional min threshold"""
+        async with self.__engine.connect() as conn:
+            stmt = queries.unpaid_fines_members(min_total)
+            return as_records(await conn.execute(stmt), stmt, UnpaidFines)
 
-            result = await db.execute(stmt)
-            return result.all()
+    def stream_unpaid_fines_members(
+        self,
+        min_total: float = 0.0,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[UnpaidFines]]:
+        """Yield members with unpaid fines in batches with optional min threshold"""
+        return self.__stream(
+            queries.unpaid_fines_members(min_total), batch_size, UnpaidFines._make
+        )
 
+    @instrumented
+    @cached_report("books", "copies")
+    async def get_copies_on_loan(
+        self,
+        limit: int = 20,
+    ) -> list[BookUtilization]:
+        """Return loan stats per book title"""
+        async with self.__engine.connect() as conn:
+            stmt = queries.copies_on_loan(limit)
+            return as_records(await conn.execute(stmt), stmt, BookUtilization)
+
+    @instrumented
+    @cached_report("books", "copies", "loans", "fines")
+    async def get_genre_fine_statistics(self) -> list[GenreFines]:
+        """Return fine stats aggregated by book genre"""
+        async with self.__engine.connect() as conn:
+            stmt = queries.genre_fine_statistics()
+            return as_records(await conn.execute(stmt), stmt, GenreFines)
+
+    @instrumented
+    @cached_report("loans")
     async def get_member_history(
         self, member_id: int, limit: int = 50
-    ) -> Sequence[Row[tuple[int, int, datetime, datetime, LoanStatus]]]:
+    ) -> list[LoanHistory]:
         """Return how many loans a member has, ordered by loan date"""
         async with self.__engine.begin() as conn:
-            query = (
-                select(
-                    Loan.loan_id,
-                    Loan.copy_id,
-                    Loan.loan_date,
-                    Loan.due_date,
-                    Loan.status,
-                )
-                .where(Loan.member_id == member_id)
-                .order_by(Loan.loan_date.desc())
-                .limit(limit)
-            )
-            result = await conn.execute(query)
-            return result.fetchall()
+            stmt = queries.member_history(member_id, limit)
+            return as_records(await conn.execute(stmt), stmt, LoanHistory)
+
+    @instrumented
+    @cached_report("loans")
+    async def get_member_history_page(
+        self, member_id: int, limit: int = 50, cursor: str | None = None
+    ) -> Page[LoanHistory]:
+        """Return one page of a member's loans, newest first, with the next cursor.
+
+        Pages are keyed on `(loan_date, loan_id)` rather than OFFSET, so each
+        page is a range scan on `idx_loans_member_date` regardless of depth.
+        Raises ValueError if `cursor` is malformed.
+        """
+        after = decode_cursor(cursor) if cursor is not None else None
+        stmt = queries.member_history(member_id, limit + 1, after)
+
+        async with self.__engine.begin() as conn:
+            rows = as_records(await conn.execute(stmt), stmt, LoanHistory)
+
+        # A tuple, so a page shared through the report cache can't be mutated
+        if len(rows) <= limit:
+            return Page(rows=tuple(rows), next_cursor=None)
+
+        last = rows[limit - 1]
+        return Page(
+            rows=tuple(rows[:limit]),
+            next_cursor=encode_cursor(last.loan_date, last.loan_id),
+        )
+
+    @instrumented
+    async def fetch_columns(
+        self, stmt: Select[Any], *, batch_size: int = 10_000
+    ) -> Frame:
+        """Return the rows of `stmt` as one NumPy array per column, by name.
+
+        Timestamps become `datetime64[us]`, and enums their position in the
+        enum's members, -1 for NULL. Integer columns that may be NULL become
+        floats with NaN. Requires the `analytics` extra.
+        """
+        # NumPy is optional, so only needed once columns are asked for
+        from .columns import fetch_frame
+
+        async with self.__engine.connect() as conn:
+            return await conn.run_sync(fetch_frame, stmt, batch_size)
+
+    @instrumented
+    async def fetch_tables(
+        self, tables: Mapping[str, Select[Any]], *, batch_size: int = 10_000
+    ) -> dict[str, Frame]:
+        """Return each statement's rows as columns, all read from one snapshot."""
+        # NumPy is optional, so only needed once columns are asked for
+        from .columns import fetch_frame
+
+        async with self.__engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                # Every statement then sees the same committed data
+                conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+            async with conn.begin():
+                return {
+                    name: await conn.run_sync(fetch_frame, stmt, batch_size)
+                    for name, stmt in tables.items()
+                }
+
+    async def loans_frame(self, *, batch_size: int = 10_000) -> Frame:
+        """Return every loan as columns; `status` codes index `list(LoanStatus)`"""
+        return await self.fetch_columns(queries.loan_table(), batch_size=batch_size)
+
+    async def fines_frame(self, *, batch_size: int = 10_000) -> Frame:
+        """Return every fine as columns; `loan_id` is NaN for fines without a loan"""
+        return await self.fetch_columns(queries.fine_table(), batch_size=batch_size)
+
+    def stream_member_history(
+        self, member_id: int, batch_size: int = 1000
+    ) -> AsyncIterator[list[LoanHistory]]:
+        """Yield a member's entire loan history in batches, newest first"""
+        return self.__stream(
+            queries.member_history(member_id), batch_size, LoanHistory._make
+        )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ColumnElement,
+    Connection,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    Integer,
+    Numeric,
+    Select,
+)
+
+from .records import result_processors
+
+type Frame = dict[str, NDArray[Any]]
+
+# Code for a NULL enum value
+NULL_CODE = -1
+
+
+class _ColumnBuilder:
+    """Converts one column of a result to an array a batch at a time."""
+
+    def __init__(self, name: str, column: ColumnElement[Any]) -> None:
+        self.name = name
+        self.codes: dict[object, int] | None = None
+        type_ = column.type
+        self.dtype: DTypeLike
+        if isinstance(type_, Enum):
+            members: list[object] = (
+                list(type_.enum_class) if type_.enum_class else list(type_.enums)
+            )
+            self.codes = {member: code for code, member in enumerate(members)}
+            self.codes[None] = NULL_CODE
+            self.dtype = np.int8 if len(members) < 128 else np.int32
+        elif isinstance(type_, DateTime):
+            self.dtype = "datetime64[us]"
+        elif isinstance(type_, Date):
+            self.dtype = "datetime64[D]"
+        elif isinstance(type_, Boolean):
+            self.dtype = np.bool_
+        elif isinstance(type_, Integer):
+            # NULLs can't be held in an integer array, so nullable integer
+            # columns become floats with NaN, as they would in pandas
+            nullable = isinstance(column, Column) and column.nullable
+            self.dtype = np.float64 if nullable else np.int64
+        elif isinstance(type_, Float | Numeric):
+            self.dtype = np.float64
+        else:
+            self.dtype = np.object_
+        self.batches: list[NDArray[Any]] = []
+
+    def add(self, values: Sequence[Any]) -> None:
+        if self.codes is not None:
+            codes = self.codes
+            self.batches.append(
+                np.fromiter((codes[value] for value in values), self.dtype, len(values))
+            )
+            return
+        try:
+            self.batches.append(np.array(values, dtype=self.dtype))
+        except TypeError as e:
+            raise ValueError(
+                f"Column '{self.name}' has NULLs; coalesce it or select it from "
+                "a nullable table column"
+            ) from e
+
+    def build(self) -> NDArray[Any]:
+        if not self.batches:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(self.batches)
+
+
+def fetch_frame(conn: Connection, stmt: Select[Any], batch_size: int) -> Frame:
+    """Stream `stmt` from a server-side cursor and build one array per column.
+
+    Batches are the driver's own tuples, so no `Row` is made; each is
+    transposed into its columns, converted a column at a time where the
+    column's type converts driver values, and dropped, so only one batch of
+    rows is ever held.
+    """
+    builders = [
+        _ColumnBuilder(name, column) for name, column in stmt.selected_columns.items()
+    ]
+    result = conn.execute(
+        stmt.execution_options(stream_results=True, max_row_buffer=batch_size)
+    )
+    try:
+        processors = result_processors(result, stmt)
+        # Rather than `result.cursor` itself, which would skip any rows the
+        # result buffered ahead of it for a server-side cursor. The result
+        # lets go of its cursor once it's spent.
+        strategy = result.cursor_strategy
+        while result.cursor is not None:
+            batch = strategy.fetchmany(result, result.cursor, batch_size)
+            if not batch:
+                break
+            for builder, process, values in zip(
+                builders, processors, zip(*batch, strict=True), strict=True
+            ):
+                builder.add(values if process is None else list(map(process, values)))
+    finally:
+        result.close()
+    return {builder.name: builder.build() for builder in builders}
+
+
+def positions(keys: NDArray[Any], wanted: NDArray[Any]) -> NDArray[np.intp]:
+    """Where each of `wanted` is in the sorted, unique `keys`, as a join would
+    find them. Raises ValueError if any is missing."""
+    found = np.searchsorted(keys, wanted)
+    if len(wanted) and (
+        not len(keys) or (keys[np.minimum(found, len(keys) - 1)] != wanted).any()
+    ):
+        raise ValueError("Rows reference keys that aren't there")
+    return found
@@ -1,89 +1,160 @@
 from __future__ import annotations
 
+import inspect
+import json
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import ClauseElement, Executable, Select
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
 
-EXPLAIN_QUERIES = {
-    "top-books": """
-        EXPLAIN ANALYZE
-        SELECT
-            b.book_id,
-            b.title,
-            COUNT(*) AS loan_count
-        FROM books b
-        JOIN copies c ON c.book_id = b.book_id
-        JOIN loans l ON l.copy_id = c.copy_id
-        GROUP BY b.book_id, b.title
-        ORDER BY loan_count DESC
-        LIMIT 10;
-    """,
-    "overdue-members": """
-        EXPLAIN ANALYZE
-        SELECT DISTINCT
-            m.member_id,
-            m.name,
-            m.email
-        FROM members m
-        JOIN loans l ON m.member_id = l.member_id
-        WHERE l.status = 'OVERDUE'::loanstatus;
-    """,
-    "unpaid-fines": """
-        EXPLAIN ANALYZE
-        SELECT
-            m.member_id,
-            m.name,
-            SUM(f.amount) AS total_unpaid
-        FROM members m
-        JOIN fines f ON m.member_id = f.member_id
-        WHERE f.paid = FALSE
-        GROUP BY m.member_id, m.name
-        HAVING SUM(f.amount) > 20.0;
-    """,
-    "member-history": """
-        EXPLAIN ANALYZE
-        SELECT
-            loan_id,
-            copy_id,
-            loan_date,
-            due_date,
-            status
-        FROM loans
-        WHERE member_id = :member_id
-        ORDER BY loan_date DESC
-        LIMIT 50;
-    """,
+from . import queries
+from .partition import open_loans_since
+
+# The statements the Client runs, built by the same query builders, with the
+# Client methods' default parameters. `open_since` is looked up by
+# `run_explain` as the Client looks it up.
+EXPLAIN_QUERIES: dict[str, Callable[..., Select[Any]]] = {
+    "top-books": lambda limit=10: queries.top_books(limit),
+    "overdue-members": lambda open_since=None: queries.overdue_members(
+        datetime.now(tz=None), open_since
+    ),
+    "unpaid-fines": lambda min_total=0.0: queries.unpaid_fines_members(min_total),
+    "copies-on-loan": lambda limit=20: queries.copies_on_loan(limit),
+    "genre-fine-stats": queries.genre_fine_statistics,
+    "member-history": lambda member_id, limit=50: queries.member_history(
+        member_id, limit
+    ),
 }
 
 
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` wrapped around a statement"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    statement = compiler.process(element.statement, **kw)
+    return f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}"
+
+
+@dataclass(frozen=True, slots=True)
+class PlanSummary:
+    planning_ms: float
+    execution_ms: float
+    rows: int
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    costliest_node: str
+    costliest_ms: float
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.shared_hit_blocks + self.shared_read_blocks
+        return self.shared_hit_blocks / total if total else 1.0
+
+
+def describe_node(node: dict[str, Any]) -> str:
+    """A plan node's type and the relation or index it reads, if any"""
+    target = node.get("Index Name") or node.get("Relation Name")
+    return f"{node['Node Type']} on {target}" if target else node["Node Type"]
+
+
+def exclusive_ms(node: dict[str, Any]) -> float:
+    """Time spent in a node itself, excluding its children, over all loops"""
+    total = float(node["Actual Total Time"] * node["Actual Loops"])
+    children = sum(
+        float(child["Actual Total Time"] * child["Actual Loops"])
+        for child in node.get("Plans", [])
+    )
+    return max(total - children, 0.0)
+
+
+def summarize_plan(explained: list[dict[str, Any]]) -> PlanSummary:
+    """Summarize the output of `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`"""
+    root = explained[0]
+    plan = root["Plan"]
+
+    nodes = [plan]
+    costliest = plan
+    while nodes:
+        node = nodes.pop()
+        if exclusive_ms(node) > exclusive_ms(costliest):
+            costliest = node
+        nodes.extend(node.get("Plans", []))
+
+    return PlanSummary(
+        planning_ms=root["Planning Time"],
+        execution_ms=root["Execution Time"],
+        rows=plan["Actual Rows"],
+        shared_hit_blocks=plan.get("Shared Hit Blocks", 0),
+        shared_read_blocks=plan.get("Shared Read Blocks", 0),
+        costliest_node=describe_node(costliest),
+        costliest_ms=exclusive_ms(costliest),
+    )
+
+
 async def run_explain(
     database_url: str,
     query_name: str,
     **params: object,
-) -> None:
+) -> PlanSummary | None:
     if query_name not in EXPLAIN_QUERIES:
         raise ValueError(f"Unknown query name '{query_name}'")
 
     logger = logging.getLogger(__name__)
     logger.info(f"Running EXPLAIN ANALYZE for: {query_name}")
 
+    build = EXPLAIN_QUERIES[query_name]
+    accepted = inspect.signature(build).parameters
+    for name in params.keys() - accepted.keys():
+        logger.warning(f"Ignoring '{name}', which {query_name} does not take.")
+    params = {k: v for k, v in params.items() if k in accepted}
+
     engine = create_async_engine(database_url, pool_pre_ping=True)
 
     try:
-        async with engine.begin() as conn:
-            stmt = text(EXPLAIN_QUERIES[query_name])
-            if params:
-                stmt = stmt.bindparams(**params)
+        if engine.dialect.name != "postgresql":
+            logger.error("EXPLAIN (ANALYZE, BUFFERS) requires PostgreSQL.")
+            return None
 
-            result = await conn.execute(stmt)
-            plan = "\n".join(row[0] for row in result.fetchall())
+        # EXPLAIN ANALYZE executes the statement; roll back anything it does
+        async with engine.connect() as conn:
+            if "open_since" in accepted:
+                params["open_since"] = await open_loans_since(conn)
+            statement = build(**params)
+            result = await conn.execute(Explain(statement))
+            explained = result.scalar_one()
+            await conn.rollback()
     finally:
         await engine.dispose()
 
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+
+    logger.debug(json.dumps(explained, indent=2))
+    summary = summarize_plan(explained)
+
     lines = [
-        "\n======== EXPLAIN ANALYZE plan ========",
-        plan,
-        "======================================",
+        "\n======== EXPLAIN ANALYZE summary ========",
+        f"Planning time:   {summary.planning_ms:.3f} ms",
+        f"Execution time:  {summary.execution_ms:.3f} ms",
+        f"Rows:            {summary.rows}",
+        f"Shared buffers:  {summary.shared_hit_blocks} hit, "
+        f"{summary.shared_read_blocks} read ({summary.hit_ratio:.1%} hit)",
+        f"Costliest node:  {summary.costliest_node} "
+        f"({summary.costliest_ms:.3f} ms exclusive)",
+        "=========================================",
     ]
     logger.info("\n".join(lines))
+    return summary
@@ -1,43 +1,123 @@
 from __future__ import annotations
 
 import logging
+import statistics
+import time
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import Executable, Select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
-INDEX_STATEMENTS: list[str] = [
+from . import queries
+
+BTREE_INDEXES: dict[str, str] = {
     # Complex Query 1 – Top N most-loaned books
     # Speeds up joins books -> copies -> loans
-    "CREATE INDEX IF NOT EXISTS idx_copies_book_id ON copies (book_id)",
-    "CREATE INDEX IF NOT EXISTS idx_loans_copy_id ON loans (copy_id)",
+    "idx_copies_book_id": "CREATE INDEX IF NOT EXISTS idx_copies_book_id "
+    "ON copies (book_id)",
+    "idx_loans_copy_id": "CREATE INDEX IF NOT EXISTS idx_loans_copy_id "
+    "ON loans (copy_id)",
     # Complex Query 2 – Members with overdue loans
     # Helps filter by status and due_date when looking for overdue loans
-    "CREATE INDEX IF NOT EXISTS idx_loans_status_due_date ON loans (status, due_date)",
-    "CREATE INDEX IF NOT EXISTS idx_loans_member_id ON loans (member_id)",
+    "idx_loans_status_due_date": "CREATE INDEX IF NOT EXISTS "
+    "idx_loans_status_due_date ON loans (status, due_date)",
+    "idx_loans_member_id": "CREATE INDEX IF NOT EXISTS idx_loans_member_id "
+    "ON loans (member_id)",
     # Complex Query 3 – Members with large unpaid fines
-    # Supports grouping and filtering by member on unpaid fines
-    "CREATE INDEX IF NOT EXISTS idx_fines_member_id ON fines (member_id)",
+    # The report reads member_balances; these serve the balance check/rebuild
+    # that group unpaid fines by member
+    "idx_fines_member_id": "CREATE INDEX IF NOT EXISTS idx_fines_member_id "
+    "ON fines (member_id)",
     # Partial index - only unpaid fines, smaller & more selective
-    "CREATE INDEX IF NOT EXISTS idx_fines_unpaid_member "
+    "idx_fines_unpaid_member": "CREATE INDEX IF NOT EXISTS idx_fines_unpaid_member "
     "ON fines (member_id) WHERE paid = FALSE",
     # Index Query - How many loans a specifc member has
-    "CREATE INDEX IF NOT EXISTS idx_loans_member_date "
-    "ON loans (member_id, loan_date DESC);",
-]
-
-INDEX_NAMES = [
-    "idx_copies_book_id",
-    "idx_loans_copy_id",
-    "idx_loans_status_due_date",
-    "idx_loans_member_id",
-    "idx_fines_member_id",
-    "idx_fines_unpaid_member",
-    "idx_loans_member_date",
-]
+    # loan_id breaks loan_date ties so keyset pages can seek on the index
+    "idx_loans_member_date": "CREATE INDEX IF NOT EXISTS idx_loans_member_date "
+    "ON loans (member_id, loan_date DESC, loan_id DESC)",
+}
+
+# PostgreSQL replaces the overdue and member history indexes with covering
+# ones, so both queries can be answered by index-only scans, and indexes the
+# append-mostly time columns with BRIN, which stores one summary per block range
+# instead of one entry per row.
+POSTGRES_INDEXES: dict[str, str] = {
+    name: sql
+    for name, sql in BTREE_INDEXES.items()
+    if name not in ("idx_loans_status_due_date", "idx_loans_member_date")
+} | {
+    # Complex Query 2 – only loans still out, carrying what the report counts
+    "idx_loans_open_due_covering": "CREATE INDEX IF NOT EXISTS "
+    "idx_loans_open_due_covering ON loans (due_date) "
+    "INCLUDE (member_id, loan_id, status) WHERE return_date IS NULL",
+    # Index Query - every column a history page selects
+    "idx_loans_member_date_covering": "CREATE INDEX IF NOT EXISTS "
+    "idx_loans_member_date_covering "
+    "ON loans (member_id, loan_date DESC, loan_id DESC) "
+    "INCLUDE (copy_id, due_date, status)",
+    # Book search - full-text matching on titles and author names
+    "idx_books_title_fts": "CREATE INDEX IF NOT EXISTS idx_books_title_fts "
+    "ON books USING gin (to_tsvector('english', title))",
+    "idx_authors_name_fts": "CREATE INDEX IF NOT EXISTS idx_authors_name_fts "
+    "ON authors USING gin (to_tsvector('simple', name))",
+    # Time-range scans over loans and fines
+    "idx_loans_loan_date_brin": "CREATE INDEX IF NOT EXISTS "
+    "idx_loans_loan_date_brin ON loans USING brin (loan_date)",
+    "idx_fines_assessed_at_brin": "CREATE INDEX IF NOT EXISTS "
+    "idx_fines_assessed_at_brin ON fines USING brin (assessed_at)",
+}
+
+# Book search - fuzzy matching, created only where pg_trgm can be installed
+TRIGRAM_INDEXES: dict[str, str] = {
+    "idx_books_title_trgm": "CREATE INDEX IF NOT EXISTS idx_books_title_trgm "
+    "ON books USING gin (title gin_trgm_ops)",
+    "idx_authors_name_trgm": "CREATE INDEX IF NOT EXISTS idx_authors_name_trgm "
+    "ON authors USING gin (name gin_trgm_ops)",
+}
+
+# What --compare-indexes measures the PostgreSQL indexes against: the B-tree
+# set, with plain B-trees on the time columns in place of the BRIN indexes.
+BASELINE_INDEXES: dict[str, str] = BTREE_INDEXES | {
+    "idx_loans_loan_date": "CREATE INDEX IF NOT EXISTS idx_loans_loan_date "
+    "ON loans (loan_date)",
+    "idx_fines_assessed_at": "CREATE INDEX IF NOT EXISTS idx_fines_assessed_at "
+    "ON fines (assessed_at)",
+}
+
+INDEX_STATEMENTS: list[str] = list(BTREE_INDEXES.values())
+
+INDEX_NAMES: list[str] = list(
+    dict.fromkeys(
+        [*BTREE_INDEXES, *POSTGRES_INDEXES, *TRIGRAM_INDEXES, *BASELINE_INDEXES]
+    )
+)
 
 logger = logging.getLogger(__name__)
 
 
+def index_statements(dialect: str) -> list[str]:
+    """The index statements to create for a database dialect"""
+    if dialect == "postgresql":
+        return list(POSTGRES_INDEXES.values())
+    return INDEX_STATEMENTS
+
+
+async def _create_trigram_indexes(conn: AsyncConnection) -> None:
+    try:
+        async with conn.begin_nested():
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        logger.warning(f"Skipping trigram indexes, pg_trgm is unavailable: {e.orig}")
+        return
+
+    for sql in TRIGRAM_INDEXES.values():
+        logger.info("Running: %s", sql)
+        await conn.execute(text(sql))
+
+
 # Create indexes
 async def create_indexes(database_url: str) -> None:
     """Create indexes that optimize the complex queries"""
@@ -46,9 +126,11 @@ async def create_indexes(database_url: str) -> None:
 
     try:
         async with engine.begin() as conn:
-            for sql in INDEX_STATEMENTS:
+            for sql in index_statements(engine.dialect.name):
                 logger.info("Running: %s", sql)
                 await conn.execute(text(sql))
+            if engine.dialect.name == "postgresql":
+                await _create_trigram_indexes(conn)
     finally:
         await engine.dispose()
     logger.info("Index creation complete.")
@@ -67,3 +149,138 @@ async def drop_indexes(database_url: str) -> None:
             await conn.execute(stmt)
 
     logger.info("Index drop complete.")
+
+
+def comparison_queries(member_id: int, now: datetime) -> dict[str, Select[Any]]:
+    """The report queries timed by --compare-indexes"""
+    week_ago = now - timedelta(days=7)
+    return {
+        "top-books": queries.top_books(10),
+        "overdue-members": queries.overdue_members(now),
+        "member-history": queries.member_history(member_id, limit=50),
+        "loans-last-week": queries.loans_between(week_ago, now),
+        "fines-last-week": queries.fines_assessed_between(week_ago, now),
+    }
+
+
+async def _install_index_set(engine: AsyncEngine, indexes: dict[str, str]) -> None:
+    """Replace the installed indexes with `indexes`, keeping trigram indexes,
+    which none of the compared queries use"""
+    async with engine.begin() as conn:
+        for name in INDEX_NAMES:
+            if name not in TRIGRAM_INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for sql in indexes.values():
+            await conn.execute(text(sql))
+
+    # Index-only scans need an up-to-date visibility map, which VACUUM can
+    # only build outside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE loans, fines, copies, members"))
+
+
+async def index_sizes(conn: AsyncConnection, names: list[str]) -> dict[str, int]:
+    """On-disk size of each index, summed over partitions of partitioned ones"""
+    result = await conn.execute(
+        text(
+            """
+            SELECT i.relname, CASE WHEN i.relkind = 'I' THEN (
+                SELECT coalesce(sum(pg_relation_size(relid)), 0)
+                FROM pg_partition_tree(i.oid)
+                WHERE isleaf
+            ) ELSE pg_relation_size(i.oid) END
+            FROM pg_class i
+            WHERE i.relname = ANY(:names)
+            """
+        ),
+        {"names": names},
+    )
+    sizes = {name: int(size) for name, size in result.all()}
+    return {name: sizes[name] for name in names if name in sizes}
+
+
+async def _time_queries(
+    engine: AsyncEngine, stmts: Mapping[str, Executable], repeats: int
+) -> dict[str, float]:
+    """Median wall time in milliseconds of each query, after one warm-up run"""
+    timings: dict[str, float] = {}
+    async with engine.connect() as conn:
+        for name, stmt in stmts.items():
+            await conn.execute(stmt)
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                (await conn.execute(stmt)).all()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(samples)
+    return timings
+
+
+async def compare_indexes(
+    database_url: str, *, member_id: int = 1, repeats: int = 5
+) -> None:
+    """Compare index size and query time of the B-tree and PostgreSQL index sets
+
+    Leaves the PostgreSQL set installed, as --create-indexes would, and any
+    trigram indexes as they were.
+    """
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+
+    try:
+        if engine.dialect.name != "postgresql":
+            logger.error("Index comparison requires PostgreSQL.")
+            return
+
+        stmts = comparison_queries(member_id, datetime.now(tz=None))
+        sets = {"B-tree": BASELINE_INDEXES, "Covering+BRIN": POSTGRES_INDEXES}
+        sizes: dict[str, dict[str, int]] = {}
+        timings: dict[str, dict[str, float]] = {}
+
+        for label, indexes in sets.items():
+            logger.info(f"Installing the {label} index set...")
+            await _install_index_set(engine, indexes)
+            async with engine.connect() as conn:
+                sizes[label] = await index_sizes(conn, list(indexes))
+            timings[label] = await _time_queries(engine, stmts, repeats)
+    finally:
+        await engine.dispose()
+
+    logger.info(format_comparison(sizes, timings, repeats))
+
+
+def format_comparison(
+    sizes: Mapping[str, Mapping[str, int]],
+    timings: Mapping[str, Mapping[str, float]],
+    repeats: int,
+) -> str:
+    """Tables of index sizes per set and query times of the first set against
+    the second"""
+    old, new = timings
+    lines = [
+        "\nIndex sizes:\n",
+        f"{'Set':<15} {'Index':<32} {'Size (KiB)':>12}",
+        "-" * 61,
+    ]
+    for label in sizes:
+        lines.extend(
+            f"{label:<15} {name:<32} {size / 1024:>12.1f}"
+            for name, size in sizes[label].items()
+        )
+        lines.append(
+            f"{label:<15} {'total':<32} {sum(sizes[label].values()) / 1024:>12.1f}"
+        )
+
+    lines.extend(
+        [
+            f"\nMedian query time over {repeats} runs (ms):\n",
+            f"{'Query':<18} {old:>12} {new:>14} {'Speedup':>9}",
+            "-" * 56,
+        ]
+    )
+    for name, before in timings[old].items():
+        after = timings[new][name]
+        # A query too fast for the clock counts as taking a microsecond
+        speedup = before / max(after, 1e-3)
+        lines.append(f"{name:<18} {before:>12.2f} {after:>14.2f} {speedup:>8.2f}x")
+    return "\n".join(lines)
@@ -1,13 +1,53 @@
 import asyncio
+import atexit
 import logging
 import sys
 from collections.abc import Sequence
 
+from sqlalchemy import make_url
+
+from .advisor import index_report
+from .benchmarks import (
+    compare_results,
+    format_record_costs,
+    load_results,
+    measure_records,
+    run_benchmarks,
+    run_load,
+    save_results,
+)
+from .benchmarks.load import DEFAULT_MIX, parse_mix
+from .cache import ReportCache
 from .clap import parse_args
 from .client import Client
 from .explain import run_explain
-from .index import create_indexes, drop_indexes
+from .index import compare_indexes, create_indexes, drop_indexes
+from .memory import MemoryTracer
+from .metrics import (
+    MetricsRegistry,
+    serve_metrics,
+    write_textfile,
+    write_textfile_every,
+)
+from .pagination import Page
+from .partition import manage_loan_partitions, partition_loans
+from .pool import PoolMonitor
 from .population import populate_db
+from .profiling import CallProfiler, SqlProfiler, profile_to
+from .records import LoanHistory
+from .reports import (
+    WRITERS,
+    AnalyticsSource,
+    Report,
+    copies_on_loan_report,
+    genre_fine_stats_report,
+    member_history_report,
+    overdue_members_report,
+    run_reports,
+    search_report,
+    top_books_report,
+    unpaid_fines_members_report,
+)
 
 
 async def main(argv: Sequence[str] | None = None) -> None:
@@ -21,11 +61,82 @@ async def main(argv: Sequence[str] | None = None) -> None:
     logger = logging.getLogger(__name__)
     logger.info(f"Utilizing log level '{cli_args.log_level}'")
 
-    client = Client(cli_args.database_url)
+    profiler = None
+    if cli_args.profile_sql:
+        profiler = sql_profiler = SqlProfiler(slow_ms=cli_args.slow_query_ms)
+        atexit.register(lambda: logger.info(sql_profiler.summary()))
+
+    call_profiler = None
+    if cli_args.profile_out is not None:
+        profile_out = cli_args.profile_out
+        stop_profiling = profile_to(profile_out)
+        call_profiler = calls = CallProfiler()
+
+        def write_profile() -> None:
+            stop_profiling()
+            logger.info(calls.summary())
+            logger.info(f"Wrote profile to {profile_out}")
+
+        atexit.register(write_profile)
+
+    tracer = None
+    if cli_args.trace_memory:
+        tracer = memory_tracer = MemoryTracer()
+        memory_tracer.start()
+
+        def report_memory() -> None:
+            logger.info(memory_tracer.summary())
+            memory_tracer.stop()
+
+        atexit.register(report_memory)
+
+    pool_monitor = None
+    if cli_args.pool_stats:
+        pool_monitor = monitor = PoolMonitor()
+        atexit.register(lambda: logger.info(monitor.summary()))
+
+    cache = None
+    if cli_args.report_cache is not None:
+        cache = report_cache = ReportCache(max_entries=cli_args.report_cache)
+
+        def report_cache_stats() -> None:
+            stats = report_cache.stats()
+            logger.info(
+                f"Report cache: {stats.hits} hits, {stats.misses} misses "
+                f"({stats.hit_rate:.1%}), {stats.evictions} evictions, "
+                f"{stats.invalidations} invalidations"
+            )
+
+        atexit.register(report_cache_stats)
+
+    metrics = None
+    background: list[asyncio.Task[None]] = []
+    if cli_args.metrics_file is not None or cli_args.metrics_port is not None:
+        metrics = registry = MetricsRegistry()
+    if cli_args.metrics_file is not None:
+        metrics_file = cli_args.metrics_file
+        atexit.register(lambda: write_textfile(registry, metrics_file))
+        background.append(
+            asyncio.create_task(
+                write_textfile_every(registry, metrics_file, cli_args.metrics_interval)
+            )
+        )
+    if cli_args.metrics_port is not None:
+        server = await serve_metrics(registry, cli_args.metrics_port)
+        background.append(asyncio.create_task(server.serve_forever()))
+
+    client = Client(
+        cli_args.database_url,
+        cache=cache,
+        profiler=profiler,
+        metrics=metrics,
+        pool_monitor=pool_monitor,
+        call_profiler=call_profiler,
+    )
 
     if cli_args.populate_db:
         logging.getLogger(__name__).info("Populating database...")
-        await populate_db(client)
+        await populate_db(client, tracer=tracer)
         logging.getLogger(__name__).info("Database population complete.")
 
     if cli_args.request_loan is not None:
@@ -60,110 +171,218 @@ async def main(argv: Sequence[str] | None = None) -> None:
             logger.error(f"Failed to pay fine ID '{fine_id}'.")
             sys.exit(1)
 
-    # Top N most-loaned books
+    if cli_args.place_hold is not None:
+        book_id, member_id = cli_args.place_hold
+        logger.info(
+            f"Placing hold on book ID '{book_id}' for member ID '{member_id}'..."
+        )
+        hold = await client.place_hold(book_id=book_id, member_id=member_id)
+        if hold is not None:
+            logger.info(f"Hold placed successfully with hold ID '{hold.hold_id}'.")
+        else:
+            logger.error("Hold request failed.")
+            sys.exit(1)
+
+    if cli_args.cancel_hold is not None:
+        hold_id = cli_args.cancel_hold
+        logger.info(f"Cancelling hold ID '{hold_id}'...")
+        success = await client.cancel_hold(hold_id=hold_id)
+        if success:
+            logger.info(f"Hold ID '{hold_id}' cancelled successfully.")
+        else:
+            logger.error(f"Failed to cancel hold ID '{hold_id}'.")
+            sys.exit(1)
+
+    if cli_args.sweep_overdue:
+        logger.info("Sweeping overdue loans...")
+        sweep = await client.sweep_overdue(
+            fine_per_day=cli_args.fine_per_day,
+            batch_size=cli_args.batch_size,
+        )
+        logger.info(
+            f"Marked {sweep.loans_marked} loans overdue, created "
+            f"{sweep.fines_created} fines and accrued {sweep.fines_accrued} in "
+            f"{sweep.batches} batches."
+        )
+
+    if cli_args.rebuild_balances:
+        logger.info("Rebuilding member balances...")
+        rebuilt = await client.rebuild_member_balances()
+        logger.info(f"Rebuilt balances for {rebuilt} members.")
+
+    if cli_args.check_balances:
+        logger.info("Checking member balances against unpaid fines...")
+        drift = await client.check_member_balances()
+        if drift:
+            header = [
+                f"\n{len(drift)} member balances disagree with their fines:\n",
+                f"{'ID':>5}  {'Stored Total':>12}  {'Count':>5}  {'Actual Total':>12}  {'Count':>5}",
+                "-" * 50,
+            ]
+            formatted_drift = [
+                f"{member_id:5}  "
+                f"{'missing' if stored_total is None else f'{stored_total:.2f}':>12}  "
+                f"{'-' if stored_count is None else stored_count:>5}  "
+                f"{actual_total:12.2f}  {actual_count:5}"
+                for member_id, stored_total, stored_count, actual_total, actual_count in drift
+            ]
+            logger.error("\n".join(header + formatted_drift))
+            sys.exit(1)
+        logger.info("All member balances match their unpaid fines.")
+
+    if cli_args.export_snapshot is not None:
+        # NumPy is optional, so only imported for snapshots
+        from .snapshot import export_snapshot
+
+        directory = cli_args.export_snapshot
+        logger.info(f"Exporting a snapshot to {directory}...")
+        rows = await export_snapshot(client, directory)
+        logger.info(
+            "Exported " + ", ".join(f"{n} {table}" for table, n in rows.items()) + "."
+        )
+
+    if cli_args.build_catalog is not None:
+        from .catalog import build_catalog, format_counts
+
+        logger.info(f"Building the catalog at {cli_args.build_catalog}...")
+        counts = await build_catalog(client, cli_args.build_catalog)
+        logger.info(f"Indexed {format_counts(counts)}.")
+
+    if cli_args.refresh_catalog is not None:
+        from .catalog import format_counts, refresh_catalog
+
+        logger.info(f"Refreshing the catalog at {cli_args.refresh_catalog}...")
+        counts = await refresh_catalog(client, cli_args.refresh_catalog)
+        logger.info(f"Added {format_counts(counts)}.")
+
+    analytics: AnalyticsSource = client
+    if cli_args.snapshot is not None:
+        from .snapshot import Snapshot, SnapshotReports
+
+        try:
+            analytics = SnapshotReports(Snapshot.load(cli_args.snapshot))
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+    # Independent read-only reports run concurrently, printed in this order
+    reports: list[Report] = []
+    if cli_args.search is not None:
+        reports.append(search_report(client, cli_args.search, cli_args.search_limit))
     if cli_args.top_books is not None:
-        limit = cli_args.top_books
-        logger.info(f"Fetching top {limit} most-loaned books...")
-        top_books = await client.get_top_books(limit=limit)
-
-        header = [
-            f"\nTop {limit} books by total loans:\n",
-            f"{'ID':>5}  {'Title':40}  {'Loans':>5}",
-            "-" * 60,
-        ]
-        formatted_books = [
-            f"{book_id:5}  {title[:40]:40}  {total_loans:5}"
-            for book_id, title, total_loans in top_books
-        ]
-
-        logger.info("\n".join(header + formatted_books))
-
-    # Members with currently overdue loans
+        reports.append(top_books_report(analytics, cli_args.top_books))
     if cli_args.overdue_members:
-        logger.info("Fetching members with currently overdue loans...")
-        overdue_members = await client.get_overdue_members()
-
-        header = [
-            "\nMembers with currently overdue loans:\n",
-            f"{'ID':>5}  {'Name':25}  {'Email':30}  {'Overdue':>7}  {'Earliest Due':>12}",
-            "-" * 90,
-        ]
-        formatted_members = [
-            f"{member_id:5}  {name[:25]:25}  {email[:30]:30}  "
-            f"{overdue_count:7}  {earliest_due.strftime('%Y-%m-%d'):>12}"
-            for member_id, name, email, overdue_count, earliest_due in overdue_members
-        ]
-
-        logger.info("\n".join(header + formatted_members))
-
-    # Members with highest unpaid fines (with optional minimum)
+        reports.append(
+            overdue_members_report(
+                client, stream=cli_args.stream, batch_size=cli_args.batch_size
+            )
+        )
     if cli_args.unpaid_fines_members is not None:
-        min_total = cli_args.unpaid_fines_members
-        logger.info(f"Fetching members with unpaid fines >= {min_total:.2f}...")
-        members_with_unpaid_fines = await client.get_unpaid_fines_members(
-            min_total=min_total
+        reports.append(
+            unpaid_fines_members_report(
+                client,
+                cli_args.unpaid_fines_members,
+                stream=cli_args.stream,
+                batch_size=cli_args.batch_size,
+            )
         )
-
-        header = [
-            f"\nMembers with unpaid fines >= {min_total:.2f}:\n",
-            f"{'ID':>5}  {'Name':25}  {'Email':30}  {'Total Unpaid':>12}  {'Count':>5}",
-            "-" * 95,
-        ]
-        formatted_members = [
-            f"{member_id:5}  {name[:25]:25}  {email[:30]:30}  "
-            f"{total_unpaid:12.2f}  {fine_count:5}"
-            for member_id, name, email, total_unpaid, fine_count in members_with_unpaid_fines
-        ]
-        logger.info("\n".join(header + formatted_members))
-
-    # Copies on loan per book
     if cli_args.copies_on_loans is not None:
-        limit = cli_args.copies_on_loans
-        logger.info(f"Fetching top {limit} books by utilization...")
-        collection_utilization = await client.get_copies_on_loan(limit=limit)
-
-        header = [
-            f"\nTop {limit} books by copy utilization:\n",
-            f"{'ID':>5}  {'Title':40}  {'Copies':>6}  {'On Loan':>7}  {'Util %':>7}",
-            "-" * 80,
-        ]
-        formatted_copies = [
-            f"{book_id:5}  {title[:40]:40}  {total_copies:6}  "
-            f"{copies_on_loan:7}  {util if util is not None else 0.0:7.2f}"
-            for book_id, title, total_copies, copies_on_loan, util in collection_utilization
-        ]
-        logger.info("\n".join(header + formatted_copies))
-
-    # Fine statistics by genre
+        reports.append(copies_on_loan_report(analytics, cli_args.copies_on_loans))
     if cli_args.genre_fine_stats:
-        logger.info("Fetching fine statistics grouped by genre...")
-        fine_statistics = await client.get_genre_fine_statistics()
-        header = [
-            "\nFine statistics by genre:\n",
-            f"{'Genre':20}  {'Fine Count':>10}  {'Total Fines':>12}",
-            "-" * 50,
-        ]
-        formatted_stats = [
-            f"{genre or 'UNKNOWN':20}  {fine_count:10}  {total_fines:12.2f}"
-            for genre, fine_count, total_fines in fine_statistics
-        ]
-        logger.info("\n".join(header + formatted_stats))
+        reports.append(genre_fine_stats_report(analytics))
 
     # How many loans a specific member has, ordered by date
+    history: Page[LoanHistory] | None = None
     if cli_args.member_history:
         member_id = cli_args.member_history
-        rows = await client.get_member_history(member_id)
-
-        lines = [
-            f"\nLoan history for Member {member_id}:\n",
-            "LoanID  CopyID  LoanDate        DueDate         Status",
-            "-------------------------------------------------------------",
-            "\n".join(
-                f"{r.loan_id:<7} {r.copy_id:<7} {r.loan_date}  {r.due_date}  {r.status}"
-                for r in rows
-            ),
-        ]
-        logger.info("\n".join(lines))
+        try:
+            history = await client.get_member_history_page(
+                member_id,
+                limit=cli_args.history_limit,
+                cursor=cli_args.history_cursor,
+            )
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+        titles: dict[int, str] | None = None
+        if cli_args.catalog is not None:
+            from .catalog import Catalog
+
+            try:
+                catalog = Catalog(cli_args.catalog)
+            except (FileNotFoundError, ValueError) as e:
+                logger.error(str(e))
+                sys.exit(1)
+            titles = {
+                r.copy_id: catalog.copy_title(r.copy_id) or "?" for r in history.rows
+            }
+        reports.append(member_history_report(member_id, history, titles))
+
+    if reports:
+        await run_reports(
+            reports,
+            writer=WRITERS[cli_args.output_format](),
+            max_concurrency=cli_args.max_concurrency,
+            tracer=tracer,
+        )
+
+    if history is not None:
+        if history.next_cursor is not None:
+            logger.info(f"Next page: --history-cursor {history.next_cursor}")
+        return
+
+    if cli_args.benchmark:
+        results = await run_benchmarks(
+            cli_args.database_url,
+            scales=cli_args.scales,
+            iterations=cli_args.iterations,
+            warmup=cli_args.warmup,
+            profiler=profiler,
+            metrics=metrics,
+            pool_monitor=pool_monitor,
+            call_profiler=call_profiler,
+        )
+        if cli_args.benchmark_out is not None:
+            save_results(
+                cli_args.benchmark_out,
+                results,
+                database=make_url(cli_args.database_url).get_backend_name(),
+            )
+        if cli_args.benchmark_baseline is not None:
+            regressions = compare_results(
+                load_results(cli_args.benchmark_baseline),
+                results,
+                threshold=cli_args.regression_threshold,
+            )
+            if regressions:
+                sys.exit(1)
+        return
+
+    if cli_args.benchmark_records:
+        costs = await measure_records(cli_args.database_url, repeats=cli_args.repeats)
+        logger.info(format_record_costs(costs))
+        return
+
+    if cli_args.load:
+        try:
+            mix = parse_mix(cli_args.mix) if cli_args.mix is not None else DEFAULT_MIX
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+        await run_load(
+            cli_args.database_url,
+            mix=mix,
+            workers=cli_args.workers,
+            processes=cli_args.processes,
+            duration=cli_args.duration if cli_args.operations is None else None,
+            operations=cli_args.operations,
+            cache=cache,
+            metrics=metrics,
+            pool_monitor=pool_monitor,
+            call_profiler=call_profiler,
+        )
         return
 
     if cli_args.create_indexes:
@@ -174,17 +393,48 @@ async def main(argv: Sequence[str] | None = None) -> None:
         await drop_indexes(cli_args.database_url)
         return
 
+    if cli_args.index_report:
+        await index_report(
+            cli_args.database_url,
+            repeats=cli_args.repeats,
+            writes_per_run=cli_args.writes_per_run,
+        )
+        return
+
+    if cli_args.compare_indexes:
+        await compare_indexes(cli_args.database_url, repeats=cli_args.repeats)
+        return
+
+    if cli_args.partition_loans:
+        await partition_loans(cli_args.database_url, months_ahead=cli_args.months_ahead)
+        return
+
+    if cli_args.manage_partitions:
+        await manage_loan_partitions(
+            cli_args.database_url,
+            months_ahead=cli_args.months_ahead,
+            archive_before=cli_args.archive_before,
+        )
+        return
+
+    explain_params: dict[str, object] = {}
+    if cli_args.explain_limit is not None:
+        explain_params["limit"] = cli_args.explain_limit
+    if cli_args.explain_min_total is not None:
+        explain_params["min_total"] = cli_args.explain_min_total
+
     if cli_args.explain_member_history is not None:
         member_id = cli_args.explain_member_history
         await run_explain(
             cli_args.database_url,
             "member-history",
             member_id=member_id,
+            **explain_params,
         )
         return
 
     if cli_args.explain:
-        await run_explain(cli_args.database_url, cli_args.explain)
+        await run_explain(cli_args.database_url, cli_args.explain, **explain_params)
         return
 
 
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by the tracing machinery itself rather than the code traced
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def peak_rss() -> int | None:
+    """The process's peak resident set size in bytes, where the OS reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _mib(size: float) -> str:
+    return f"{size / 2**20:.2f} MiB"
+
+
+@dataclass(slots=True)
+class PhaseMemory:
+    name: str
+    rows: int | None
+    # Traced memory still held at the end of the phase, over its start
+    retained: int
+    # Highest traced memory during the phase, over its start
+    peak: int
+    peak_rss: int | None
+    top: list[tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def bytes_per_row(self) -> float | None:
+        return self.peak / self.rows if self.rows else None
+
+
+class MemoryTracer:
+    """Traced allocations between phase boundaries.
+
+    Each call to `phase` closes the phase running since the last one,
+    recording how much it allocated at its peak and kept, the sites whose
+    retained memory grew most, and the process's peak RSS so far.
+    """
+
+    def __init__(self, *, top: int = 5, frames: int = 1) -> None:
+        self.__top = top
+        self.__frames = frames
+        self.__phases: list[PhaseMemory] = []
+        self.__baseline = 0
+        self.__snapshot: tracemalloc.Snapshot | None = None
+
+    @property
+    def phases(self) -> list[PhaseMemory]:
+        return self.__phases
+
+    def start(self) -> None:
+        tracemalloc.start(self.__frames)
+        self.__snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        tracemalloc.reset_peak()
+        self.__baseline = tracemalloc.get_traced_memory()[0]
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    def phase(self, name: str, rows: int | None = None) -> PhaseMemory:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        top = []
+        if self.__snapshot is not None:
+            growth = [
+                diff
+                for diff in snapshot.compare_to(self.__snapshot, "lineno")
+                if diff.size_diff > 0
+            ]
+            top = [
+                (str(diff.traceback[0]), diff.size_diff)
+                for diff in growth[: self.__top]
+            ]
+
+        memory = PhaseMemory(
+            name=name,
+            rows=rows,
+            retained=current - self.__baseline,
+            peak=peak - self.__baseline,
+            peak_rss=peak_rss(),
+            top=top,
+        )
+        self.__phases.append(memory)
+
+        # Measure from the end of this phase rather than the snapshot, which
+        # allocates plenty of its own
+        tracemalloc.reset_peak()
+        self.__baseline = tracemalloc.get_traced_memory()[0]
+        self.__snapshot = snapshot
+
+        lines = [
+            f"Memory after {name}: peak +{_mib(memory.peak)}, "
+            f"retained {memory.retained / 2**20:+.2f} MiB"
+            + (
+                f", {memory.bytes_per_row:.0f} B/row over {rows} rows"
+                if memory.bytes_per_row is not None
+                else ""
+            )
+            + (
+                f", peak RSS {_mib(memory.peak_rss)}"
+                if memory.peak_rss is not None
+                else ""
+            )
+        ]
+        lines.extend(f"    {size / 1024:+9.1f} KiB  {site}" for site, size in top)
+        logger.info("\n".join(lines))
+        return memory
+
+    def summary(self) -> str:
+        lines = [
+            "\nMemory by phase:\n",
+            f"{'Phase':<32} {'Rows':>8} {'Peak MiB':>9} {'Kept MiB':>9} "
+            f"{'B/row':>8} {'RSS MiB':>8}",
+            "-" * 79,
+        ]
+        lines.extend(
+            f"{p.name:<32} {'-' if p.rows is None else p.rows:>8} "
+            f"{p.peak / 2**20:>9.2f} {p.retained / 2**20:>+9.2f} "
+            f"{'-' if p.bytes_per_row is None else f'{p.bytes_per_row:.0f}':>8} "
+            f"{'-' if p.peak_rss is None else f'{p.peak_rss / 2**20:.1f}':>8}"
+            for p in self.__phases
+        )
+        return "\n".join(lines)
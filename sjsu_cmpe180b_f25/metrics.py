@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import QueuePool
+
+from .cache import ReportCache
+from .pool import time_checkouts
+from .profiling import INSTRUMENTED
+
+# Upper bounds, in seconds, of the latency histogram buckets
+CALL_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+WAIT_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+
+class Histogram:
+    """Observation counts per bucket, allocated once up front.
+
+    Counts are kept per bucket and only made cumulative when rendered, so an
+    observation is one bisect and two additions.
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        sep = "," if labels else ""
+        lines = []
+        total = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts, strict=True):
+            total += count
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {total}')
+        braces = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{braces} {self.sum}")
+        lines.append(f"{name}_count{braces} {total}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Client call, pool and cache metrics in Prometheus exposition format.
+
+    Everything is updated from the event loop's thread, so nothing on the
+    hot path takes a lock. Pool and cache figures are read when rendered
+    rather than tracked as they change. Every method in `methods`, by
+    default each `instrumented` one, is exported from the start, so methods
+    that haven't been called yet show up as zeros rather than missing series.
+    """
+
+    def __init__(self, methods: Iterable[str] = INSTRUMENTED) -> None:
+        self.__calls: dict[str, int] = dict.fromkeys(methods, 0)
+        self.__errors: dict[tuple[str, str], int] = {}
+        self.__durations: dict[str, Histogram] = {
+            method: Histogram(CALL_BUCKETS) for method in self.__calls
+        }
+        self.__checkout_wait = Histogram(WAIT_BUCKETS)
+        self.__engines: list[Engine] = []
+        self.__caches: list[ReportCache] = []
+
+    def observe_call(
+        self, method: str, seconds: float, error: BaseException | None = None
+    ) -> None:
+        self.__calls[method] = self.__calls.get(method, 0) + 1
+        histogram = self.__durations.get(method)
+        if histogram is None:
+            histogram = self.__durations[method] = Histogram(CALL_BUCKETS)
+        histogram.observe(seconds)
+        if error is not None:
+            key = (method, type(error).__name__)
+            self.__errors[key] = self.__errors.get(key, 0) + 1
+
+    def register_engine(self, engine: Engine) -> None:
+        """Report the size of an engine's pool and time every checkout from it"""
+        self.__engines.append(engine)
+        time_checkouts(engine, self.__checkout_wait.observe)
+
+    def register_cache(self, cache: ReportCache) -> None:
+        # Clients sharing a cache, like the CLI's and --load's, count it once
+        if all(c is not cache for c in self.__caches):
+            self.__caches.append(cache)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP library_client_calls_total Client method calls.",
+            "# TYPE library_client_calls_total counter",
+        ]
+        lines.extend(
+            f'library_client_calls_total{{method="{method}"}} {count}'
+            for method, count in sorted(self.__calls.items())
+        )
+
+        lines.extend(
+            [
+                "# HELP library_client_errors_total Client method calls that "
+                "raised, by exception type.",
+                "# TYPE library_client_errors_total counter",
+            ]
+        )
+        lines.extend(
+            f'library_client_errors_total{{method="{method}",'
+            f'error="{_escape(error)}"}} {count}'
+            for (method, error), count in sorted(self.__errors.items())
+        )
+
+        lines.extend(
+            [
+                "# HELP library_client_call_duration_seconds Client method latency.",
+                "# TYPE library_client_call_duration_seconds histogram",
+            ]
+        )
+        for method, histogram in sorted(self.__durations.items()):
+            lines.extend(
+                histogram.render(
+                    "library_client_call_duration_seconds", f'method="{method}"'
+                )
+            )
+
+        lines.extend(
+            [
+                "# HELP library_pool_checkout_wait_seconds Time to get a connection "
+                "from the pool, including opening one.",
+                "# TYPE library_pool_checkout_wait_seconds histogram",
+            ]
+        )
+        lines.extend(
+            self.__checkout_wait.render("library_pool_checkout_wait_seconds", "")
+        )
+
+        pools = [e.pool for e in self.__engines]
+        queue_pools = [p for p in pools if isinstance(p, QueuePool)]
+        for name, help_text, value in (
+            (
+                "library_pool_size",
+                "Connections the pools keep open.",
+                sum(p.size() for p in queue_pools),
+            ),
+            (
+                "library_pool_checked_out",
+                "Connections checked out of the pools.",
+                sum(p.checkedout() for p in queue_pools),
+            ),
+            (
+                "library_pool_overflow",
+                "Connections open beyond the pool size.",
+                sum(max(p.overflow(), 0) for p in queue_pools),
+            ),
+        ):
+            lines.extend(
+                [
+                    f"# HELP {name} {help_text}",
+                    f"# TYPE {name} gauge",
+                    f"{name} {value}",
+                ]
+            )
+
+        stats = [cache.stats() for cache in self.__caches]
+        hits = sum(s.hits for s in stats)
+        misses = sum(s.misses for s in stats)
+        for name, help_text, value in (
+            ("library_cache_hits_total", "Report cache hits.", hits),
+            ("library_cache_misses_total", "Report cache misses.", misses),
+            (
+                "library_cache_evictions_total",
+                "Report cache evictions.",
+                sum(s.evictions for s in stats),
+            ),
+        ):
+            lines.extend(
+                [
+                    f"# HELP {name} {help_text}",
+                    f"# TYPE {name} counter",
+                    f"{name} {value}",
+                ]
+            )
+        lines.extend(
+            [
+                "# HELP library_cache_hit_ratio Report cache hits over lookups.",
+                "# TYPE library_cache_hit_ratio gauge",
+                f"library_cache_hit_ratio {hits / (hits + misses) if hits + misses else 0.0}",
+            ]
+        )
+
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(registry: MetricsRegistry, path: Path) -> None:
+    """Replace `path` atomically, so a collector never reads half a file"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(registry.render())
+    os.replace(tmp, path)
+
+
+async def write_textfile_every(
+    registry: MetricsRegistry, path: Path, interval: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        write_textfile(registry, path)
+
+
+async def serve_metrics(
+    registry: MetricsRegistry, port: int, host: str = "0.0.0.0"
+) -> asyncio.Server:
+    """Serve the registry on `GET /metrics` until the server is closed"""
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            method, target, *_ = request.split(b" ", 2)
+            if method == b"GET" and target.split(b"?")[0] == b"/metrics":
+                status = b"200 OK"
+                body = registry.render().encode()
+                content_type = b"text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, content_type = b"404 Not Found", b"", b"text/plain"
+            writer.write(
+                b"HTTP/1.1 "
+                + status
+                + b"\r\nContent-Type: "
+                + content_type
+                + b"\r\nContent-Length: "
+                + str(len(body)).encode()
+                + b"\r\nConnection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logging.getLogger(__name__).info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
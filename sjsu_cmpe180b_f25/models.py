@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -12,6 +12,7 @@ class Base(DeclarativeBase):
 class CopyStatus(str, Enum):
     AVAILABLE = "available"
     ON_LOAN = "on_loan"
+    ON_HOLD = "on_hold"
     LOST = "lost"
 
 
@@ -21,6 +22,13 @@ class LoanStatus(str, Enum):
     OVERDUE = "overdue"
 
 
+class HoldStatus(str, Enum):
+    WAITING = "waiting"
+    READY = "ready"
+    FULFILLED = "fulfilled"
+    CANCELLED = "cancelled"
+
+
 class Author(Base):
     __tablename__ = "authors"
     author_id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -52,6 +60,20 @@ class Member(Base):
     joined_at: Mapped[datetime] = mapped_column(nullable=False)
 
 
+class MemberBalance(Base):
+    """Running total of a member's unpaid fines, kept in step with `fines`."""
+
+    __tablename__ = "member_balances"
+    __table_args__ = (
+        Index("idx_member_balances_unpaid", "unpaid_total", "unpaid_count"),
+    )
+    member_id: Mapped[int] = mapped_column(
+        ForeignKey("members.member_id"), primary_key=True
+    )
+    unpaid_total: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    unpaid_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
 class Copy(Base):
     __tablename__ = "copies"
     copy_id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -61,14 +83,22 @@ class Copy(Base):
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        # A copy may be loaned any number of times, but only once at a time.
+        Index(
+            "uq_loans_active_copy",
+            "copy_id",
+            unique=True,
+            postgresql_where=text("return_date IS NULL"),
+            sqlite_where=text("return_date IS NULL"),
+        ),
+    )
     loan_id: Mapped[int] = mapped_column(
         primary_key=True,
         index=True,
         autoincrement=True,
     )
-    copy_id: Mapped[int] = mapped_column(
-        ForeignKey("copies.copy_id"), nullable=False, unique=True
-    )
+    copy_id: Mapped[int] = mapped_column(ForeignKey("copies.copy_id"), nullable=False)
     member_id: Mapped[int] = mapped_column(
         ForeignKey("members.member_id"), nullable=False
     )
@@ -91,3 +121,40 @@ class Fine(Base):
     assessed_at: Mapped[datetime] = mapped_column(nullable=False)
     paid: Mapped[bool] = mapped_column(nullable=False, default=False)
     paid_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+
+class Hold(Base):
+    """A member's place in the queue for the next returned copy of a book."""
+
+    __tablename__ = "holds"
+    __table_args__ = (
+        # The FIFO queue per book; only waiting holds are ever scanned.
+        Index(
+            "idx_holds_queue",
+            "book_id",
+            "placed_at",
+            "hold_id",
+            postgresql_where=text("status = 'WAITING'"),
+            sqlite_where=text("status = 'WAITING'"),
+        ),
+        # A member may only be in a book's queue once at a time.
+        Index(
+            "uq_holds_open_member",
+            "book_id",
+            "member_id",
+            unique=True,
+            postgresql_where=text("status IN ('WAITING', 'READY')"),
+            sqlite_where=text("status IN ('WAITING', 'READY')"),
+        ),
+    )
+    hold_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("books.book_id"), nullable=False)
+    member_id: Mapped[int] = mapped_column(
+        ForeignKey("members.member_id"), nullable=False
+    )
+    placed_at: Mapped[datetime] = mapped_column(nullable=False)
+    status: Mapped[HoldStatus] = mapped_column(nullable=False)
+    copy_id: Mapped[int | None] = mapped_column(
+        ForeignKey("copies.copy_id"), nullable=True
+    )
+    ready_at: Mapped[datetime | None] = mapped_column(nullable=True)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class Page[T]:
+    rows: Sequence[T]
+    next_cursor: str | None
+
+
+def encode_cursor(loan_date: datetime, loan_id: int) -> str:
+    """Encode a `(loan_date, loan_id)` keyset position as an opaque token."""
+    raw = f"{loan_date.isoformat()}|{loan_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a token produced by `encode_cursor`, raising ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+        loan_date, loan_id = raw.split("|")
+        return datetime.fromisoformat(loan_date), int(loan_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor '{cursor}'") from e
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from . import queries
+
+logger = logging.getLogger(__name__)
+
+# Statements that turn `loans` into a table range-partitioned by loan_date.
+#
+# Postgres requires every unique index on a partitioned table to include the
+# partition key, so the primary key becomes (loan_id, loan_date) and the
+# "one active loan per copy" index becomes (copy_id, loan_date), which no longer
+# enforces it. A foreign key can't reference loan_id alone either, so the one
+# from fines is dropped. Triggers in `INTEGRITY_STATEMENTS` take the place of
+# both.
+PARTITION_STATEMENTS: list[str] = [
+    "ALTER TABLE fines DROP CONSTRAINT IF EXISTS fines_loan_id_fkey",
+    "ALTER TABLE loans RENAME TO loans_unpartitioned",
+    "CREATE TABLE loans (LIKE loans_unpartitioned INCLUDING DEFAULTS) "
+    "PARTITION BY RANGE (loan_date)",
+    "ALTER TABLE loans ADD PRIMARY KEY (loan_id, loan_date)",
+    "ALTER TABLE loans ADD FOREIGN KEY (copy_id) REFERENCES copies (copy_id)",
+    "ALTER TABLE loans ADD FOREIGN KEY (member_id) REFERENCES members (member_id)",
+    "CREATE TABLE loans_default PARTITION OF loans DEFAULT",
+]
+
+FINALIZE_STATEMENTS: list[str] = [
+    "INSERT INTO loans SELECT * FROM loans_unpartitioned",
+    "ALTER SEQUENCE loans_loan_id_seq OWNED BY loans.loan_id",
+    "DROP TABLE loans_unpartitioned",
+    "CREATE INDEX ix_loans_loan_id ON loans (loan_id)",
+    "CREATE UNIQUE INDEX uq_loans_active_copy "
+    "ON loans (copy_id, loan_date) WHERE return_date IS NULL",
+]
+
+ARCHIVE_STATEMENTS: list[str] = [
+    "CREATE TABLE IF NOT EXISTS loans_archive (LIKE loans) "
+    "PARTITION BY RANGE (loan_date)",
+    "CREATE TABLE IF NOT EXISTS fines_archive (LIKE fines)",
+]
+
+# A loan still out locks its copy and checks for another open loan of it, so
+# concurrent inserts of the same copy serialize as a unique index would. A fine
+# must reference a loan in `loans` or, once its partition is archived,
+# `loans_archive`. Loans are never deleted, only detached into the archive,
+# so checking fines as they are written is enough.
+INTEGRITY_STATEMENTS: list[str] = [
+    """
+    CREATE OR REPLACE FUNCTION loans_one_open_per_copy() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.return_date IS NULL THEN
+            PERFORM 1 FROM copies WHERE copy_id = NEW.copy_id FOR UPDATE;
+            IF EXISTS (
+                SELECT 1 FROM loans
+                WHERE copy_id = NEW.copy_id
+                    AND return_date IS NULL
+                    AND loan_id <> NEW.loan_id
+            ) THEN
+                RAISE EXCEPTION 'copy % already has an open loan', NEW.copy_id
+                    USING ERRCODE = 'unique_violation';
+            END IF;
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE OR REPLACE TRIGGER loans_one_open_per_copy "
+    "BEFORE INSERT OR UPDATE OF copy_id, return_date ON loans "
+    "FOR EACH ROW EXECUTE FUNCTION loans_one_open_per_copy()",
+    """
+    CREATE OR REPLACE FUNCTION fines_loan_exists() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.loan_id IS NOT NULL
+            AND NOT EXISTS (SELECT 1 FROM loans WHERE loan_id = NEW.loan_id)
+            AND NOT EXISTS (SELECT 1 FROM loans_archive WHERE loan_id = NEW.loan_id)
+        THEN
+            RAISE EXCEPTION 'loan % does not exist', NEW.loan_id
+                USING ERRCODE = 'foreign_key_violation';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE OR REPLACE TRIGGER fines_loan_exists "
+    "BEFORE INSERT OR UPDATE OF loan_id ON fines "
+    "FOR EACH ROW EXECUTE FUNCTION fines_loan_exists()",
+]
+
+PARTITION_BOUNDS_QUERY = """
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = 'loans'
+    ORDER BY child.relname
+"""
+
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"loans_p{month.year:04d}_{month.month:02d}"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    result = await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE relname = 'loans'")
+    )
+    return result.scalar_one_or_none() == "p"
+
+
+async def open_loans_since(
+    conn: AsyncConnection, *, partitioned: bool | None = None
+) -> datetime | None:
+    """Loan date of the oldest loan still out, if `loans` is partitioned.
+
+    Overdue scans bounded by it skip older partitions; the partial index
+    over open loans makes finding it cheap. `partitioned` skips the catalog
+    lookup when the caller already knows.
+    """
+    if conn.dialect.name != "postgresql":
+        return None
+    if partitioned is None:
+        partitioned = await is_partitioned(conn)
+    if not partitioned:
+        return None
+    return (await conn.execute(queries.oldest_open_loan())).scalar_one()
+
+
+async def _create_month_partitions(
+    conn: AsyncConnection, first: date, last: date
+) -> int:
+    """Create a partition per month from `first` through `last`, if missing."""
+    created = 0
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        exists = await conn.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        )
+        if not exists.scalar_one():
+            sql = (
+                f"CREATE TABLE {name} PARTITION OF loans "
+                f"FOR VALUES FROM ('{month}') TO ('{next_month(month)}')"
+            )
+            logger.info("Running: %s", sql)
+            await conn.execute(text(sql))
+            created += 1
+        month = next_month(month)
+    return created
+
+
+async def partition_loans(database_url: str, *, months_ahead: int = 3) -> None:
+    """Convert `loans` into monthly range partitions on loan_date"""
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+
+    try:
+        if engine.dialect.name != "postgresql":
+            logger.error("Loan partitioning requires PostgreSQL.")
+            return
+
+        async with engine.begin() as conn:
+            if await is_partitioned(conn):
+                logger.info("The loans table is already partitioned.")
+                return
+
+            logger.info("Partitioning loans by loan_date...")
+            for sql in PARTITION_STATEMENTS:
+                logger.info("Running: %s", sql)
+                await conn.execute(text(sql))
+
+            oldest = await conn.execute(
+                text("SELECT min(loan_date) FROM loans_unpartitioned")
+            )
+            first_loan = oldest.scalar_one_or_none()
+            today = datetime.now(tz=None).date()
+            last = month_start(today)
+            for _ in range(months_ahead):
+                last = next_month(last)
+            created = await _create_month_partitions(
+                conn, first_loan.date() if first_loan else today, last
+            )
+
+            for sql in FINALIZE_STATEMENTS + ARCHIVE_STATEMENTS:
+                logger.info("Running: %s", sql)
+                await conn.execute(text(sql))
+            for sql in INTEGRITY_STATEMENTS:
+                await conn.execute(text(sql))
+    finally:
+        await engine.dispose()
+
+    logger.info(
+        f"Partitioned loans into {created} monthly partitions. "
+        "Re-run --create-indexes to rebuild the query indexes."
+    )
+
+
+async def manage_loan_partitions(
+    database_url: str,
+    *,
+    months_ahead: int = 3,
+    archive_before: date | None = None,
+) -> None:
+    """Create upcoming loan partitions and archive fully returned old ones.
+
+    A partition is archived only if its whole range ends on or before
+    `archive_before` and none of its loans are still out. It is detached from
+    `loans` and attached to `loans_archive`, and the paid fines for its loans
+    move to `fines_archive`, so overdue scans and member histories no longer
+    touch it. Unpaid fines stay in `fines` so member balances are unaffected.
+    """
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+
+    try:
+        if engine.dialect.name != "postgresql":
+            logger.error("Loan partitioning requires PostgreSQL.")
+            return
+
+        async with engine.begin() as conn:
+            if not await is_partitioned(conn):
+                logger.error(
+                    "The loans table is not partitioned; run --partition-loans."
+                )
+                return
+
+            today = datetime.now(tz=None).date()
+            last = month_start(today)
+            for _ in range(months_ahead):
+                last = next_month(last)
+            created = await _create_month_partitions(conn, today, last)
+            logger.info(f"Created {created} upcoming loan partitions.")
+
+        if archive_before is None:
+            return
+
+        async with engine.begin() as conn:
+            for sql in ARCHIVE_STATEMENTS:
+                await conn.execute(text(sql))
+            bounds = (await conn.execute(text(PARTITION_BOUNDS_QUERY))).all()
+
+        archived = 0
+        for name, bound in bounds:
+            match = BOUND_PATTERN.search(bound)
+            if match is None:
+                continue
+
+            lower, upper = match.groups()
+            if datetime.fromisoformat(upper).date() > archive_before:
+                continue
+
+            async with engine.begin() as conn:
+                open_loans = await conn.execute(
+                    text(
+                        f"SELECT EXISTS (SELECT 1 FROM {name} WHERE return_date IS NULL)"
+                    )
+                )
+                if open_loans.scalar_one():
+                    logger.warning(f"Skipping '{name}': it still has open loans.")
+                    continue
+
+                logger.info(f"Archiving partition '{name}'...")
+                moved = await conn.execute(
+                    text(
+                        "WITH moved AS ("
+                        f" DELETE FROM fines USING {name}"
+                        f" WHERE fines.loan_id = {name}.loan_id AND fines.paid"
+                        " RETURNING fines.*"
+                        ") INSERT INTO fines_archive SELECT * FROM moved"
+                    )
+                )
+                await conn.execute(text(f"ALTER TABLE loans DETACH PARTITION {name}"))
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE loans_archive ATTACH PARTITION {name} "
+                        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                    )
+                )
+                logger.info(f"Archived '{name}' and {moved.rowcount} paid fines.")
+                archived += 1
+    finally:
+        await engine.dispose()
+
+    logger.info(f"Archived {archived} loan partitions.")
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import statistics
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import (
+    ConnectionPoolEntry,
+    Pool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+
+def time_checkouts(engine: Engine, observe: Callable[[float], None]) -> None:
+    """Call `observe` with the seconds each checkout from `engine`'s pool takes.
+
+    That covers waiting for a free connection, opening a new one, and any
+    pre-ping. The engine checks connections out through `pool.connect()`,
+    which no pool event precedes, so that is wrapped, and wrapped again on
+    the new pool each `engine.dispose()` puts in place.
+    """
+
+    def wrap(pool: Pool) -> None:
+        connect = pool.connect
+
+        def timed_connect() -> PoolProxiedConnection:
+            start = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                observe(time.perf_counter() - start)
+
+        pool.connect = timed_connect  # type: ignore[method-assign]
+
+    def rewrap(engine: Engine) -> None:
+        wrap(engine.pool)
+
+    wrap(engine.pool)
+    event.listen(engine, "engine_disposed", rewrap)
+
+
+@dataclass(slots=True)
+class PoolStats:
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: Counter[str] = field(default_factory=Counter)
+    soft_invalidations: int = 0
+    pings: int = 0
+    ping_failures: int = 0
+    peak_checked_out: int = 0
+    capacity: int | None = None
+    wait_ms: list[float] = field(default_factory=list)
+    ping_ms: list[float] = field(default_factory=list)
+    hold_ms: list[float] = field(default_factory=list)
+    age_s: list[float] = field(default_factory=list)
+
+
+def _describe(samples: Sequence[float], unit: str) -> str:
+    if not samples:
+        return "-"
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = samples[0]
+    return (
+        f"mean {statistics.fmean(samples):.2f}{unit}, p50 {p50:.2f}{unit}, "
+        f"p95 {p95:.2f}{unit}, max {max(samples):.2f}{unit}"
+    )
+
+
+class PoolMonitor:
+    """Connection pool events and timings for an engine.
+
+    Counts connects, checkouts, checkins and invalidations from the pool
+    events, and times checkouts, pre-pings and how long connections are held.
+    """
+
+    def __init__(self) -> None:
+        self.__stats = PoolStats()
+        # Engines rather than their pools, which `engine.dispose()` replaces
+        self.__engines: list[Engine] = []
+
+    @property
+    def stats(self) -> PoolStats:
+        return self.__stats
+
+    def attach(self, engine: Engine) -> None:
+        pool = engine.pool
+        self.__engines.append(engine)
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            self.__stats.capacity = (self.__stats.capacity or 0) + capacity
+
+        event.listen(pool, "connect", self.__connect)
+        event.listen(pool, "checkout", self.__checkout)
+        event.listen(pool, "checkin", self.__checkin)
+        event.listen(pool, "invalidate", self.__invalidate)
+        event.listen(pool, "soft_invalidate", self.__soft_invalidate)
+        event.listen(engine, "handle_error", self.__handle_error)
+        time_checkouts(engine, self.__observe_wait)
+
+        do_ping = engine.dialect.do_ping
+
+        def timed_ping(dbapi_connection: DBAPIConnection) -> bool:
+            start = time.perf_counter()
+            try:
+                return do_ping(dbapi_connection)
+            finally:
+                self.__stats.pings += 1
+                self.__stats.ping_ms.append((time.perf_counter() - start) * 1000)
+
+        # Pre-ping goes through the dialect, with no event of its own to time
+        engine.dialect.do_ping = timed_ping  # type: ignore[method-assign]
+
+    def __observe_wait(self, seconds: float) -> None:
+        self.__stats.wait_ms.append(seconds * 1000)
+
+    def __connect(
+        self, dbapi_connection: DBAPIConnection, record: ConnectionPoolEntry
+    ) -> None:
+        self.__stats.connects += 1
+        record.info["connected_at"] = time.monotonic()
+
+    def __checkout(
+        self,
+        dbapi_connection: DBAPIConnection,
+        record: ConnectionPoolEntry,
+        proxy: PoolProxiedConnection,
+    ) -> None:
+        now = time.monotonic()
+        stats = self.__stats
+        stats.checkouts += 1
+        stats.age_s.append(now - record.info.get("connected_at", now))
+        record.info["checked_out_at"] = now
+
+        checked_out = sum(
+            p.checkedout()
+            for p in (e.pool for e in self.__engines)
+            if isinstance(p, QueuePool)
+        )
+        stats.peak_checked_out = max(stats.peak_checked_out, checked_out)
+
+    def __checkin(
+        self, dbapi_connection: DBAPIConnection | None, record: ConnectionPoolEntry
+    ) -> None:
+        self.__stats.checkins += 1
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.__stats.hold_ms.append((time.monotonic() - checked_out_at) * 1000)
+
+    def __invalidate(
+        self,
+        dbapi_connection: DBAPIConnection,
+        record: ConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        reason = type(exception).__name__ if exception is not None else "explicit"
+        self.__stats.invalidations[reason] += 1
+
+    def __soft_invalidate(
+        self,
+        dbapi_connection: DBAPIConnection,
+        record: ConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        self.__stats.soft_invalidations += 1
+
+    def __handle_error(self, context: ExceptionContext) -> None:
+        if context.is_pre_ping:
+            self.__stats.ping_failures += 1
+
+    def summary(self) -> str:
+        stats = self.__stats
+        waits = stats.wait_ms
+        ping_total = sum(stats.ping_ms)
+        wait_total = sum(waits)
+
+        lines = [
+            "\n======== Connection pool ========",
+            f"Connects:        {stats.connects}",
+            f"Checkouts:       {stats.checkouts} ({stats.checkins} checked back in)",
+            f"Checkout wait:   {_describe(waits, ' ms')}",
+            f"Held for:        {_describe(stats.hold_ms, ' ms')}",
+            f"Age at checkout: {_describe(stats.age_s, ' s')}",
+            f"Pre-pings:       {stats.pings} ({stats.ping_failures} failed), "
+            f"{_describe(stats.ping_ms, ' ms')}",
+        ]
+        if stats.capacity is not None:
+            # Peaking near capacity means checkouts queue; well under it means
+            # the pool holds connections the load never uses
+            lines.append(
+                f"Peak in use:     {stats.peak_checked_out} of {stats.capacity}"
+            )
+        if stats.checkouts:
+            lines.append(
+                f"Pre-ping cost:   {ping_total / stats.checkouts:.3f} ms per checkout, "
+                f"{ping_total / wait_total if wait_total else 0.0:.1%} of checkout time"
+            )
+        invalidations = ", ".join(
+            f"{reason} x{count}" for reason, count in stats.invalidations.most_common()
+        )
+        lines.append(
+            f"Invalidations:   {invalidations or 'none'}"
+            f" ({stats.soft_invalidations} soft)"
+        )
+        lines.extend(f"Pool status:     {e.pool.status()}" for e in self.__engines)
+        lines.append("=================================")
+        return "\n".join(lines)
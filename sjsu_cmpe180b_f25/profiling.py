@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Coroutine
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any, Concatenate, Protocol
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+
+from .pool import time_checkouts
+
+if TYPE_CHECKING:
+    from .metrics import MetricsRegistry
+
+# The `Client` method running in the current task, for attributing statements
+_caller: ContextVar[str | None] = ContextVar("sql_caller", default=None)
+# Time the current `Client` call has spent waiting on the pool and database
+_clock: ContextVar[_CallClock | None] = ContextVar("call_clock", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Names of the methods wrapped by `instrumented`, in definition order
+INSTRUMENTED: list[str] = []
+
+
+class _Instrumented(Protocol):
+    @property
+    def metrics(self) -> MetricsRegistry | None: ...
+
+    @property
+    def call_profiler(self) -> CallProfiler | None: ...
+
+
+def instrumented[C: _Instrumented, **P, R](
+    fn: Callable[Concatenate[C, P], Awaitable[R]],
+) -> Callable[Concatenate[C, P], Coroutine[Any, Any, R]]:
+    """Attribute a `Client` method's statements to it, and record its calls,
+    latency and errors in `self.metrics` and where its time went in
+    `self.call_profiler` when those are configured.
+    """
+    method = fn.__name__
+    INSTRUMENTED.append(method)
+
+    @functools.wraps(fn)
+    async def wrapper(self: C, /, *args: P.args, **kwargs: P.kwargs) -> R:
+        token = _caller.set(method)
+        metrics = self.metrics
+        call_profiler = self.call_profiler
+        clock = _CallClock() if call_profiler is not None else None
+        clock_token = _clock.set(clock)
+        start = time.perf_counter()
+        error: Exception | None = None
+        try:
+            return await fn(self, *args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _caller.reset(token)
+            _clock.reset(clock_token)
+            if metrics is not None:
+                metrics.observe_call(method, elapsed, error)
+            if call_profiler is not None and clock is not None:
+                call_profiler.observe(method, elapsed, clock)
+
+    return wrapper
+
+
+@dataclass(slots=True)
+class StatementStats:
+    caller: str
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    # None when the driver doesn't report row counts, as SQLite's doesn't
+    # for SELECT
+    rows: int | None = None
+    slow: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class SqlProfiler:
+    """Per-statement latency and row counts from engine cursor events.
+
+    Statements are grouped by their SQL and the `Client` method that ran
+    them. Any statement slower than `slow_ms` is logged as it finishes.
+    """
+
+    def __init__(self, *, slow_ms: float | None = None) -> None:
+        self.__slow_ms = slow_ms
+        self.__stats: dict[tuple[str, str], StatementStats] = {}
+
+    @property
+    def stats(self) -> list[StatementStats]:
+        """Every statement seen so far, costliest in total first"""
+        return sorted(self.__stats.values(), key=lambda s: s.total_ms, reverse=True)
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self.__before)
+        event.listen(engine, "after_cursor_execute", self.__after)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self.__before)
+        event.remove(engine, "after_cursor_execute", self.__after)
+
+    def __before(
+        self,
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def __after(
+        self,
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        caller = _caller.get() or "-"
+        sql = _WHITESPACE.sub(" ", statement).strip()
+
+        stats = self.__stats.get((caller, sql))
+        if stats is None:
+            stats = self.__stats[caller, sql] = StatementStats(caller, sql)
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        if cursor.rowcount >= 0:
+            stats.rows = (stats.rows or 0) + cursor.rowcount
+
+        if self.__slow_ms is not None and elapsed_ms > self.__slow_ms:
+            stats.slow += 1
+            logging.getLogger(__name__).warning(
+                f"Slow query ({elapsed_ms:.1f} ms) in {caller}: {sql}"
+            )
+
+    def summary(self, limit: int = 20, width: int = 60) -> str:
+        stats = self.stats
+        lines = [
+            f"\nSQL statements by total time ({len(stats)} distinct, "
+            f"top {min(limit, len(stats))}):\n",
+            f"{'Caller':<26} {'Calls':>6} {'Total ms':>9} {'Mean ms':>8} "
+            f"{'Max ms':>8} {'Rows':>7} {'Slow':>5}  Statement",
+            "-" * (76 + width),
+        ]
+        lines.extend(
+            f"{s.caller:<26} {s.calls:>6} {s.total_ms:>9.2f} {s.mean_ms:>8.2f} "
+            f"{s.max_ms:>8.2f} {'-' if s.rows is None else s.rows:>7} {s.slow:>5}  "
+            f"{s.statement[:width]}"
+            for s in stats[:limit]
+        )
+        return "\n".join(lines)
+
+
+@dataclass(slots=True)
+class _CallClock:
+    checkout_s: float = 0.0
+    sql_s: float = 0.0
+
+
+@dataclass(slots=True)
+class CallTiming:
+    method: str
+    calls: int = 0
+    wall_ms: float = 0.0
+    checkout_ms: float = 0.0
+    sql_ms: float = 0.0
+
+    @property
+    def python_ms(self) -> float:
+        """Wall time not spent on the pool or database: statement compilation,
+        ORM and row conversion, and waiting for the event loop
+        """
+        return max(self.wall_ms - self.checkout_ms - self.sql_ms, 0.0)
+
+
+class CallProfiler:
+    """Where each `Client` method's wall time goes.
+
+    A call is split into time checking a connection out of the pool, time
+    awaiting the database inside cursor execution, which for the async
+    drivers includes fetching the rows, and the Python left over.
+    """
+
+    def __init__(self) -> None:
+        self.__timings: dict[str, CallTiming] = {}
+
+    @property
+    def timings(self) -> list[CallTiming]:
+        """Every method called so far, most wall time first"""
+        return sorted(self.__timings.values(), key=lambda t: t.wall_ms, reverse=True)
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self.__before)
+        event.listen(engine, "after_cursor_execute", self.__after)
+        time_checkouts(engine, self.__observe_checkout)
+
+    def observe(self, method: str, seconds: float, clock: _CallClock) -> None:
+        timing = self.__timings.get(method)
+        if timing is None:
+            timing = self.__timings[method] = CallTiming(method)
+        timing.calls += 1
+        timing.wall_ms += seconds * 1000
+        timing.checkout_ms += clock.checkout_s * 1000
+        timing.sql_ms += clock.sql_s * 1000
+
+    def __observe_checkout(self, seconds: float) -> None:
+        clock = _clock.get()
+        if clock is not None:
+            clock.checkout_s += seconds
+
+    def __before(
+        self,
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("call_sql_start", []).append(time.perf_counter())
+
+    def __after(
+        self,
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        start = conn.info["call_sql_start"].pop()
+        clock = _clock.get()
+        if clock is not None:
+            clock.sql_s += time.perf_counter() - start
+
+    def summary(self) -> str:
+        lines = [
+            "\nClient calls by wall time:\n",
+            f"{'Method':<32} {'Calls':>6} {'Wall ms':>10} {'Pool %':>7} "
+            f"{'DB %':>6} {'Python %':>9}",
+            "-" * 74,
+        ]
+        for t in self.timings:
+            share = 100 / t.wall_ms if t.wall_ms else 0.0
+            lines.append(
+                f"{t.method:<32} {t.calls:>6} {t.wall_ms:>10.2f} "
+                f"{t.checkout_ms * share:>7.1f} {t.sql_ms * share:>6.1f} "
+                f"{t.python_ms * share:>9.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _collapse(frame: FrameType | None) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{Path(code.co_filename).name}:{code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    """Samples a thread's Python stack on an interval, for flame graphs.
+
+    While a coroutine runs its awaits are on the thread's stack, so samples
+    land on the coroutine doing the work. Samples taken while the loop waits
+    in its selector are I/O wait.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.__interval = interval
+        self.__samples: Counter[str] = Counter()
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def samples(self) -> Counter[str]:
+        return self.__samples
+
+    def start(self) -> None:
+        target = threading.get_ident()
+
+        def sample() -> None:
+            while not self.__stop.wait(self.__interval):
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    self.__samples[_collapse(frame)] += 1
+
+        self.__thread = threading.Thread(
+            target=sample, name="stack-sampler", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def write(self, path: Path) -> None:
+        """Write the samples in the collapsed-stack format `flamegraph.pl`,
+        speedscope and inferno read
+        """
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.__samples.items())
+        )
+
+
+# Output suffixes that get sampled stacks rather than cProfile's pstats
+COLLAPSED_SUFFIXES = (".folded", ".collapsed")
+
+
+def profile_to(path: Path) -> Callable[[], None]:
+    """Start profiling this thread into `path` and return what stops it.
+
+    Collapsed stacks from `StackSampler` are written for the suffixes in
+    `COLLAPSED_SUFFIXES`, otherwise cProfile's pstats for `pstats`/snakeviz.
+    """
+    if path.suffix in COLLAPSED_SUFFIXES:
+        sampler = StackSampler()
+        sampler.start()
+
+        def stop_sampler() -> None:
+            sampler.stop()
+            sampler.write(path)
+
+        return stop_sampler
+
+    profile = cProfile.Profile()
+    profile.enable()
+
+    def stop_profile() -> None:
+        profile.disable()
+        profile.dump_stats(path)
+
+    return stop_profile
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import (
+    ColumnClause,
+    ColumnElement,
+    Float,
+    Integer,
+    Numeric,
+    Select,
+    and_,
+    case,
+    cast,
+    desc,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    type_coerce,
+    union_all,
+)
+
+from .models import (
+    Author,
+    Book,
+    BookAuthor,
+    Copy,
+    CopyStatus,
+    Fine,
+    Loan,
+    LoanStatus,
+    Member,
+    MemberBalance,
+)
+
+# Text search configurations, inlined so the planner can match the expressions
+# against the GIN indexes in `index.py`. Titles are stemmed; names are not.
+TITLE_CONFIG: ColumnClause[str] = literal_column("'english'")
+NAME_CONFIG: ColumnClause[str] = literal_column("'simple'")
+
+
+def top_books(limit: int) -> Select[tuple[int, str, int]]:
+    """Top N most loaned books"""
+    return (
+        select(
+            Book.book_id,
+            Book.title,
+            func.count(Loan.loan_id).label("total_loans"),
+        )
+        .join(Copy, Copy.book_id == Book.book_id)
+        .join(Loan, Loan.copy_id == Copy.copy_id)
+        .group_by(Book.book_id, Book.title)
+        .order_by(desc("total_loans"), Book.title, Book.book_id)
+        .limit(limit)
+    )
+
+
+def overdue_members(
+    now: datetime, open_since: datetime | None = None
+) -> Select[tuple[int, str, str, int, datetime]]:
+    """Members with loans that were due before `now` and are still out
+
+    `open_since`, the earliest loan date of any loan still out, bounds the
+    scan so a partitioned `loans` is pruned to the partitions from then on.
+    """
+    stmt = (
+        select(
+            Member.member_id,
+            Member.name,
+            Member.email,
+            func.count(Loan.loan_id).label("overdue_count"),
+            func.min(Loan.due_date).label("earliest_due_date"),
+        )
+        .join(Loan, Loan.member_id == Member.member_id)
+        .where(
+            Loan.status.in_((LoanStatus.ACTIVE, LoanStatus.OVERDUE)),
+            Loan.return_date.is_(None),
+            Loan.due_date < now,
+        )
+        .group_by(
+            Member.member_id,
+            Member.name,
+            Member.email,
+        )
+        .order_by(
+            desc("overdue_count"),
+            func.min(Loan.due_date),
+        )
+    )
+
+    if open_since is not None:
+        stmt = stmt.where(Loan.loan_date >= open_since)
+
+    return stmt
+
+
+def oldest_open_loan() -> Select[tuple[datetime]]:
+    """Loan date of the oldest loan still out, NULL if none are"""
+    return select(func.min(Loan.loan_date)).where(Loan.return_date.is_(None))
+
+
+def unpaid_fines_members(
+    min_total: float,
+) -> Select[tuple[int, str, str, float, int]]:
+    """Members with unpaid fines, optionally at least `min_total` in total
+
+    Reads the pre-aggregated `member_balances` table, so a threshold is a
+    range scan on `idx_member_balances_unpaid` instead of a group-by over
+    every unpaid fine.
+    """
+    stmt = (
+        select(
+            Member.member_id,
+            Member.name,
+            Member.email,
+            MemberBalance.unpaid_total.label("total_unpaid"),
+            MemberBalance.unpaid_count.label("unpaid_fine_count"),
+        )
+        .join(MemberBalance, MemberBalance.member_id == Member.member_id)
+        .where(MemberBalance.unpaid_count > 0)
+    )
+
+    if min_total > 0:
+        stmt = stmt.where(MemberBalance.unpaid_total >= min_total)
+
+    return stmt.order_by(desc("total_unpaid"), desc("unpaid_fine_count"))
+
+
+def unpaid_fine_totals() -> Select[tuple[int, float, int]]:
+    """Unpaid fine total and count per member, computed from `fines`"""
+    return (
+        select(
+            Member.member_id,
+            func.coalesce(func.sum(Fine.amount), 0.0).label("unpaid_total"),
+            func.count(Fine.fine_id).label("unpaid_count"),
+        )
+        .outerjoin(Fine, and_(Fine.member_id == Member.member_id, Fine.paid.is_(False)))
+        .group_by(Member.member_id)
+    )
+
+
+def loan_fines(
+    loan_ids: Sequence[int],
+) -> Select[tuple[int, int, datetime, float, int | None]]:
+    """Each of `loan_ids` with the total it has been fined and its latest
+    unpaid fine, in loan ID order"""
+    return (
+        select(
+            Loan.loan_id,
+            Loan.member_id,
+            Loan.due_date,
+            func.coalesce(func.sum(Fine.amount), 0.0).label("fined"),
+            func.max(case((Fine.paid.is_(False), Fine.fine_id))).label(
+                "unpaid_fine_id"
+            ),
+        )
+        .outerjoin(Fine, Fine.loan_id == Loan.loan_id)
+        .where(Loan.loan_id.in_(loan_ids))
+        .group_by(Loan.loan_id, Loan.member_id, Loan.due_date)
+        .order_by(Loan.loan_id)
+    )
+
+
+def member_balance_drift() -> Select[tuple[int, float | None, int | None, float, int]]:
+    """Members whose stored balance disagrees with their unpaid fines"""
+    actual = unpaid_fine_totals().subquery()
+
+    return (
+        select(
+            actual.c.member_id,
+            MemberBalance.unpaid_total,
+            MemberBalance.unpaid_count,
+            actual.c.unpaid_total,
+            actual.c.unpaid_count,
+        )
+        .outerjoin(MemberBalance, MemberBalance.member_id == actual.c.member_id)
+        .where(
+            or_(
+                MemberBalance.member_id.is_(None),
+                MemberBalance.unpaid_count != actual.c.unpaid_count,
+                func.abs(MemberBalance.unpaid_total - actual.c.unpaid_total) >= 0.005,
+            )
+        )
+        .order_by(actual.c.member_id)
+    )
+
+
+def copies_on_loan(limit: int) -> Select[tuple[int, str, int, int, float]]:
+    """Loan stats per book title"""
+    total_copies = func.count(Copy.copy_id)
+    on_loan = func.sum(case((Copy.status == CopyStatus.ON_LOAN, 1), else_=0))
+
+    return (
+        select(
+            Book.book_id,
+            Book.title,
+            type_coerce(total_copies, Integer).label("total_copies"),
+            type_coerce(on_loan, Integer).label("copies_on_loan"),
+            type_coerce(on_loan * 100.0 / func.nullif(total_copies, 0), Float).label(
+                "utilization_percent"
+            ),
+        )
+        .join(Copy, Copy.book_id == Book.book_id)
+        .group_by(Book.book_id, Book.title)
+        .order_by(
+            desc("utilization_percent"),
+            desc("total_copies"),
+            Book.book_id,
+        )
+        .limit(limit)
+    )
+
+
+def genre_fine_statistics() -> Select[tuple[str | None, int, float]]:
+    """Fine stats aggregated by book genre, with totals rounded to the cent"""
+    # Summing floats depends on the order rows are added in; rounding makes
+    # totals independent of the plan
+    total_fines = func.round(cast(func.sum(Fine.amount), Numeric), 2)
+
+    return (
+        select(
+            Book.genre,
+            func.count(Fine.fine_id).label("fine_count"),
+            type_coerce(total_fines, Float).label("total_fines"),
+        )
+        .join(Loan, Loan.loan_id == Fine.loan_id)
+        .join(Copy, Copy.copy_id == Loan.copy_id)
+        .join(Book, Book.book_id == Copy.book_id)
+        .group_by(Book.genre)
+        .order_by(desc("total_fines"), Book.genre.nulls_last())
+    )
+
+
+def member_history(
+    member_id: int,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+) -> Select[tuple[int, int, datetime, datetime, LoanStatus]]:
+    """A member's loans, newest first, resuming after a `(loan_date, loan_id)` key"""
+    stmt = (
+        select(
+            Loan.loan_id,
+            Loan.copy_id,
+            Loan.loan_date,
+            Loan.due_date,
+            Loan.status,
+        )
+        .where(Loan.member_id == member_id)
+        .order_by(Loan.loan_date.desc(), Loan.loan_id.desc())
+    )
+
+    if after is not None:
+        loan_date, loan_id = after
+        stmt = stmt.where(
+            # The plain bound is implied by the row comparison, but only it
+            # lets Postgres prune newer partitions of a partitioned `loans`
+            Loan.loan_date <= loan_date,
+            tuple_(Loan.loan_date, Loan.loan_id)
+            < tuple_(literal(loan_date), literal(loan_id)),
+        )
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
+
+
+def loans_between(start: datetime, end: datetime) -> Select[tuple[int, int]]:
+    """Loans made and members borrowing in `[start, end)`"""
+    return select(
+        func.count(Loan.loan_id).label("loan_count"),
+        func.count(func.distinct(Loan.member_id)).label("member_count"),
+    ).where(Loan.loan_date >= start, Loan.loan_date < end)
+
+
+def fines_assessed_between(start: datetime, end: datetime) -> Select[tuple[int, float]]:
+    """Fines assessed in `[start, end)` and their total"""
+    return select(
+        func.count(Fine.fine_id).label("fine_count"),
+        func.coalesce(func.sum(Fine.amount), 0.0).label("total_fines"),
+    ).where(Fine.assessed_at >= start, Fine.assessed_at < end)
+
+
+def book_table() -> Select[tuple[int, str, str, int, int]]:
+    """Every book, in book ID order, with where its title and genre sort
+
+    The ranks follow the database's collation, so they order titles and
+    genres exactly as `ORDER BY` does. `genre_rank` is 0 for no genre.
+    """
+    return select(
+        Book.book_id,
+        Book.title,
+        func.coalesce(Book.genre, "").label("genre"),
+        func.rank().over(order_by=Book.title).label("title_rank"),
+        case(
+            (Book.genre.is_(None), 0),
+            else_=func.dense_rank().over(order_by=Book.genre),
+        ).label("genre_rank"),
+    ).order_by(Book.book_id)
+
+
+def copy_table() -> Select[tuple[int, int, CopyStatus]]:
+    """Every copy, in copy ID order"""
+    return select(Copy.copy_id, Copy.book_id, Copy.status).order_by(Copy.copy_id)
+
+
+def loan_table() -> Select[
+    tuple[int, int, int, datetime, datetime, datetime | None, LoanStatus]
+]:
+    """Every loan, in loan ID order"""
+    return select(
+        Loan.loan_id,
+        Loan.copy_id,
+        Loan.member_id,
+        Loan.loan_date,
+        Loan.due_date,
+        Loan.return_date,
+        Loan.status,
+    ).order_by(Loan.loan_id)
+
+
+def fine_table() -> Select[
+    tuple[int, int, int | None, float, datetime, bool, datetime | None]
+]:
+    """Every fine, in fine ID order"""
+    return select(
+        Fine.fine_id,
+        Fine.member_id,
+        Fine.loan_id,
+        Fine.amount,
+        Fine.assessed_at,
+        Fine.paid,
+        Fine.paid_at,
+    ).order_by(Fine.fine_id)
+
+
+def catalog_books(after: int | None = None) -> Select[tuple[int, str, str | None]]:
+    """Books with an ID above `after`, in book ID order"""
+    stmt = select(Book.book_id, Book.title, Book.genre).order_by(Book.book_id)
+    return stmt if after is None else stmt.where(Book.book_id > after)
+
+
+def catalog_authors(after: int | None = None) -> Select[tuple[int, str]]:
+    """Authors with an ID above `after`, in author ID order"""
+    stmt = select(Author.author_id, Author.name).order_by(Author.author_id)
+    return stmt if after is None else stmt.where(Author.author_id > after)
+
+
+def catalog_book_authors(
+    after: tuple[int, int] | None = None,
+) -> Select[tuple[int, int]]:
+    """Book authors involving a book or author above an `(book_id, author_id)`"""
+    stmt = select(BookAuthor.book_id, BookAuthor.author_id).order_by(
+        BookAuthor.book_id, BookAuthor.author_id
+    )
+    if after is None:
+        return stmt
+    book_id, author_id = after
+    return stmt.where(
+        or_(BookAuthor.book_id > book_id, BookAuthor.author_id > author_id)
+    )
+
+
+def catalog_copies(after: int | None = None) -> Select[tuple[int, int]]:
+    """Copies with an ID above `after` and their book, in copy ID order"""
+    stmt = select(Copy.copy_id, Copy.book_id).order_by(Copy.copy_id)
+    return stmt if after is None else stmt.where(Copy.copy_id > after)
+
+
+def search_books(
+    query: str, limit: int, *, full_text: bool = False, trigram: bool = False
+) -> Select[tuple[int, str, str | None, float]]:
+    """Books whose title or an author's name matches `query`, best match first
+
+    With `full_text` (PostgreSQL), titles and names are matched as `tsvector`s
+    and ranked with `ts_rank`; `trigram` adds `pg_trgm` word similarity so
+    misspellings still match. Otherwise a case-insensitive substring match is
+    used, ranking prefix matches first.
+    """
+    title_match: ColumnElement[bool]
+    title_rank: ColumnElement[float]
+    name_match: ColumnElement[bool]
+    name_rank: ColumnElement[float]
+
+    if full_text:
+        title_vector = func.to_tsvector(TITLE_CONFIG, Book.title)
+        title_query = func.websearch_to_tsquery(TITLE_CONFIG, query)
+        title_match = title_vector.bool_op("@@")(title_query)
+        title_rank = func.ts_rank(title_vector, title_query, type_=Float)
+
+        name_vector = func.to_tsvector(NAME_CONFIG, Author.name)
+        name_query = func.websearch_to_tsquery(NAME_CONFIG, query)
+        name_match = name_vector.bool_op("@@")(name_query)
+        name_rank = func.ts_rank(name_vector, name_query, type_=Float)
+
+        if trigram:
+            title_match = or_(title_match, literal(query).bool_op("<%")(Book.title))
+            title_rank = title_rank + func.word_similarity(
+                query, Book.title, type_=Float
+            )
+            name_match = or_(name_match, literal(query).bool_op("<%")(Author.name))
+            name_rank = name_rank + func.word_similarity(
+                query, Author.name, type_=Float
+            )
+    else:
+        title_match = Book.title.icontains(query, autoescape=True)
+        title_rank = case(
+            (Book.title.istartswith(query, autoescape=True), 1.0), else_=0.5
+        )
+        name_match = Author.name.icontains(query, autoescape=True)
+        name_rank = case(
+            (Author.name.istartswith(query, autoescape=True), 1.0), else_=0.5
+        )
+
+    matches = union_all(
+        select(Book.book_id, title_rank.label("rank")).where(title_match),
+        select(BookAuthor.book_id, name_rank.label("rank"))
+        .join(Author, Author.author_id == BookAuthor.author_id)
+        .where(name_match),
+    ).subquery()
+
+    authors = (
+        select(func.aggregate_strings(Author.name, ", "))
+        .join(BookAuthor, BookAuthor.author_id == Author.author_id)
+        .where(BookAuthor.book_id == Book.book_id)
+        .scalar_subquery()
+    )
+
+    return (
+        select(
+            Book.book_id,
+            Book.title,
+            authors.label("authors"),
+            type_coerce(func.sum(matches.c.rank), Float).label("rank"),
+        )
+        .join(matches, matches.c.book_id == Book.book_id)
+        .group_by(Book.book_id, Book.title)
+        .order_by(desc("rank"), Book.title, Book.book_id)
+        .limit(limit)
+    )
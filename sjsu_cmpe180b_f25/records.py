@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import partial
+from typing import Any, NamedTuple
+
+from sqlalchemy import CursorResult, Select
+
+from .models import LoanStatus
+
+# Rows returned by the `Client` report methods. Each is a `NamedTuple`, so
+# slotted, immutable and typed by field, and still a tuple that callers can
+# unpack. A record is a bare tuple of its values, where a retained SQLAlchemy
+# `Row` also keeps a separate tuple of them and a reference to its result's
+# metadata.
+
+
+class TopBook(NamedTuple):
+    book_id: int
+    title: str
+    total_loans: int
+
+
+class OverdueMember(NamedTuple):
+    member_id: int
+    name: str
+    email: str
+    overdue_count: int
+    earliest_due_date: datetime
+
+
+class UnpaidFines(NamedTuple):
+    member_id: int
+    name: str
+    email: str
+    total_unpaid: float
+    unpaid_fine_count: int
+
+
+class BookUtilization(NamedTuple):
+    book_id: int
+    title: str
+    total_copies: int
+    copies_on_loan: int
+    utilization_percent: float
+
+
+class GenreFines(NamedTuple):
+    genre: str | None
+    fine_count: int
+    total_fines: float
+
+
+class LoanHistory(NamedTuple):
+    loan_id: int
+    copy_id: int
+    loan_date: datetime
+    due_date: datetime
+    status: LoanStatus
+
+
+class SearchHit(NamedTuple):
+    book_id: int
+    title: str
+    authors: str | None
+    rank: float
+
+
+class BalanceDrift(NamedTuple):
+    member_id: int
+    # None when the member has no balance row at all
+    stored_total: float | None
+    stored_count: int | None
+    actual_total: float
+    actual_count: int
+
+
+def result_processors(
+    result: CursorResult[Any], stmt: Select[Any]
+) -> list[Callable[[Any], Any] | None]:
+    """The function converting each of `stmt`'s driver values, None where the
+    driver's value is used as is"""
+    dialect = result.context.dialect
+    return [
+        column.type.dialect_impl(dialect).result_processor(dialect, description[1])
+        for column, description in zip(
+            stmt.selected_columns, result.cursor.description, strict=True
+        )
+    ]
+
+
+def as_records[R: tuple[Any, ...]](
+    result: CursorResult[Any], stmt: Select[Any], record: type[R]
+) -> list[R]:
+    """Every row of `stmt`'s buffered `result` as a `record`.
+
+    Records are made by `tuple.__new__` directly, skipping the Python-level
+    `_make`, so `stmt` must select exactly the record's fields in order. On
+    PostgreSQL, where it measured faster, they are built from the driver's
+    rows so that no `Row` is made on the way, with columns whose type
+    converts driver values converted a whole column at a time; elsewhere
+    from SQLAlchemy's own rows. Not for results streamed with `yield_per`,
+    which hold back rows of their own.
+    """
+    make: Callable[[Iterable[Any]], R] = partial(tuple.__new__, record)
+    if result.context.dialect.name != "postgresql":
+        return list(map(make, result.tuples()))
+
+    processors = result_processors(result, stmt)
+    rows = result.cursor.fetchall()
+    result.close()
+
+    if not rows or not any(processors):
+        return list(map(make, rows))
+    columns = [
+        values if process is None else list(map(process, values))
+        for process, values in zip(processors, zip(*rows, strict=True), strict=True)
+    ]
+    return list(map(make, zip(*columns, strict=True)))
@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Protocol, TextIO
+
+from .client import Client
+from .memory import MemoryTracer
+from .pagination import Page
+from .records import BookUtilization, GenreFines, LoanHistory, TopBook
+
+logger = logging.getLogger(__name__)
+
+type Batches = AsyncIterator[Sequence[tuple[Any, ...]]]
+
+
+@dataclass(frozen=True, slots=True)
+class Report:
+    """A report's heading, how to format its rows, and where its rows come from."""
+
+    name: str
+    description: str
+    header: list[str]
+    format_row: Callable[[tuple[Any, ...]], str]
+    batches: Callable[[], Batches]
+    columns: tuple[str, ...] = ()
+    money: frozenset[str] = frozenset()
+
+
+class AnalyticsSource(Protocol):
+    """Report methods a `Client` has, and a snapshot can answer offline."""
+
+    async def get_top_books(self, limit: int = 10) -> list[TopBook]: ...
+
+    async def get_copies_on_loan(self, limit: int = 20) -> list[BookUtilization]: ...
+
+    async def get_genre_fine_statistics(self) -> list[GenreFines]: ...
+
+
+def fetch_once(
+    fetch: Callable[[], Awaitable[Sequence[tuple[Any, ...]]]],
+) -> Callable[[], Batches]:
+    """Adapt a query returning every row at once to a single batch."""
+
+    async def batches() -> Batches:
+        yield await fetch()
+
+    return batches
+
+
+def top_books_report(client: AnalyticsSource, limit: int) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        book_id, title, total_loans = row
+        return f"{book_id:5}  {title[:40]:40}  {total_loans:5}"
+
+    return Report(
+        name="top-books",
+        description=f"Fetching top {limit} most-loaned books...",
+        header=[
+            f"\nTop {limit} books by total loans:\n",
+            f"{'ID':>5}  {'Title':40}  {'Loans':>5}",
+            "-" * 60,
+        ],
+        format_row=format_row,
+        batches=fetch_once(lambda: client.get_top_books(limit=limit)),
+        columns=("book_id", "title", "total_loans"),
+    )
+
+
+def overdue_members_report(
+    client: Client, *, stream: bool = False, batch_size: int = 1000
+) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        member_id, name, email, overdue_count, earliest_due = row
+        return (
+            f"{member_id:5}  {name[:25]:25}  {email[:30]:30}  "
+            f"{overdue_count:7}  {earliest_due.strftime('%Y-%m-%d'):>12}"
+        )
+
+    return Report(
+        name="overdue-members",
+        description="Fetching members with currently overdue loans...",
+        header=[
+            "\nMembers with currently overdue loans:\n",
+            f"{'ID':>5}  {'Name':25}  {'Email':30}  {'Overdue':>7}  {'Earliest Due':>12}",
+            "-" * 90,
+        ],
+        format_row=format_row,
+        batches=(
+            (lambda: client.stream_overdue_members(batch_size))
+            if stream
+            else fetch_once(client.get_overdue_members)
+        ),
+        columns=(
+            "member_id",
+            "name",
+            "email",
+            "overdue_count",
+            "earliest_due_date",
+        ),
+    )
+
+
+def unpaid_fines_members_report(
+    client: Client, min_total: float, *, stream: bool = False, batch_size: int = 1000
+) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        member_id, name, email, total_unpaid, fine_count = row
+        return (
+            f"{member_id:5}  {name[:25]:25}  {email[:30]:30}  "
+            f"{total_unpaid:12.2f}  {fine_count:5}"
+        )
+
+    return Report(
+        name="unpaid-fines-members",
+        description=f"Fetching members with unpaid fines >= {min_total:.2f}...",
+        header=[
+            f"\nMembers with unpaid fines >= {min_total:.2f}:\n",
+            f"{'ID':>5}  {'Name':25}  {'Email':30}  {'Total Unpaid':>12}  {'Count':>5}",
+            "-" * 95,
+        ],
+        format_row=format_row,
+        batches=(
+            (lambda: client.stream_unpaid_fines_members(min_total, batch_size))
+            if stream
+            else fetch_once(
+                lambda: client.get_unpaid_fines_members(min_total=min_total)
+            )
+        ),
+        columns=("member_id", "name", "email", "total_unpaid", "unpaid_fine_count"),
+        money=frozenset({"total_unpaid"}),
+    )
+
+
+def copies_on_loan_report(client: AnalyticsSource, limit: int) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        book_id, title, total_copies, copies_on_loan, util = row
+        return (
+            f"{book_id:5}  {title[:40]:40}  {total_copies:6}  "
+            f"{copies_on_loan:7}  {util if util is not None else 0.0:7.2f}"
+        )
+
+    return Report(
+        name="copies-on-loan",
+        description=f"Fetching top {limit} books by utilization...",
+        header=[
+            f"\nTop {limit} books by copy utilization:\n",
+            f"{'ID':>5}  {'Title':40}  {'Copies':>6}  {'On Loan':>7}  {'Util %':>7}",
+            "-" * 80,
+        ],
+        format_row=format_row,
+        batches=fetch_once(lambda: client.get_copies_on_loan(limit=limit)),
+        columns=(
+            "book_id",
+            "title",
+            "total_copies",
+            "copies_on_loan",
+            "utilization_percent",
+        ),
+    )
+
+
+def genre_fine_stats_report(client: AnalyticsSource) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        genre, fine_count, total_fines = row
+        return f"{genre or 'UNKNOWN':20}  {fine_count:10}  {total_fines:12.2f}"
+
+    return Report(
+        name="genre-fine-stats",
+        description="Fetching fine statistics grouped by genre...",
+        header=[
+            "\nFine statistics by genre:\n",
+            f"{'Genre':20}  {'Fine Count':>10}  {'Total Fines':>12}",
+            "-" * 50,
+        ],
+        format_row=format_row,
+        batches=fetch_once(client.get_genre_fine_statistics),
+        columns=("genre", "fine_count", "total_fines"),
+        money=frozenset({"total_fines"}),
+    )
+
+
+def search_report(client: Client, query: str, limit: int) -> Report:
+    def format_row(row: tuple[Any, ...]) -> str:
+        book_id, title, authors, _ = row
+        return f"{book_id:5}  {title[:40]:40}  {(authors or '')[:30]:30}"
+
+    return Report(
+        name="search",
+        description=f"Searching books for '{query}'...",
+        header=[
+            f"\nBooks matching '{query}':\n",
+            f"{'ID':>5}  {'Title':40}  {'Authors':30}",
+            "-" * 79,
+        ],
+        format_row=format_row,
+        batches=fetch_once(lambda: client.search_books(query, limit=limit)),
+        columns=("book_id", "title", "authors", "rank"),
+    )
+
+
+def member_history_report(
+    member_id: int, page: Page[LoanHistory], titles: Mapping[int, str] | None = None
+) -> Report:
+    """A page of loan history already fetched, with each copy's title from
+    `titles` if given."""
+
+    def format_row(row: tuple[Any, ...]) -> str:
+        loan_id, copy_id, loan_date, due_date, status, *title = row
+        return f"{loan_id:<7} {copy_id:<7} {loan_date}  {due_date}  {status}" + (
+            f"  {title[0][:40]}" if title else ""
+        )
+
+    async def batches() -> Batches:
+        if titles is None:
+            yield page.rows
+        else:
+            yield [(*row, titles[row.copy_id]) for row in page.rows]
+
+    columns = ("loan_id", "copy_id", "loan_date", "due_date", "status")
+    return Report(
+        name="member-history",
+        description=f"Fetched loan history for Member {member_id}.",
+        header=[
+            f"\nLoan history for Member {member_id}:\n",
+            "LoanID  CopyID  LoanDate        DueDate         Status"
+            + ("      Title" if titles is not None else ""),
+            "-------------------------------------------------------------"
+            + ("-" * 40 if titles is not None else ""),
+        ],
+        format_row=format_row,
+        batches=batches,
+        columns=columns + ("title",) if titles is not None else columns,
+    )
+
+
+def typed_values(report: Report, row: tuple[Any, ...]) -> list[Any]:
+    """A row's values with dates in ISO 8601, enums as their values and
+    money as exact cents."""
+    values: list[Any] = []
+    for name, value in zip(report.columns, row, strict=True):
+        if isinstance(value, datetime | date):
+            value = value.isoformat()
+        elif isinstance(value, Enum):
+            value = value.value
+        elif name in report.money and value is not None:
+            value = Decimal(f"{value:.2f}")
+        values.append(value)
+    return values
+
+
+def json_default(value: object) -> str:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__} to JSON")
+
+
+class ReportWriter(ABC):
+    """Renders reports one batch at a time, in the order they are run."""
+
+    def begin(self, report: Report) -> None:  # noqa: B027
+        """Called before a report's first batch."""
+
+    @abstractmethod
+    def write(self, report: Report, batch: Sequence[tuple[Any, ...]]) -> None: ...
+
+    def end(self, report: Report) -> None:  # noqa: B027
+        """Called after a report's last batch."""
+
+    def close(self) -> None:  # noqa: B027
+        """Called once every report is written."""
+
+
+class TextWriter(ReportWriter):
+    """Fixed-width tables through the logger, for reading at a terminal."""
+
+    def __init__(self) -> None:
+        self.__header: list[str] = []
+
+    def begin(self, report: Report) -> None:
+        self.__header = report.header
+
+    def write(self, report: Report, batch: Sequence[tuple[Any, ...]]) -> None:
+        logger.info("\n".join(self.__header + [report.format_row(r) for r in batch]))
+        self.__header = []
+
+    def end(self, report: Report) -> None:
+        if self.__header:
+            logger.info("\n".join(self.__header))
+
+
+class StreamWriter(ReportWriter):
+    """Base for formats written straight to a stream, flushed every batch."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, report: Report, batch: Sequence[tuple[Any, ...]]) -> None:
+        for row in batch:
+            self.write_row(report, typed_values(report, row))
+        self.stream.flush()
+
+    @abstractmethod
+    def write_row(self, report: Report, values: list[Any]) -> None: ...
+
+
+class JsonLinesWriter(StreamWriter):
+    """One JSON object per row, tagged with the report it belongs to."""
+
+    def write_row(self, report: Report, values: list[Any]) -> None:
+        record = {
+            "report": report.name,
+            **dict(zip(report.columns, values, strict=True)),
+        }
+        self.stream.write(json.dumps(record, default=json_default) + "\n")
+
+
+class JsonWriter(StreamWriter):
+    """A single JSON object mapping each report's name to its rows."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        super().__init__(stream)
+        self.__reports = 0
+        self.__rows = 0
+
+    def begin(self, report: Report) -> None:
+        self.stream.write("{" if self.__reports == 0 else ",")
+        self.stream.write(f"\n{json.dumps(report.name)}: [")
+        self.__reports += 1
+        self.__rows = 0
+
+    def write_row(self, report: Report, values: list[Any]) -> None:
+        record = dict(zip(report.columns, values, strict=True))
+        self.stream.write("," if self.__rows else "")
+        self.stream.write(f"\n  {json.dumps(record, default=json_default)}")
+        self.__rows += 1
+
+    def end(self, report: Report) -> None:
+        self.stream.write("\n]" if self.__rows else "]")
+
+    def close(self) -> None:
+        self.stream.write("\n}\n" if self.__reports else "{}\n")
+        self.stream.flush()
+
+
+class CsvWriter(StreamWriter):
+    """A header row and the rows of each report, reports separated by a blank line."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        super().__init__(stream)
+        self.__writer = csv.writer(self.stream, lineterminator="\n")
+        self.__reports = 0
+
+    def begin(self, report: Report) -> None:
+        if self.__reports:
+            self.stream.write("\n")
+        self.__writer.writerow(report.columns)
+        self.__reports += 1
+
+    def write_row(self, report: Report, values: list[Any]) -> None:
+        self.__writer.writerow(values)
+
+
+WRITERS: dict[str, Callable[[], ReportWriter]] = {
+    "text": TextWriter,
+    "json": JsonWriter,
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+}
+
+
+async def run_reports(
+    reports: Sequence[Report],
+    *,
+    writer: ReportWriter | None = None,
+    max_concurrency: int = 5,
+    buffered_batches: int = 4,
+    tracer: MemoryTracer | None = None,
+) -> None:
+    """Run reports concurrently, writing their output in the order given.
+
+    At most `max_concurrency` reports hold a pooled connection at once. A
+    report that finishes ahead of its turn waits with at most
+    `buffered_batches` batches in memory, so streamed reports stay streamed.
+    With a `tracer`, each report's phase ends once its rows are written;
+    run one report at a time to keep the phases from overlapping.
+    """
+    writer = writer if writer is not None else TextWriter()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    queues: list[asyncio.Queue[Sequence[tuple[Any, ...]] | Exception | None]] = [
+        asyncio.Queue(maxsize=buffered_batches) for _ in reports
+    ]
+
+    async def produce(
+        report: Report,
+        queue: asyncio.Queue[Sequence[tuple[Any, ...]] | Exception | None],
+    ) -> None:
+        async with semaphore:
+            logger.info(report.description)
+            try:
+                async for batch in report.batches():
+                    await queue.put(batch)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(None)
+
+    async def consume() -> None:
+        for report, queue in zip(reports, queues, strict=True):
+            writer.begin(report)
+            rows = 0
+            while (batch := await queue.get()) is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+                writer.write(report, batch)
+                rows += len(batch)
+            writer.end(report)
+            if tracer is not None:
+                tracer.phase(f"report {report.name}", rows)
+        writer.close()
+
+    producers = [
+        asyncio.ensure_future(produce(report, queue))
+        for report, queue in zip(reports, queues, strict=True)
+    ]
+    try:
+        await asyncio.gather(consume(), *producers)
+    finally:
+        for producer in producers:
+            producer.cancel()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import Select
+
+from . import queries
+from .columns import Frame, positions
+from .models import CopyStatus
+from .records import BookUtilization, GenreFines, TopBook
+
+if TYPE_CHECKING:
+    from .client import Client
+
+TABLES = ("books", "copies", "loans", "fines")
+
+_ON_LOAN = list(CopyStatus).index(CopyStatus.ON_LOAN)
+
+
+def snapshot_tables() -> dict[str, Select[Any]]:
+    return {
+        "books": queries.book_table(),
+        "copies": queries.copy_table(),
+        "loans": queries.loan_table(),
+        "fines": queries.fine_table(),
+    }
+
+
+def save_frame(frame: Frame, directory: Path) -> None:
+    """Write each column to `<directory>/<column>.npy`.
+
+    Strings are stored fixed-width so that every column can be memory-mapped.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, values in frame.items():
+        if values.dtype == np.object_:
+            if any(value is None for value in values):
+                raise ValueError(f"Column '{name}' has NULLs; coalesce it first")
+            values = values.astype(np.str_) if len(values) else np.empty(0, "U1")
+        np.save(directory / f"{name}.npy", values, allow_pickle=False)
+
+
+def load_frame(directory: Path) -> Frame:
+    """Memory-map every column saved by `save_frame`."""
+    if not directory.is_dir():
+        raise FileNotFoundError(f"No snapshot table at '{directory}'")
+    return {
+        path.stem: np.load(path, mmap_mode="r", allow_pickle=False)
+        for path in sorted(directory.glob("*.npy"))
+    }
+
+
+async def export_snapshot(
+    client: Client, directory: Path, *, batch_size: int = 10_000
+) -> dict[str, int]:
+    """Save books, copies, loans and fines under `directory`, returning the
+    rows written per table.
+
+    Fine amounts are stored as whole cents in `amount_cents`, so that sums
+    are exact.
+    """
+    frames = await client.fetch_tables(snapshot_tables(), batch_size=batch_size)
+    fines = frames["fines"]
+    fines["amount_cents"] = np.rint(fines.pop("amount") * 100).astype(np.int64)
+
+    for table, frame in frames.items():
+        save_frame(frame, directory / table)
+    return {table: len(next(iter(frame.values()))) for table, frame in frames.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Books, copies, loans and fines exported by `export_snapshot`, with
+    the Client's analytical reports computed over them in NumPy.
+
+    Each report returns exactly what its `Client` method returns for the
+    data the snapshot was taken from.
+    """
+
+    books: Frame
+    copies: Frame
+    loans: Frame
+    fines: Frame
+
+    @classmethod
+    def load(cls, directory: Path) -> Snapshot:
+        return cls(*(load_frame(directory / table) for table in TABLES))
+
+    def top_books(self, limit: int = 10) -> list[TopBook]:
+        """The N most loaned books, as `Client.get_top_books`"""
+        book_ids = self.books["book_id"]
+        copy = positions(self.copies["copy_id"], self.loans["copy_id"])
+        book = positions(book_ids, self.copies["book_id"][copy])
+        loans = np.bincount(book, minlength=len(book_ids))
+
+        loaned = np.flatnonzero(loans)
+        order = np.lexsort(
+            (book_ids[loaned], self.books["title_rank"][loaned], -loans[loaned])
+        )
+        top = loaned[order[:limit]]
+        return [
+            TopBook(*row)
+            for row in zip(
+                book_ids[top].tolist(),
+                self.books["title"][top].tolist(),
+                loans[top].tolist(),
+                strict=True,
+            )
+        ]
+
+    def copies_on_loan(self, limit: int = 20) -> list[BookUtilization]:
+        """Loan stats per book, as `Client.get_copies_on_loan`"""
+        book_ids = self.books["book_id"]
+        book = positions(book_ids, self.copies["book_id"])
+        copies = np.bincount(book, minlength=len(book_ids))
+        on_loan = np.bincount(
+            book[self.copies["status"] == _ON_LOAN], minlength=len(book_ids)
+        )
+
+        stocked = np.flatnonzero(copies)
+        # Same operations in the same order as the SQL, so the same floats
+        utilization = on_loan[stocked] * 100.0 / copies[stocked]
+        order = np.lexsort((book_ids[stocked], -copies[stocked], -utilization))[:limit]
+        top = stocked[order]
+        return [
+            BookUtilization(*row)
+            for row in zip(
+                book_ids[top].tolist(),
+                self.books["title"][top].tolist(),
+                copies[top].tolist(),
+                on_loan[top].tolist(),
+                utilization[order].tolist(),
+                strict=True,
+            )
+        ]
+
+    def genre_fine_statistics(self) -> list[GenreFines]:
+        """Fine stats per genre, as `Client.get_genre_fine_statistics`"""
+        # Fines without a loan, or whose loan was archived out of `loans`,
+        # are dropped, as the SQL report's inner join drops them
+        loan_ids = self.fines["loan_id"]
+        has_loan = np.isin(loan_ids, self.loans["loan_id"])
+        loan = positions(self.loans["loan_id"], loan_ids[has_loan].astype(np.int64))
+        copy = positions(self.copies["copy_id"], self.loans["copy_id"][loan])
+        book = positions(self.books["book_id"], self.copies["book_id"][copy])
+
+        ranks, group = np.unique(self.books["genre_rank"][book], return_inverse=True)
+        fines = np.bincount(group, minlength=len(ranks))
+        cents = np.bincount(
+            group, weights=self.fines["amount_cents"][has_loan], minlength=len(ranks)
+        )
+        totals = cents / 100
+
+        # Any book of each genre, for its name
+        named_by = np.zeros(len(ranks), dtype=np.intp)
+        named_by[group] = book
+        names = self.books["genre"][named_by].tolist()
+
+        # Books without a genre have rank 0 and sort last, as NULLs do in SQL
+        order = np.lexsort(
+            (np.where(ranks == 0, np.iinfo(ranks.dtype).max, ranks), -totals)
+        )
+        return [
+            GenreFines(
+                None if ranks[i] == 0 else names[i],
+                int(fines[i]),
+                float(totals[i]),
+            )
+            for i in order.tolist()
+        ]
+
+
+class SnapshotReports:
+    """A snapshot's reports under the `Client` method names reports call."""
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        self.snapshot = snapshot
+
+    async def get_top_books(self, limit: int = 10) -> list[TopBook]:
+        return self.snapshot.top_books(limit)
+
+    async def get_copies_on_loan(self, limit: int = 20) -> list[BookUtilization]:
+        return self.snapshot.copies_on_loan(limit)
+
+    async def get_genre_fine_statistics(self) -> list[GenreFines]:
+        return self.snapshot.genre_fine_statistics()
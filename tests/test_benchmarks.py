@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25.benchmarks import (
+    OPERATIONS,
+    BenchmarkResult,
+    benchmark_client,
+    compare_results,
+    load_results,
+    save_results,
+)
+from sjsu_cmpe180b_f25.benchmarks.runner import summarize
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.population import populate_db
+
+
+def result(operation: str, p50_ms: float, p95_ms: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        scale=1,
+        operation=operation,
+        group="reports",
+        iterations=100,
+        p50_ms=p50_ms,
+        p95_ms=p95_ms,
+        p99_ms=p95_ms,
+        mean_ms=p50_ms,
+        ops_per_sec=1000 / p50_ms,
+    )
+
+
+def test_summarize() -> None:
+    """Test latency percentiles and throughput over a run's samples."""
+
+    summary = summarize(2, OPERATIONS[0], [float(ms) for ms in range(1, 101)])
+
+    assert (summary.scale, summary.operation) == (2, OPERATIONS[0].name)
+    assert summary.iterations == 100
+    assert summary.p50_ms == pytest.approx(50.5)
+    assert summary.p95_ms == pytest.approx(95.05)
+    assert summary.p99_ms == pytest.approx(99.01)
+    assert summary.mean_ms == 50.5
+    assert summary.ops_per_sec == pytest.approx(1000 / 50.5)
+
+
+def test_compare_results() -> None:
+    """Test that only slowdowns past the threshold are flagged."""
+
+    baseline = [result("a", 1.0, 2.0), result("b", 1.0, 2.0), result("gone", 1, 1)]
+    current = [result("a", 1.05, 2.0), result("b", 1.0, 3.0), result("new", 1, 1)]
+
+    regressions = compare_results(baseline, current, threshold=0.10)
+
+    assert [(r.operation, r.metric) for r in regressions] == [("b", "p95_ms")]
+    assert regressions[0].change == 0.5
+
+
+def test_results_round_trip(tmp_path: Path) -> None:
+    """Test saving results as JSON and loading them back."""
+
+    path = tmp_path / "results.json"
+    results = [result("a", 1.0, 2.0), result("b", 3.0, 4.0)]
+
+    save_results(path, results, database="sqlite")
+
+    assert load_results(path) == results
+
+
+@pytest.mark.asyncio
+async def test_benchmark_client(test_client: Client) -> None:
+    """Test timing every operation against a small seeded database."""
+
+    await populate_db(
+        test_client,
+        num_authors=5,
+        num_books=5,
+        num_members=5,
+        copies_per_book=2,
+        num_loans=10,
+    )
+
+    results = await benchmark_client(test_client, 1, iterations=3, warmup=1)
+
+    assert [r.operation for r in results] == [op.name for op in OPERATIONS]
+    assert all(r.iterations == 3 and r.ops_per_sec > 0 for r in results)
+    assert all(r.p50_ms <= r.p95_ms <= r.p99_ms for r in results)
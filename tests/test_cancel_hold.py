@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus
+
+
+@pytest.mark.asyncio
+async def test_cancel_hold(test_client: Client) -> None:
+    """Test that a waiting hold can be cancelled once."""
+
+    await test_client.create_book(book_id=1, title="Test Book")
+    await test_client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime.now(tz=None),
+    )
+    hold = await test_client.place_hold(book_id=1, member_id=1)
+    assert hold is not None
+
+    assert await test_client.cancel_hold(hold_id=hold.hold_id) is True
+    assert await test_client.cancel_hold(hold_id=hold.hold_id) is False
+
+    # Cancelling frees the member to queue again.
+    assert await test_client.place_hold(book_id=1, member_id=1) is not None
+
+
+@pytest.mark.asyncio
+async def test_cancel_ready_hold(test_client: Client) -> None:
+    """Test that cancelling a filled hold passes its copy on."""
+
+    await test_client.create_book(book_id=1, title="Test Book")
+    await test_client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    for member_id in (1, 2, 3):
+        await test_client.create_member(
+            member_id=member_id,
+            name=f"Member {member_id}",
+            email=f"member{member_id}@email.com",
+            joined_at=datetime.now(tz=None),
+        )
+
+    loan = await test_client.request_loan(copy_id=1, member_id=1)
+    assert loan is not None
+    ready = await test_client.place_hold(book_id=1, member_id=2)
+    assert ready is not None
+    await test_client.end_loan(loan_id=loan.loan_id)
+
+    assert await test_client.cancel_hold(hold_id=ready.hold_id) is True
+
+    # With nobody else waiting, the copy goes back on the shelf.
+    assert await test_client.request_loan(copy_id=1, member_id=3) is not None
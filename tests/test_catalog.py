@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25.catalog import (
+    Catalog,
+    CatalogBook,
+    CatalogCounts,
+    build_catalog,
+    refresh_catalog,
+)
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus
+
+
+async def seed(client: Client) -> None:
+    await client.create_author(id=1, name="Ursula K. Le Guin")
+    await client.create_author(id=2, name="Gabriel García Márquez")
+    await client.create_book(book_id=1, title="The Dispossessed", genre="Sci-Fi")
+    await client.create_book(book_id=3, title="Cien años de soledad", genre=None)
+    await client.create_book_author(book_id=1, author_id=1)
+    await client.create_book_author(book_id=3, author_id=2)
+    await client.create_copy(copy_id=1, book_id=3, status=CopyStatus.AVAILABLE)
+
+
+@pytest.mark.asyncio
+async def test_catalog(test_client: Client, tmp_path: Path) -> None:
+    """Test building a catalog and looking up books, authors and copies."""
+
+    await seed(test_client)
+    path = tmp_path / "catalog.idx"
+    assert await build_catalog(test_client, path) == CatalogCounts(2, 2, 2, 1)
+
+    catalog = Catalog(path)
+    assert len(catalog) == 2
+    assert catalog.book(1) == CatalogBook(
+        1, "The Dispossessed", "Sci-Fi", ("Ursula K. Le Guin",)
+    )
+    assert catalog.book(3) == CatalogBook(
+        3, "Cien años de soledad", None, ("Gabriel García Márquez",)
+    )
+    assert catalog.book(2) is None
+    assert catalog.book(4) is None
+    assert catalog.author(2) == "Gabriel García Márquez"
+    assert catalog.copy_title(1) == "Cien años de soledad"
+    assert catalog.copy_title(2) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_catalog(test_client: Client, tmp_path: Path) -> None:
+    """Test that a refresh adds new rows and links new authors to old books."""
+
+    path = tmp_path / "catalog.idx"
+    assert await refresh_catalog(test_client, path) == CatalogCounts(0, 0, 0, 0)
+    assert Catalog(path).book(1) is None
+
+    await seed(test_client)
+    await refresh_catalog(test_client, path)
+    old = Catalog(path)
+
+    await test_client.create_author(id=3, name="Octavia E. Butler")
+    await test_client.create_book(book_id=4, title="Kindred", genre="Sci-Fi")
+    await test_client.create_book_author(book_id=4, author_id=3)
+    await test_client.create_book_author(book_id=1, author_id=3)
+    await test_client.create_copy(copy_id=2, book_id=4, status=CopyStatus.AVAILABLE)
+
+    assert await refresh_catalog(test_client, path) == CatalogCounts(1, 1, 2, 1)
+    catalog = Catalog(path)
+    assert catalog.book(4) == CatalogBook(
+        4, "Kindred", "Sci-Fi", ("Octavia E. Butler",)
+    )
+    assert catalog.book(1) == CatalogBook(
+        1, "The Dispossessed", "Sci-Fi", ("Ursula K. Le Guin", "Octavia E. Butler")
+    )
+    assert catalog.copy_title(2) == "Kindred"
+
+    # Catalogs already open keep reading the file they mapped
+    assert old.book(4) is None
+    assert old.title(1) == "The Dispossessed"
+
+    assert await refresh_catalog(test_client, path) == CatalogCounts(0, 0, 0, 0)
+
+
+def test_not_a_catalog(tmp_path: Path) -> None:
+    """Test that other files are rejected."""
+
+    path = tmp_path / "catalog.idx"
+    path.write_bytes(b"not a catalog, just some bytes")
+    with pytest.raises(ValueError, match="Not a catalog"):
+        Catalog(path)
@@ -46,3 +46,43 @@ async def test_concurrent_end_loan(test_client: Client) -> None:
     tasks = [test_client.end_loan(loan_id=loan.loan_id) for _ in range(5)]
     results = await asyncio.gather(*tasks, return_exceptions=True)
     assert len([res for res in results if res is True]) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_end_loan_with_holds(test_client: Client) -> None:
+    """Test that copies returned together each go to a different hold."""
+
+    await test_client.create_book(book_id=1, title="Test Book")
+    for member_id in range(1, 5):
+        await test_client.create_member(
+            member_id=member_id,
+            name=f"Member {member_id}",
+            email=f"member{member_id}@email.com",
+            joined_at=datetime.now(tz=None),
+        )
+
+    loans = []
+    for copy_id in (1, 2):
+        await test_client.create_copy(
+            copy_id=copy_id, book_id=1, status=CopyStatus.AVAILABLE
+        )
+        loan = await test_client.request_loan(copy_id=copy_id, member_id=copy_id)
+        assert loan is not None
+        loans.append(loan)
+
+    for member_id in (3, 4):
+        assert await test_client.place_hold(book_id=1, member_id=member_id)
+
+    results = await asyncio.gather(
+        *(test_client.end_loan(loan_id=loan.loan_id) for loan in loans)
+    )
+    assert results == [True, True]
+
+    # Each waiting member can collect exactly one of the returned copies.
+    collected = [
+        member_id
+        for copy_id in (1, 2)
+        for member_id in (3, 4)
+        if await test_client.request_loan(copy_id=copy_id, member_id=member_id)
+    ]
+    assert sorted(collected) == [3, 4]
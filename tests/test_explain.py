@@ -0,0 +1,72 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sjsu_cmpe180b_f25.explain import EXPLAIN_QUERIES, Explain, summarize_plan
+
+PLAN: list[dict[str, Any]] = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Actual Total Time": 4.0,
+            "Actual Rows": 10,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": 90,
+            "Shared Read Blocks": 10,
+            "Plans": [
+                {
+                    "Node Type": "Hash Join",
+                    "Actual Total Time": 3.5,
+                    "Actual Rows": 10,
+                    "Actual Loops": 1,
+                    "Plans": [
+                        {
+                            "Node Type": "Seq Scan",
+                            "Relation Name": "loans",
+                            "Actual Total Time": 2.5,
+                            "Actual Rows": 1000,
+                            "Actual Loops": 1,
+                        },
+                        {
+                            "Node Type": "Index Scan",
+                            "Relation Name": "books",
+                            "Index Name": "books_pkey",
+                            "Actual Total Time": 0.01,
+                            "Actual Rows": 1,
+                            "Actual Loops": 100,
+                        },
+                    ],
+                }
+            ],
+        },
+        "Planning Time": 0.25,
+        "Execution Time": 4.2,
+    }
+]
+
+
+def test_summarize_plan() -> None:
+    """Test summarizing a plan into timings, buffers, and its costliest node."""
+
+    summary = summarize_plan(PLAN)
+
+    assert summary.planning_ms == 0.25
+    assert summary.execution_ms == 4.2
+    assert summary.rows == 10
+    assert (summary.shared_hit_blocks, summary.shared_read_blocks) == (90, 10)
+    assert summary.hit_ratio == 0.9
+    assert summary.costliest_node == "Seq Scan on loans"
+    assert summary.costliest_ms == 2.5
+
+
+def test_explain_compiles_client_query() -> None:
+    """Test that EXPLAIN wraps the Client's own statement and parameters."""
+
+    statement = Explain(EXPLAIN_QUERIES["top-books"](limit=25))
+    dialect = create_async_engine("postgresql+asyncpg://localhost/library").dialect
+    compiled = statement.compile(dialect=dialect)
+
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT")
+    assert "LIMIT $1" in sql
+    assert compiled.params == {"param_1": 25}
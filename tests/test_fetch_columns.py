@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from sjsu_cmpe180b_f25 import queries
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, Loan, LoanStatus
+
+
+async def seed(client: Client) -> None:
+    await client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime(2025, 1, 1),
+    )
+    await client.create_book(book_id=1, title="Test Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    await client.create_loan(
+        copy_id=1,
+        member_id=1,
+        loan_date=datetime(2025, 1, 1, 9, 30),
+        due_date=datetime(2025, 1, 15),
+        return_date=datetime(2025, 1, 10, 12, 0, 0, 250),
+        status=LoanStatus.RETURNED,
+    )
+    await client.create_loan(
+        copy_id=1,
+        member_id=1,
+        loan_date=datetime(2025, 2, 1),
+        due_date=datetime(2025, 2, 15),
+        status=LoanStatus.OVERDUE,
+    )
+    await client.create_fine(
+        member_id=1, loan_id=2, amount=2.5, assessed_at=datetime(2025, 2, 16)
+    )
+    await client.create_fine(
+        member_id=1, loan_id=None, amount=1.25, assessed_at=datetime(2025, 3, 1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_loans_frame(test_client: Client) -> None:
+    """Test loans as typed columns, with NaT for loans still out."""
+
+    await seed(test_client)
+    loans = await test_client.loans_frame(batch_size=1)
+
+    assert loans["loan_id"].dtype == np.int64
+    assert loans["loan_id"].tolist() == [1, 2]
+    assert loans["loan_date"].dtype == np.dtype("datetime64[us]")
+    assert loans["return_date"][0] == np.datetime64("2025-01-10T12:00:00.000250")
+    assert np.isnat(loans["return_date"][1])
+    statuses = list(LoanStatus)
+    assert [statuses[code] for code in loans["status"]] == [
+        LoanStatus.RETURNED,
+        LoanStatus.OVERDUE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fines_frame(test_client: Client) -> None:
+    """Test fines as typed columns, with NaN for a fine without a loan."""
+
+    await seed(test_client)
+    fines = await test_client.fines_frame()
+
+    assert fines["amount"].sum() == 3.75
+    assert fines["paid"].dtype == np.bool_
+    assert not fines["paid"].any()
+    assert fines["loan_id"][0] == 2
+    assert np.isnan(fines["loan_id"][1])
+    assert np.isnat(fines["paid_at"]).all()
+
+
+@pytest.mark.asyncio
+async def test_fetch_columns(test_client: Client) -> None:
+    """Test arbitrary statements, empty results and NULLs in integer columns."""
+
+    await seed(test_client)
+    top = await test_client.fetch_columns(queries.top_books(10))
+    assert top["total_loans"].tolist() == [2]
+    assert top["title"].tolist() == ["Test Book"]
+
+    empty = await test_client.fetch_columns(
+        queries.loan_table().where(Loan.member_id == 2)
+    )
+    assert empty["due_date"].dtype == np.dtype("datetime64[us]")
+    assert len(empty["due_date"]) == 0
+
+    with pytest.raises(ValueError, match="NULLs"):
+        await test_client.fetch_columns(
+            select(func.max(Loan.loan_id).label("last")).where(Loan.member_id == 2)
+        )
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+
+@pytest.mark.asyncio
+async def test_get_member_history_page(test_client: Client) -> None:
+    """Test paging through a member's loan history with cursors."""
+
+    now = datetime.now(tz=None)
+
+    await test_client.create_book(book_id=1, title="Paged Book")
+    await test_client.create_member(
+        member_id=1,
+        name="Paged Member",
+        email="paged@email.com",
+        joined_at=now,
+    )
+
+    # Loans 2 and 3 share a loan_date, so loan_id has to break the tie.
+    loan_dates = [
+        now - timedelta(days=1),
+        now - timedelta(days=2),
+        now - timedelta(days=2),
+        now - timedelta(days=3),
+        now - timedelta(days=4),
+    ]
+    for copy_id, loan_date in enumerate(loan_dates, start=1):
+        await test_client.create_copy(
+            copy_id=copy_id, book_id=1, status=CopyStatus.AVAILABLE
+        )
+        await test_client.create_loan(
+            copy_id=copy_id,
+            member_id=1,
+            loan_date=loan_date,
+            due_date=loan_date + timedelta(days=14),
+            status=LoanStatus.RETURNED,
+            return_date=now,
+        )
+
+    seen: list[int] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        page = await test_client.get_member_history_page(1, limit=2, cursor=cursor)
+        seen.extend(row.loan_id for row in page.rows)
+        pages += 1
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert pages == 3
+    assert seen == [1, 3, 2, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_get_member_history_page_invalid_cursor(test_client: Client) -> None:
+    """Test that a malformed cursor is rejected."""
+
+    with pytest.raises(ValueError):
+        await test_client.get_member_history_page(1, cursor="not-a-cursor")
@@ -0,0 +1,138 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from sjsu_cmpe180b_f25.advisor import Trial, advise, copy_rows_sql
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+CANDIDATES = {
+    "idx_big": "CREATE INDEX IF NOT EXISTS idx_big ON loans (member_id)",
+    "idx_small": "CREATE INDEX IF NOT EXISTS idx_small ON fines (member_id)",
+    "idx_useless": "CREATE INDEX IF NOT EXISTS idx_useless ON loans (copy_id)",
+}
+
+
+def trials() -> tuple[Trial, Trial, dict[str, Trial], dict[str, Trial]]:
+    baseline = Trial(
+        query_ms={"history": 10.0, "fines": 4.0},
+        insert_us={"loans": 5.0, "fines": 3.0},
+    )
+    everything = Trial(query_ms={"history": 2.0, "fines": 1.0})
+    alone = {
+        "idx_big": Trial(
+            query_ms={"history": 2.0, "fines": 4.0},
+            insert_us={"loans": 7.0},
+            sizes={"idx_big": 4 * 2**20},
+        ),
+        "idx_small": Trial(
+            query_ms={"history": 10.0, "fines": 1.0},
+            insert_us={"fines": 4.0},
+            sizes={"idx_small": 2**20},
+        ),
+        "idx_useless": Trial(
+            query_ms={"history": 9.9, "fines": 4.0},
+            insert_us={"loans": 6.0},
+            sizes={"idx_useless": 2**20},
+        ),
+    }
+    without = {
+        "idx_big": Trial(query_ms={"history": 10.0, "fines": 1.0}),
+        "idx_small": Trial(query_ms={"history": 2.0, "fines": 4.0}),
+        "idx_useless": Trial(query_ms={"history": 2.0, "fines": 1.0}),
+    }
+    return baseline, everything, alone, without
+
+
+def test_advise_ranks_by_benefit_per_size() -> None:
+    """Test ranking indexes by marginal time saved per MiB of index."""
+
+    advice = advise(CANDIDATES, *trials(), writes_per_run=0)
+
+    assert [a.name for a in advice] == ["idx_small", "idx_big", "idx_useless"]
+
+    small, big, useless = advice
+    assert (small.table, small.alone_ms, small.marginal_ms) == ("fines", 3.0, 3.0)
+    assert small.write_us == 1.0
+    assert small.helped == ("fines",)
+    assert small.benefit_per_mib == 3.0
+    assert (big.marginal_ms, big.benefit_per_mib, big.helped) == (
+        8.0,
+        2.0,
+        ("history",),
+    )
+    assert big.write_us == 2.0
+    assert useless.marginal_ms == 0.0
+    assert useless.helped == ()
+    assert useless.net_ms == 0.0
+
+
+def test_advise_weighs_write_cost() -> None:
+    """Test that write cost counts against an index, per insert per run."""
+
+    small, big, useless = advise(CANDIDATES, *trials(), writes_per_run=100)
+    assert small.net_ms == 3.0 - 0.1
+    assert big.net_ms == 8.0 - 0.2
+    assert useless.net_ms == -0.1
+
+    # Writes heavy enough to outweigh what the small index saves
+    advice = advise(CANDIDATES, *trials(), writes_per_run=4000)
+    assert [a.name for a in advice] == ["idx_big", "idx_small", "idx_useless"]
+    assert advice[1].net_ms == -1.0
+
+
+def test_advise_unknown_write_cost() -> None:
+    """Test that an unmeasured write cost is reported as unknown, not zero."""
+
+    baseline, everything, alone, without = trials()
+    del baseline.insert_us["fines"]
+    small, big, _ = advise(CANDIDATES, baseline, everything, alone, without)
+
+    assert small.write_us is None
+    assert small.net_ms == small.marginal_ms
+    assert big.write_us == 2.0
+
+
+@pytest.mark.asyncio
+async def test_copy_rows_sql(tmp_path: Path) -> None:
+    """Test that copied rows get fresh keys instead of violating constraints."""
+
+    database = tmp_path / "library.db"
+    client = Client(f"sqlite+aiosqlite:///{database}")
+    await client.create_tables()
+
+    now = datetime(2025, 3, 1)
+    await client.create_member(
+        member_id=7, name="Test Member", email="test@email.com", joined_at=now
+    )
+    await client.create_book(book_id=3, title="Kindred", isbn="9780807083697")
+    await client.create_copy(copy_id=5, book_id=3, status=CopyStatus.AVAILABLE)
+    for return_date in [now, now, None]:
+        await client.create_loan(
+            copy_id=5,
+            member_id=7,
+            loan_date=now,
+            due_date=now,
+            status=LoanStatus.RETURNED if return_date else LoanStatus.ACTIVE,
+            return_date=return_date,
+        )
+
+    await client.dispose()
+
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as conn:
+        for table in ("members", "books", "copies", "loans"):
+            conn.execute(text(copy_rows_sql(table, 1000)))
+
+        members = conn.execute(text("SELECT member_id, email FROM members"))
+        assert sorted(members.tuples()) == [
+            (7, "test@email.com"),
+            (8, "test@email.com-1"),
+        ]
+        books = conn.execute(text("SELECT book_id, isbn FROM books"))
+        assert sorted(books.tuples()) == [(3, "9780807083697"), (4, None)]
+        loans = conn.execute(text("SELECT loan_id FROM loans"))
+        assert sorted(loans.scalars()) == [1, 2, 3, 4, 5]
+    engine.dispose()
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.index import (
+    BTREE_INDEXES,
+    POSTGRES_INDEXES,
+    create_indexes,
+    format_comparison,
+    index_statements,
+)
+
+
+def test_index_statements() -> None:
+    """Test that only PostgreSQL gets the covering, GIN and BRIN indexes."""
+
+    assert index_statements("postgresql") == list(POSTGRES_INDEXES.values())
+    for dialect in ("sqlite", "mysql"):
+        statements = index_statements(dialect)
+        assert statements == list(BTREE_INDEXES.values())
+        assert not any(
+            keyword in sql
+            for sql in statements
+            for keyword in ("INCLUDE", "USING gin", "USING brin")
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_indexes_sqlite(tmp_path: Path) -> None:
+    """Test that the fallback indexes can be created on SQLite."""
+
+    database = tmp_path / "library.db"
+    client = Client(f"sqlite+aiosqlite:///{database}")
+    await client.create_tables()
+    await client.dispose()
+
+    await create_indexes(f"sqlite+aiosqlite:///{database}")
+
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.connect() as conn:
+        names = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars()
+        assert set(BTREE_INDEXES) <= set(names)
+    engine.dispose()
+
+
+def test_format_comparison() -> None:
+    """Test the comparison tables, including a query too fast to time."""
+
+    report = format_comparison(
+        sizes={
+            "B-tree": {"idx_a": 2048, "idx_b": 1024},
+            "Covering+BRIN": {"idx_c": 512},
+        },
+        timings={
+            "B-tree": {"top-books": 4.0, "member-history": 0.5},
+            "Covering+BRIN": {"top-books": 2.0, "member-history": 0.0},
+        },
+        repeats=3,
+    )
+    lines = report.splitlines()
+
+    assert lines[5].split() == ["B-tree", "idx_a", "2.0"]
+    assert lines[7].split() == ["B-tree", "total", "3.0"]
+    assert lines[9].split() == ["Covering+BRIN", "total", "0.5"]
+    assert "Median query time over 3 runs (ms):" in report
+    assert lines[-2].split() == ["top-books", "4.00", "2.00", "2.00x"]
+    assert lines[-1].split() == ["member-history", "0.50", "0.00", "500.00x"]
@@ -0,0 +1,105 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25.benchmarks.load import (
+    BUCKETS_MS,
+    Targets,
+    format_load_report,
+    generate_load,
+    histogram,
+    parse_mix,
+    run_load,
+)
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.population import populate_db
+
+
+def test_parse_mix() -> None:
+    """Test parsing weights and rejecting unknown operations."""
+
+    assert parse_mix("checkout=3, return=1") == {"checkout": 3, "return": 1}
+
+    with pytest.raises(ValueError, match="Invalid mix entry 'renew=1'"):
+        parse_mix("checkout=1,renew=1")
+    with pytest.raises(ValueError, match="weight above 0"):
+        parse_mix("checkout=0")
+
+
+def test_histogram() -> None:
+    """Test bucketing latencies, with a final bucket for the slowest."""
+
+    counts = histogram([0.5, 1.0, 1.5, 30.0, 5000.0])
+
+    assert len(counts) == len(BUCKETS_MS) + 1
+    assert counts[:3] == [2, 1, 0]
+    assert counts[BUCKETS_MS.index(50)] == 1
+    assert counts[-1] == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_load(test_client: Client) -> None:
+    """Test that every drawn operation is timed, rejected, skipped or failed."""
+
+    await populate_db(
+        test_client,
+        num_authors=5,
+        num_books=5,
+        num_members=5,
+        copies_per_book=2,
+        num_loans=0,
+    )
+    targets = Targets(
+        copies=list(range(1, 6)), members=[1, 2], open_loans=[], unpaid_fines=[]
+    )
+
+    stats = await generate_load(
+        test_client,
+        targets,
+        {"checkout": 2, "return": 2, "pay-fine": 1, "report": 1},
+        # The in-memory database is one shared connection, so one worker
+        workers=1,
+        operations=60,
+    )
+
+    drawn = sum(
+        len(op.latencies_ms) + op.skipped + op.errors.total()
+        for op in stats.operations.values()
+    )
+    assert drawn == 60
+    assert stats.operations["pay-fine"].latencies_ms == []
+    assert stats.operations["pay-fine"].skipped > 0
+    assert all(op.errors.total() == 0 for op in stats.operations.values())
+    assert stats.throughput > 0
+    assert "ops/s" in format_load_report(stats)
+
+
+@pytest.mark.asyncio
+async def test_run_load_restores_logging(tmp_path: Path) -> None:
+    """Test that quieting the Client during a run doesn't outlast it."""
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'load.db'}"
+    client = Client(url)
+    await client.create_tables()
+    await populate_db(
+        client,
+        num_authors=2,
+        num_books=2,
+        num_members=2,
+        copies_per_book=1,
+        num_loans=0,
+    )
+    await client.dispose()
+
+    client_logger = logging.getLogger("sjsu_cmpe180b_f25.client")
+    client_logger.setLevel(logging.INFO)
+    try:
+        # Copies and members always exist, so every checkout draw makes a call
+        stats = await run_load(
+            url, mix={"checkout": 1}, workers=1, duration=None, operations=5
+        )
+        assert client_logger.level == logging.INFO
+    finally:
+        client_logger.setLevel(logging.NOTSET)
+    assert len(stats.operations["checkout"].latencies_ms) == 5
@@ -0,0 +1,81 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+
+async def create_fines(client: Client, now: datetime) -> None:
+    for member_id in (1, 2):
+        await client.create_member(
+            member_id=member_id,
+            name=f"Member {member_id}",
+            email=f"member{member_id}@email.com",
+            joined_at=now,
+        )
+    await client.create_book(book_id=1, title="Fined Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    await client.create_loan(
+        copy_id=1,
+        member_id=1,
+        loan_date=now,
+        due_date=now,
+        status=LoanStatus.ACTIVE,
+    )
+
+    for amount in (10.00, 2.50, 4.00):
+        await client.create_fine(member_id=1, loan_id=1, amount=amount, assessed_at=now)
+    await client.create_fine(
+        member_id=2, loan_id=1, amount=8.00, assessed_at=now, paid=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_member_balances_follow_fines(test_client: Client) -> None:
+    """Test that creating and paying fines keeps member balances in step."""
+
+    now = datetime.now(tz=None)
+    await create_fines(test_client, now)
+
+    assert await test_client.pay_fine(fine_id=2) is True
+
+    results = await test_client.get_unpaid_fines_members()
+    assert [tuple(row) for row in results] == [
+        (1, "Member 1", "member1@email.com", 14.00, 2),
+    ]
+    assert [
+        tuple(row) for row in await test_client.get_unpaid_fines_members(15.0)
+    ] == []
+    assert await test_client.check_member_balances() == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_member_balances(tmp_path: Path) -> None:
+    """Test that drift is detected and repaired by a rebuild."""
+
+    database = tmp_path / "balances.db"
+    client = Client(f"sqlite+aiosqlite:///{database}")
+    await client.create_tables()
+
+    now = datetime.now(tz=None)
+    await create_fines(client, now)
+
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE member_balances SET unpaid_total = 1.00"))
+        conn.execute(text("DELETE FROM member_balances WHERE member_id = 2"))
+    engine.dispose()
+
+    drift = await client.check_member_balances()
+    assert [tuple(row) for row in drift] == [
+        (1, 1.00, 3, 16.50, 3),
+        (2, None, None, 0.0, 0),
+    ]
+
+    assert await client.rebuild_member_balances() == 2
+    assert await client.check_member_balances() == []
+
+    await client.dispose()
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from sjsu_cmpe180b_f25.cache import ReportCache
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.metrics import Histogram, MetricsRegistry, serve_metrics
+
+
+def samples(text: str) -> dict[str, float]:
+    return {
+        name: float(value)
+        for name, value in (
+            line.rsplit(" ", 1)
+            for line in text.splitlines()
+            if not line.startswith("#")
+        )
+    }
+
+
+def test_histogram_render() -> None:
+    """Test that bucket counts are rendered cumulatively."""
+
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.render("latency", 'method="m"') == [
+        'latency_bucket{method="m",le="0.1"} 2',
+        'latency_bucket{method="m",le="1"} 3',
+        'latency_bucket{method="m",le="+Inf"} 4',
+        'latency_sum{method="m"} 3.65',
+        'latency_count{method="m"} 4',
+    ]
+
+
+def test_metrics_register_methods() -> None:
+    """Test that every instrumented method is exported before it is called."""
+
+    exported = samples(MetricsRegistry().render())
+
+    for method in ("get_genre_fine_statistics", "request_loan"):
+        assert exported[f'library_client_calls_total{{method="{method}"}}'] == 0
+        assert (
+            exported[f'library_client_call_duration_seconds_count{{method="{method}"}}']
+            == 0
+        )
+
+
+@pytest.mark.asyncio
+async def test_client_metrics() -> None:
+    """Test that calls, errors and cache lookups are counted."""
+
+    metrics = MetricsRegistry()
+    client = Client(
+        "sqlite+aiosqlite:///:memory:", cache=ReportCache(), metrics=metrics
+    )
+    await client.create_tables()
+
+    await client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime(2025, 1, 1),
+    )
+    await client.get_top_books()
+    await client.get_top_books()
+    with pytest.raises(ValueError):
+        await client.get_member_history_page(1, cursor="not a cursor")
+
+    exported = samples(metrics.render())
+    await client.dispose()
+
+    assert exported['library_client_calls_total{method="create_member"}'] == 1
+    assert exported['library_client_calls_total{method="get_top_books"}'] == 2
+    assert (
+        exported[
+            'library_client_errors_total{method="get_member_history_page",'
+            'error="ValueError"}'
+        ]
+        == 1
+    )
+    assert (
+        exported[
+            'library_client_call_duration_seconds_bucket{method="get_top_books",'
+            'le="+Inf"}'
+        ]
+        == 2
+    )
+    # The failed history lookup missed the cache before it raised
+    assert exported["library_cache_hits_total"] == 1
+    assert exported["library_cache_misses_total"] == 2
+    assert exported["library_cache_hit_ratio"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_serve_metrics() -> None:
+    """Test serving the registry on /metrics and nothing else."""
+
+    metrics = MetricsRegistry()
+    metrics.observe_call("get_top_books", 0.01)
+    server = await serve_metrics(metrics, 0, host="127.0.0.1")
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    try:
+        ok = await get("/metrics")
+        missing = await get("/")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert ok.startswith(b"HTTP/1.1 200 OK")
+    assert b'library_client_calls_total{method="get_top_books"} 1' in ok
+    assert missing.startswith(b"HTTP/1.1 404 Not Found")
@@ -0,0 +1,94 @@
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25 import queries
+from sjsu_cmpe180b_f25.partition import (
+    ARCHIVE_STATEMENTS,
+    BOUND_PATTERN,
+    FINALIZE_STATEMENTS,
+    INTEGRITY_STATEMENTS,
+    PARTITION_STATEMENTS,
+    month_start,
+    next_month,
+    partition_loans,
+    partition_name,
+)
+
+
+def test_months() -> None:
+    """Test month arithmetic, including across a year end."""
+
+    assert month_start(date(2025, 3, 17)) == date(2025, 3, 1)
+    assert next_month(date(2025, 3, 1)) == date(2025, 4, 1)
+    assert next_month(date(2025, 11, 1)) == date(2025, 12, 1)
+    assert next_month(date(2025, 12, 1)) == date(2026, 1, 1)
+    assert partition_name(date(2026, 1, 1)) == "loans_p2026_01"
+
+
+def test_bound_pattern() -> None:
+    """Test parsing the bounds Postgres reports for a range partition."""
+
+    bound = "FOR VALUES FROM ('2025-12-01 00:00:00') TO ('2026-01-01 00:00:00')"
+    match = BOUND_PATTERN.search(bound)
+    assert match is not None
+    lower, upper = match.groups()
+    assert datetime.fromisoformat(lower) == datetime(2025, 12, 1)
+    assert datetime.fromisoformat(upper).date() == date(2026, 1, 1)
+
+    assert BOUND_PATTERN.search("DEFAULT") is None
+
+
+def test_statements() -> None:
+    """Test that partitioning keeps the partition key in every unique index
+    and replaces the constraints it has to drop with triggers."""
+
+    assert PARTITION_STATEMENTS[0].startswith(
+        "ALTER TABLE fines DROP CONSTRAINT IF EXISTS fines_loan_id_fkey"
+    )
+    assert "PARTITION BY RANGE (loan_date)" in PARTITION_STATEMENTS[2]
+    assert "PRIMARY KEY (loan_id, loan_date)" in PARTITION_STATEMENTS[3]
+    assert PARTITION_STATEMENTS[-1].endswith("PARTITION OF loans DEFAULT")
+
+    # Rows are copied before the old table is dropped
+    assert FINALIZE_STATEMENTS[0].startswith("INSERT INTO loans SELECT")
+    assert FINALIZE_STATEMENTS.index("DROP TABLE loans_unpartitioned") > 0
+    assert "(copy_id, loan_date) WHERE return_date IS NULL" in FINALIZE_STATEMENTS[-1]
+
+    assert all("IF NOT EXISTS" in sql for sql in ARCHIVE_STATEMENTS)
+
+    triggers = [
+        sql for sql in INTEGRITY_STATEMENTS if "CREATE OR REPLACE TRIGGER" in sql
+    ]
+    assert [sql.split()[4] for sql in triggers] == [
+        "loans_one_open_per_copy",
+        "fines_loan_exists",
+    ]
+    assert "FOR UPDATE" in INTEGRITY_STATEMENTS[0]
+    assert "loans_archive" in INTEGRITY_STATEMENTS[2]
+
+
+def test_pruning_bounds() -> None:
+    """Test that hot loan queries bound loan_date so partitions can be pruned."""
+
+    now = datetime(2026, 3, 1)
+    unbounded = str(queries.overdue_members(now))
+    bounded = str(queries.overdue_members(now, datetime(2026, 1, 15)))
+    assert "loans.loan_date >=" not in unbounded
+    assert "loans.loan_date >=" in bounded
+
+    first_page = str(queries.member_history(1, 10))
+    next_page = str(queries.member_history(1, 10, (now, 5)))
+    assert "loans.loan_date <=" not in first_page
+    assert "loans.loan_date <=" in next_page
+
+
+@pytest.mark.asyncio
+async def test_partition_requires_postgres(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that partitioning leaves other databases alone."""
+
+    await partition_loans(f"sqlite+aiosqlite:///{tmp_path / 'library.db'}")
+    assert "requires PostgreSQL" in caplog.text
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, HoldStatus
+
+
+async def create_held_book(client: Client, members: int) -> None:
+    await client.create_book(book_id=1, title="Popular Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    for member_id in range(1, members + 1):
+        await client.create_member(
+            member_id=member_id,
+            name=f"Member {member_id}",
+            email=f"member{member_id}@email.com",
+            joined_at=datetime.now(tz=None),
+        )
+
+
+@pytest.mark.asyncio
+async def test_place_hold(test_client: Client) -> None:
+    """Test that a member can join a book's hold queue once."""
+
+    await create_held_book(test_client, members=1)
+
+    hold = await test_client.place_hold(book_id=1, member_id=1)
+
+    assert hold is not None
+    assert hold.status == HoldStatus.WAITING
+    assert hold.copy_id is None
+
+    assert await test_client.place_hold(book_id=1, member_id=1) is None
+
+
+@pytest.mark.asyncio
+async def test_holds_filled_in_order(test_client: Client) -> None:
+    """Test that returned copies go to holds first come, first served."""
+
+    await create_held_book(test_client, members=3)
+    loan = await test_client.request_loan(copy_id=1, member_id=1)
+    assert loan is not None
+
+    first = await test_client.place_hold(book_id=1, member_id=2)
+    second = await test_client.place_hold(book_id=1, member_id=3)
+    assert first is not None
+    assert second is not None
+
+    assert await test_client.end_loan(loan_id=loan.loan_id) is True
+
+    # The copy is set aside for the first hold, not the second.
+    assert await test_client.request_loan(copy_id=1, member_id=3) is None
+    loan = await test_client.request_loan(copy_id=1, member_id=2)
+    assert loan is not None
+
+    assert await test_client.end_loan(loan_id=loan.loan_id) is True
+    assert await test_client.request_loan(copy_id=1, member_id=3) is not None
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.pool import PoolMonitor
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(tmp_path: Path) -> None:
+    """Test that checkouts, pre-pings and hold times are recorded."""
+
+    monitor = PoolMonitor()
+    client = Client(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_monitor=monitor)
+    await client.create_tables()
+    await client.get_top_books()
+    await client.get_top_books()
+    await client.dispose()
+
+    stats = monitor.stats
+    assert stats.connects == 1
+    assert stats.checkouts == stats.checkins == 3
+    assert len(stats.wait_ms) == len(stats.hold_ms) == len(stats.age_s) == 3
+    # Only connections coming back out of the pool are pinged
+    assert stats.pings == 2
+    assert stats.ping_failures == 0
+    assert stats.peak_checked_out == 1
+    assert stats.capacity == 15
+    assert "Pre-ping cost" in monitor.summary()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_failed_ping(tmp_path: Path) -> None:
+    """Test that a connection that died in the pool is counted and replaced."""
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_pre_ping=True
+    )
+    monitor = PoolMonitor()
+    monitor.attach(engine.sync_engine)
+
+    async with engine.connect() as conn:
+        dead = (await conn.get_raw_connection()).driver_connection
+    assert dead is not None
+    await dead.close()
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    stats = monitor.stats
+    assert stats.pings == 1
+    assert stats.ping_failures == 1
+    assert stats.connects == 2
+    assert sum(stats.invalidations.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_after_dispose(tmp_path: Path) -> None:
+    """Test that checkouts are still timed from the pool a dispose puts in place."""
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    monitor = PoolMonitor()
+    monitor.attach(engine.sync_engine)
+
+    for _ in range(2):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    stats = monitor.stats
+    assert stats.checkouts == 2
+    assert len(stats.wait_ms) == 2
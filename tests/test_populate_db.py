@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from sjsu_cmpe180b_f25.client import Client
@@ -16,3 +18,27 @@ async def test_populate_db(test_client: Client) -> None:
         copies_per_book=2,
         num_loans=10,
     )
+
+
+@pytest.mark.asyncio
+async def test_populate_db_seeded() -> None:
+    """Test that a seeded generator repeats the data without touching the global one."""
+
+    state = random.getstate()
+    reports = []
+    for _ in range(2):
+        client = Client("sqlite+aiosqlite:///:memory:")
+        await populate_db(
+            client,
+            num_authors=10,
+            num_books=10,
+            num_members=10,
+            copies_per_book=2,
+            num_loans=10,
+            rng=random.Random(7),
+        )
+        reports.append(await client.get_copies_on_loan(100))
+        await client.dispose()
+
+    assert reports[0] == reports[1]
+    assert random.getstate() == state
@@ -0,0 +1,67 @@
+import pstats
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.profiling import CallProfiler, profile_to
+
+
+@pytest.mark.asyncio
+async def test_call_profiler() -> None:
+    """Test that each call's wall time is split into pool, database and Python."""
+
+    call_profiler = CallProfiler()
+    client = Client("sqlite+aiosqlite:///:memory:", call_profiler=call_profiler)
+    await client.create_tables()
+    await client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime(2025, 1, 1),
+    )
+    await client.get_top_books()
+    await client.get_top_books()
+    await client.dispose()
+
+    timings = {t.method: t for t in call_profiler.timings}
+    assert timings["get_top_books"].calls == 2
+    assert timings["create_member"].calls == 1
+    for timing in timings.values():
+        assert timing.sql_ms > 0
+        assert timing.checkout_ms > 0
+        assert timing.checkout_ms + timing.sql_ms <= timing.wall_ms
+    assert "get_top_books" in call_profiler.summary()
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profile_to_collapsed(tmp_path: Path) -> None:
+    """Test that .folded output is sampled stacks ending in the busy frame."""
+
+    path = tmp_path / "run.folded"
+    stop = profile_to(path)
+    busy(0.2)
+    stop()
+
+    stacks = dict(line.rsplit(" ", 1) for line in path.read_text().splitlines())
+    assert stacks
+    assert any(stack.endswith("test_profile_out.py:busy") for stack in stacks)
+
+
+def test_profile_to_pstats(tmp_path: Path) -> None:
+    """Test that other suffixes get cProfile stats."""
+
+    path = tmp_path / "run.pstats"
+    stop = profile_to(path)
+    busy(0.01)
+    stop()
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}  # type: ignore[attr-defined]
+    assert "busy" in functions
@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus
+from sjsu_cmpe180b_f25.profiling import SqlProfiler
+
+
+@pytest.mark.asyncio
+async def test_profile_sql(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that statements are timed and attributed to the Client method."""
+
+    profiler = SqlProfiler(slow_ms=0.0)
+    client = Client("sqlite+aiosqlite:///:memory:", profiler=profiler)
+    await client.create_tables()
+
+    await client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime(2025, 1, 1),
+    )
+    await client.create_book(book_id=1, title="Test Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+
+    with caplog.at_level(logging.WARNING, logger="sjsu_cmpe180b_f25.profiling"):
+        await client.request_loan(copy_id=1, member_id=1)
+        await client.get_top_books()
+        await client.get_top_books()
+
+    await client.dispose()
+
+    by_caller: dict[str, list[str]] = {}
+    for stats in profiler.stats:
+        by_caller.setdefault(stats.caller, []).append(stats.statement)
+
+    assert any(s.startswith("INSERT INTO members") for s in by_caller["create_member"])
+    assert any(s.startswith("INSERT INTO loans") for s in by_caller["request_loan"])
+    assert any(s.startswith("UPDATE copies") for s in by_caller["request_loan"])
+
+    [top_books] = [s for s in profiler.stats if s.caller == "get_top_books"]
+    assert top_books.calls == 2
+    assert top_books.total_ms >= top_books.max_ms > 0
+    assert top_books.slow == 2
+
+    loan_insert = next(
+        s
+        for s in profiler.stats
+        if s.caller == "request_loan" and s.statement.startswith("INSERT")
+    )
+    assert loan_insert.rows == 1
+
+    slow = [r.message for r in caplog.records]
+    assert any(m.startswith("Slow query") and "in get_top_books" in m for m in slow)
+    assert "get_top_books" in profiler.summary()
@@ -0,0 +1,122 @@
+from collections.abc import AsyncGenerator
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from sjsu_cmpe180b_f25.cache import ReportCache
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def cached_client() -> AsyncGenerator[tuple[Client, FakeClock]]:
+    """Create a client with a report cache driven by a fake clock."""
+    clock = FakeClock()
+    client = Client(
+        "sqlite+aiosqlite:///:memory:",
+        cache=ReportCache(max_entries=2, clock=clock),
+    )
+    await client.create_tables()
+
+    await client.create_book(book_id=1, title="Cached Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    await client.create_member(
+        member_id=1,
+        name="Cache Member",
+        email="cache@email.com",
+        joined_at=datetime.now(tz=None),
+    )
+
+    yield client, clock
+
+    await client.dispose()
+
+
+@pytest.mark.asyncio
+async def test_report_cache_hit(cached_client: tuple[Client, FakeClock]) -> None:
+    """Test that repeated identical reports are served from the cache."""
+
+    client, _ = cached_client
+    assert client.cache is not None
+
+    first = await client.get_top_books(10)
+    second = await client.get_top_books(limit=10)
+
+    assert first == second
+    assert client.cache.stats().hits == 1
+    assert client.cache.stats().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_report_cache_copies(cached_client: tuple[Client, FakeClock]) -> None:
+    """Test that mutating a cached report doesn't change later hits."""
+
+    client, _ = cached_client
+    assert await client.request_loan(copy_id=1, member_id=1) is not None
+
+    first = await client.get_top_books(10)
+    first.clear()
+    second = await client.get_top_books(10)
+
+    assert [tuple(row) for row in second] == [(1, "Cached Book", 1)]
+
+
+@pytest.mark.asyncio
+async def test_report_cache_invalidated_by_loan(
+    cached_client: tuple[Client, FakeClock],
+) -> None:
+    """Test that circulation writes invalidate the reports that read loans."""
+
+    client, _ = cached_client
+
+    assert [tuple(row) for row in await client.get_top_books()] == []
+
+    loan = await client.request_loan(copy_id=1, member_id=1)
+    assert loan is not None
+
+    assert [tuple(row) for row in await client.get_top_books()] == [
+        (1, "Cached Book", 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_report_cache_ttl(cached_client: tuple[Client, FakeClock]) -> None:
+    """Test that cached reports expire after their TTL."""
+
+    client, clock = cached_client
+    assert client.cache is not None
+
+    await client.get_overdue_members()
+    clock.now += client.cache.ttl_for("get_overdue_members")
+    await client.get_overdue_members()
+
+    assert client.cache.stats().hits == 0
+    assert client.cache.stats().misses == 2
+
+
+@pytest.mark.asyncio
+async def test_report_cache_lru_bound(cached_client: tuple[Client, FakeClock]) -> None:
+    """Test that the least recently used report is evicted when full."""
+
+    client, _ = cached_client
+    assert client.cache is not None
+
+    await client.get_top_books(1)
+    await client.get_top_books(2)
+    await client.get_top_books(1)
+    await client.get_top_books(3)
+    await client.get_top_books(1)
+
+    stats = client.cache.stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+    assert stats.hits == 2
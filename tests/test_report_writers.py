@@ -0,0 +1,158 @@
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+from sjsu_cmpe180b_f25.reports import (
+    CsvWriter,
+    JsonLinesWriter,
+    JsonWriter,
+    StreamWriter,
+    member_history_report,
+    overdue_members_report,
+    run_reports,
+    search_report,
+    top_books_report,
+    unpaid_fines_members_report,
+)
+
+
+async def create_overdue_member(client: Client) -> datetime:
+    due = datetime(2025, 3, 1, 9, 30)
+
+    await client.create_member(
+        member_id=1,
+        name="Late Member",
+        email="late@email.com",
+        joined_at=due,
+    )
+    await client.create_book(book_id=1, title="Late Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.ON_LOAN)
+    await client.create_loan(
+        copy_id=1,
+        member_id=1,
+        loan_date=due - timedelta(days=14),
+        due_date=due,
+        status=LoanStatus.ACTIVE,
+    )
+    await client.create_fine(member_id=1, loan_id=1, amount=2.5, assessed_at=due)
+    await client.create_fine(member_id=1, loan_id=1, amount=0.1, assessed_at=due)
+
+    return due
+
+
+@pytest.mark.asyncio
+async def test_json_lines_writer(test_client: Client) -> None:
+    """Test that JSON lines carry typed values and their report's name."""
+
+    due = await create_overdue_member(test_client)
+    stream = io.StringIO()
+
+    await run_reports(
+        [
+            overdue_members_report(test_client),
+            unpaid_fines_members_report(test_client, 0.0),
+        ],
+        writer=JsonLinesWriter(stream),
+    )
+
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {
+            "report": "overdue-members",
+            "member_id": 1,
+            "name": "Late Member",
+            "email": "late@email.com",
+            "overdue_count": 1,
+            "earliest_due_date": due.isoformat(),
+        },
+        {
+            "report": "unpaid-fines-members",
+            "member_id": 1,
+            "name": "Late Member",
+            "email": "late@email.com",
+            "total_unpaid": "2.60",
+            "unpaid_fine_count": 2,
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_json_writer(test_client: Client) -> None:
+    """Test that the JSON writer produces one document keyed by report."""
+
+    await create_overdue_member(test_client)
+    stream = io.StringIO()
+
+    await run_reports(
+        [
+            top_books_report(test_client, 5),
+            unpaid_fines_members_report(test_client, 10),
+        ],
+        writer=JsonWriter(stream),
+    )
+
+    assert json.loads(stream.getvalue()) == {
+        "top-books": [{"book_id": 1, "title": "Late Book", "total_loans": 1}],
+        "unpaid-fines-members": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_csv_writer(test_client: Client) -> None:
+    """Test that each report gets its own CSV header."""
+
+    await create_overdue_member(test_client)
+    stream = io.StringIO()
+
+    await run_reports(
+        [top_books_report(test_client, 5), unpaid_fines_members_report(test_client, 0)],
+        writer=CsvWriter(stream),
+    )
+
+    assert stream.getvalue() == (
+        "book_id,title,total_loans\n"
+        "1,Late Book,1\n"
+        "\n"
+        "member_id,name,email,total_unpaid,unpaid_fine_count\n"
+        "1,Late Member,late@email.com,2.60,2\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_and_history_reports(test_client: Client) -> None:
+    """Test that search results and member history follow the output format."""
+
+    due = await create_overdue_member(test_client)
+    history = await test_client.get_member_history_page(1, limit=10)
+    stream = io.StringIO()
+
+    await run_reports(
+        [
+            search_report(test_client, "late", 5),
+            member_history_report(1, history, {1: "Late Book"}),
+        ],
+        writer=CsvWriter(stream),
+    )
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "book_id,title,authors,rank"
+    assert lines[1].startswith("1,Late Book,,")
+    assert lines[2:] == [
+        "",
+        "loan_id,copy_id,loan_date,due_date,status,title",
+        f"1,1,{(due - timedelta(days=14)).isoformat()},{due.isoformat()},active,"
+        "Late Book",
+    ]
+
+
+def test_writers_must_write() -> None:
+    """Test that a writer has to implement how it writes rows."""
+
+    class Incomplete(StreamWriter):
+        pass
+
+    with pytest.raises(TypeError, match="write_row"):
+        Incomplete()  # type: ignore[abstract]
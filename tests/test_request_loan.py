@@ -63,3 +63,30 @@ async def test_concurrent_request_loan(test_client: Client) -> None:
     results = await asyncio.gather(*tasks, return_exceptions=True)
     successful_loans = [res for res in results if res is not None]
     assert len(successful_loans) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_loan_after_return(test_client: Client) -> None:
+    """Test that a copy can be loaned again once its previous loan ends."""
+
+    await test_client.create_book(book_id=1, title="Test Book")
+    await test_client.create_copy(copy_id=1, book_id=1, status=CopyStatus.AVAILABLE)
+    await test_client.create_member(
+        member_id=1,
+        name="Repeat Member",
+        email="repeat@email.com",
+        joined_at=datetime.now(tz=None),
+    )
+
+    first = await test_client.request_loan(copy_id=1, member_id=1)
+    assert first is not None
+    assert await test_client.request_loan(copy_id=1, member_id=1) is None
+
+    assert await test_client.end_loan(loan_id=first.loan_id) is True
+
+    second = await test_client.request_loan(copy_id=1, member_id=1)
+    assert second is not None
+    assert second.loan_id != first.loan_id
+
+    top_books = await test_client.get_top_books()
+    assert [tuple(row) for row in top_books] == [(1, "Test Book", 2)]
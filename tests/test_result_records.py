@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from sjsu_cmpe180b_f25.benchmarks import format_record_costs, measure_records
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+from sjsu_cmpe180b_f25.records import LoanHistory, OverdueMember, TopBook
+
+
+async def seed(client: Client) -> None:
+    await client.create_tables()
+    await client.create_member(
+        member_id=1,
+        name="Test Member",
+        email="test@email.com",
+        joined_at=datetime(2025, 1, 1),
+    )
+    await client.create_book(book_id=1, title="Test Book")
+    await client.create_copy(copy_id=1, book_id=1, status=CopyStatus.ON_LOAN)
+    await client.create_loan(
+        copy_id=1,
+        member_id=1,
+        loan_date=datetime.now() - timedelta(days=30),
+        due_date=datetime.now() - timedelta(days=16),
+        status=LoanStatus.OVERDUE,
+    )
+
+
+@pytest.mark.asyncio
+async def test_result_records(test_client: Client) -> None:
+    """Test that report methods return typed records that still unpack."""
+
+    await seed(test_client)
+
+    [top] = await test_client.get_top_books()
+    assert isinstance(top, TopBook)
+    assert top.title == "Test Book"
+    book_id, title, total_loans = top
+    assert (book_id, title, total_loans) == (1, "Test Book", 1)
+    assert not hasattr(top, "__dict__")
+
+    [overdue] = await test_client.get_overdue_members()
+    assert isinstance(overdue, OverdueMember)
+    assert overdue.overdue_count == 1
+
+    [history] = await test_client.get_member_history(1)
+    assert isinstance(history, LoanHistory)
+    assert history.status is LoanStatus.OVERDUE
+
+    batches = [b async for b in test_client.stream_member_history(1, batch_size=1)]
+    assert batches == [[history]]
+
+
+@pytest.mark.asyncio
+async def test_measure_records(tmp_path: Path) -> None:
+    """Test that records are measured holding less than Rows."""
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'records.db'}"
+    client = Client(url)
+    await seed(client)
+    await client.dispose()
+
+    costs = {cost.query: cost for cost in await measure_records(url, repeats=1)}
+
+    # No fines, so no members with unpaid fines
+    assert set(costs) == {"top-books", "overdue-members", "copies-on-loan"}
+    for cost in costs.values():
+        assert cost.rows == 1
+        assert cost.record_bytes < cost.row_bytes
+        assert cost.row_build_us > 0 and cost.record_build_us > 0
+    assert "top-books" in format_record_costs(list(costs.values()))
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import pytest
+
+from sjsu_cmpe180b_f25.reports import Report, run_reports
+
+
+class Tracker:
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+
+
+def slow_report(
+    name: str, delay: float, batches: int, tracker: Tracker, fail: bool = False
+) -> Report:
+    async def rows() -> AsyncIterator[Sequence[tuple[Any, ...]]]:
+        tracker.running += 1
+        tracker.peak = max(tracker.peak, tracker.running)
+        try:
+            for batch in range(batches):
+                await asyncio.sleep(delay)
+                if fail:
+                    raise RuntimeError(f"{name} failed")
+                yield [f"{name}-{batch}"]  # type: ignore[list-item]
+        finally:
+            tracker.running -= 1
+
+    return Report(
+        name=name,
+        description=f"Running {name}...",
+        header=[f"== {name} =="],
+        format_row=str,
+        batches=rows,
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_reports_in_order(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that reports run concurrently but print in the order given."""
+
+    tracker = Tracker()
+    reports = [
+        slow_report("slow", 0.05, 2, tracker),
+        slow_report("fast", 0.0, 3, tracker),
+        slow_report("empty", 0.0, 0, tracker),
+    ]
+
+    with caplog.at_level(logging.INFO, logger="sjsu_cmpe180b_f25.reports"):
+        await run_reports(reports, max_concurrency=3)
+
+    output = [r.message for r in caplog.records if not r.message.startswith("Running")]
+    assert output == [
+        "== slow ==\nslow-0",
+        "slow-1",
+        "== fast ==\nfast-0",
+        "fast-1",
+        "fast-2",
+        "== empty ==",
+    ]
+    assert tracker.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_run_reports_max_concurrency() -> None:
+    """Test that no more than the allowed number of reports run at once."""
+
+    tracker = Tracker()
+    reports = [slow_report(f"r{i}", 0.01, 2, tracker) for i in range(5)]
+
+    await run_reports(reports, max_concurrency=2)
+
+    assert tracker.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_reports_failure() -> None:
+    """Test that a failing report raises and stops the others."""
+
+    tracker = Tracker()
+    reports = [
+        slow_report("ok", 0.0, 1, tracker),
+        slow_report("broken", 0.0, 1, tracker, fail=True),
+        slow_report("long", 10.0, 1, tracker),
+    ]
+
+    with pytest.raises(RuntimeError, match="broken failed"):
+        await run_reports(reports, max_concurrency=3)
+
+    await asyncio.sleep(0)
+    assert tracker.running == 0
@@ -0,0 +1,62 @@
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+
+
+async def create_catalog(client: Client) -> None:
+    await client.create_author(id=1, name="Ursula K. Le Guin")
+    await client.create_author(id=2, name="Frank Herbert")
+
+    books = {
+        1: ("The Left Hand of Darkness", 1),
+        2: ("A Wizard of Earthsea", 1),
+        3: ("Dune", 2),
+        4: ("Dune Messiah", 2),
+        5: ("100% Wizard", None),
+    }
+    for book_id, (title, author_id) in books.items():
+        await client.create_book(book_id=book_id, title=title)
+        if author_id is not None:
+            await client.create_book_author(book_id=book_id, author_id=author_id)
+
+
+@pytest.mark.asyncio
+async def test_search_books_by_title(test_client: Client) -> None:
+    """Test that titles match case-insensitively, prefix matches first."""
+
+    await create_catalog(test_client)
+
+    results = await test_client.search_books("dune")
+    assert [tuple(row) for row in results] == [
+        (3, "Dune", "Frank Herbert", 1.0),
+        (4, "Dune Messiah", "Frank Herbert", 1.0),
+    ]
+
+    results = await test_client.search_books("WIZARD")
+    assert [row.book_id for row in results] == [5, 2]
+
+
+@pytest.mark.asyncio
+async def test_search_books_by_author(test_client: Client) -> None:
+    """Test that books are found by an author's name."""
+
+    await create_catalog(test_client)
+
+    results = await test_client.search_books("le guin", limit=1)
+    assert [(row.book_id, row.authors) for row in results] == [
+        (2, "Ursula K. Le Guin"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_books_escapes_wildcards(test_client: Client) -> None:
+    """Test that LIKE wildcards in a query are matched literally."""
+
+    await create_catalog(test_client)
+
+    results = await test_client.search_books("100%")
+    assert [(row.book_id, row.authors) for row in results] == [(5, None)]
+
+    results = await test_client.search_books("%")
+    assert [tuple(row) for row in results] == [(5, "100% Wizard", None, 0.5)]
+    assert await test_client.search_books("   ") == []
@@ -0,0 +1,116 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+from sjsu_cmpe180b_f25.snapshot import Snapshot, export_snapshot
+
+
+async def seed(client: Client) -> None:
+    now = datetime(2025, 3, 1)
+    await client.create_member(
+        member_id=1, name="Test Member", email="test@email.com", joined_at=now
+    )
+
+    # Tied titles and loan counts, and a book without a genre
+    books = [
+        (1, "Zebra", "Fiction"),
+        (2, "apple", "Fiction"),
+        (3, "Apple", None),
+        (4, "Apple", "Mystery"),
+        (5, "Unread", "Poetry"),
+    ]
+    for book_id, title, genre in books:
+        await client.create_book(book_id=book_id, title=title, genre=genre)
+
+    copy_books = [1, 1, 2, 3, 4, 4, 4, 5]
+    for copy_id, book_id in enumerate(copy_books, start=1):
+        status = CopyStatus.ON_LOAN if copy_id % 2 else CopyStatus.AVAILABLE
+        await client.create_copy(copy_id=copy_id, book_id=book_id, status=status)
+
+    for loan_id, copy_id in enumerate([1, 2, 3, 4, 5, 6, 1], start=1):
+        await client.create_loan(
+            loan_id=loan_id,
+            copy_id=copy_id,
+            member_id=1,
+            loan_date=now,
+            due_date=now,
+            status=LoanStatus.RETURNED,
+            return_date=now,
+        )
+
+    # Amounts whose float sums depend on the order they are added in
+    fines = [(1, 0.1), (2, 0.2), (3, 0.7), (4, 0.3), (5, 1.1), (6, 2.2), (None, 9.99)]
+    for fine_id, (fined_loan, amount) in enumerate(fines, start=1):
+        await client.create_fine(
+            fine_id=fine_id,
+            member_id=1,
+            loan_id=fined_loan,
+            amount=amount,
+            assessed_at=now,
+        )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_matches_sql(test_client: Client, tmp_path: Path) -> None:
+    """Test that snapshot reports equal the SQL reports on the same data."""
+
+    await seed(test_client)
+    rows = await export_snapshot(test_client, tmp_path)
+    assert rows == {"books": 5, "copies": 8, "loans": 7, "fines": 7}
+
+    snapshot = Snapshot.load(tmp_path)
+    assert isinstance(snapshot.loans["loan_id"], np.memmap)
+
+    for limit in (2, 10):
+        assert snapshot.top_books(limit) == await test_client.get_top_books(limit)
+        assert snapshot.copies_on_loan(limit) == await test_client.get_copies_on_loan(
+            limit
+        )
+    assert (
+        snapshot.genre_fine_statistics()
+        == await test_client.get_genre_fine_statistics()
+    )
+
+
+@pytest.mark.asyncio
+async def test_empty_snapshot(test_client: Client, tmp_path: Path) -> None:
+    """Test reports over a snapshot of an empty database."""
+
+    await export_snapshot(test_client, tmp_path)
+    snapshot = Snapshot.load(tmp_path)
+
+    assert snapshot.top_books() == []
+    assert snapshot.copies_on_loan() == []
+    assert snapshot.genre_fine_statistics() == []
+
+    with pytest.raises(FileNotFoundError):
+        Snapshot.load(tmp_path / "missing")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_archived_loan(tmp_path: Path) -> None:
+    """Test that fines of loans no longer in `loans` are dropped, as in SQL."""
+
+    database = tmp_path / "library.db"
+    client = Client(f"sqlite+aiosqlite:///{database}")
+    await client.create_tables()
+    await seed(client)
+
+    # As if loan 6's partition had been moved to loans_archive
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM loans WHERE loan_id = 6"))
+    engine.dispose()
+
+    await export_snapshot(client, tmp_path / "snapshot")
+    snapshot = Snapshot.load(tmp_path / "snapshot")
+    expected = await client.get_genre_fine_statistics()
+    await client.dispose()
+
+    assert snapshot.genre_fine_statistics() == expected
+    assert sum(stats.fine_count for stats in expected) == 5
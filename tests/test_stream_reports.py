@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+
+async def create_overdue_fixture(client: Client) -> datetime:
+    now = datetime.now(tz=None)
+
+    await client.create_book(book_id=1, title="Streamed Book")
+    for member_id in (1, 2, 3):
+        await client.create_member(
+            member_id=member_id,
+            name=f"Member {member_id}",
+            email=f"member{member_id}@email.com",
+            joined_at=now,
+        )
+        await client.create_copy(
+            copy_id=member_id, book_id=1, status=CopyStatus.ON_LOAN
+        )
+        loan = await client.create_loan(
+            copy_id=member_id,
+            member_id=member_id,
+            loan_date=now - timedelta(days=30),
+            due_date=now - timedelta(days=member_id),
+            status=LoanStatus.ACTIVE,
+        )
+        assert loan is not None
+        await client.create_fine(
+            fine_id=member_id,
+            member_id=member_id,
+            loan_id=loan.loan_id,
+            amount=float(member_id),
+            assessed_at=now,
+        )
+
+    return now
+
+
+@pytest.mark.asyncio
+async def test_stream_overdue_members(test_client: Client) -> None:
+    """Test that streamed overdue members match the materialized report."""
+
+    await create_overdue_fixture(test_client)
+
+    batches = [
+        batch async for batch in test_client.stream_overdue_members(batch_size=2)
+    ]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [tuple(row) for batch in batches for row in batch] == [
+        tuple(row) for row in await test_client.get_overdue_members()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_unpaid_fines_members(test_client: Client) -> None:
+    """Test streaming members with unpaid fines over a threshold."""
+
+    await create_overdue_fixture(test_client)
+
+    rows = [
+        tuple(row)
+        async for batch in test_client.stream_unpaid_fines_members(
+            min_total=2.0, batch_size=1
+        )
+        for row in batch
+    ]
+
+    assert rows == [
+        (3, "Member 3", "member3@email.com", 3.0, 1),
+        (2, "Member 2", "member2@email.com", 2.0, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_member_history(test_client: Client) -> None:
+    """Test streaming a member's entire loan history."""
+
+    await create_overdue_fixture(test_client)
+
+    rows = [
+        row
+        async for batch in test_client.stream_member_history(2, batch_size=1)
+        for row in batch
+    ]
+
+    assert [(row.copy_id, row.status) for row in rows] == [(2, LoanStatus.ACTIVE)]
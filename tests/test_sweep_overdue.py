@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.models import CopyStatus, LoanStatus
+
+
+async def create_loans(client: Client, now: datetime) -> None:
+    await client.create_book(book_id=1, title="Sweep Book")
+    await client.create_member(
+        member_id=1,
+        name="Sweep Member",
+        email="sweep@email.com",
+        joined_at=now,
+    )
+
+    # Three days overdue, half a day overdue, already fined, and not yet due.
+    due_dates = [
+        now - timedelta(days=3),
+        now - timedelta(hours=12),
+        now - timedelta(days=5),
+        now + timedelta(days=1),
+    ]
+    for copy_id, due_date in enumerate(due_dates, start=1):
+        await client.create_copy(copy_id=copy_id, book_id=1, status=CopyStatus.ON_LOAN)
+        await client.create_loan(
+            copy_id=copy_id,
+            member_id=1,
+            loan_date=due_date - timedelta(days=14),
+            due_date=due_date,
+            status=LoanStatus.ACTIVE,
+        )
+
+    await client.create_fine(
+        member_id=1,
+        loan_id=3,
+        amount=1.00,
+        assessed_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep_overdue(test_client: Client) -> None:
+    """Test that past-due loans are marked overdue and fined per day."""
+
+    now = datetime.now(tz=None)
+    await create_loans(test_client, now)
+
+    result = await test_client.sweep_overdue(fine_per_day=0.25, batch_size=2, now=now)
+
+    assert result.loans_marked == 3
+    assert result.fines_created == 2
+    assert result.fines_accrued == 1
+    assert result.batches == 4
+
+    history = await test_client.get_member_history(member_id=1)
+    assert {row.loan_id: row.status for row in history} == {
+        1: LoanStatus.OVERDUE,
+        2: LoanStatus.OVERDUE,
+        3: LoanStatus.OVERDUE,
+        4: LoanStatus.ACTIVE,
+    }
+
+    unpaid = await test_client.get_unpaid_fines_members()
+    assert [tuple(row) for row in unpaid] == [
+        (1, "Sweep Member", "sweep@email.com", 0.75 + 0.25 + 1.25, 3),
+    ]
+
+    overdue = await test_client.get_overdue_members()
+    assert [row.overdue_count for row in overdue] == [3]
+
+
+@pytest.mark.asyncio
+async def test_sweep_overdue_idempotent(test_client: Client) -> None:
+    """Test that fines accrue on later sweeps but never twice for a day."""
+
+    now = datetime.now(tz=None)
+    await create_loans(test_client, now)
+
+    await test_client.sweep_overdue(now=now)
+    result = await test_client.sweep_overdue(now=now + timedelta(days=2))
+
+    assert result.loans_marked == 1
+    assert result.fines_created == 1
+    assert result.fines_accrued == 3
+
+    unpaid = await test_client.get_unpaid_fines_members()
+    assert [(row.total_unpaid, row.unpaid_fine_count) for row in unpaid] == [
+        (2.50 + 1.50 + 3.50 + 0.50, 4)
+    ]
+
+    result = await test_client.sweep_overdue(now=now + timedelta(days=2))
+
+    assert result.loans_marked == 0
+    assert result.fines_created == 0
+    assert result.fines_accrued == 0
+    assert await test_client.check_member_balances() == []
+
+
+@pytest.mark.asyncio
+async def test_sweep_overdue_after_payment(test_client: Client) -> None:
+    """Test that a loan still overdue after its fine is paid is fined again."""
+
+    now = datetime.now(tz=None)
+    await create_loans(test_client, now)
+    await test_client.sweep_overdue(now=now)
+
+    assert await test_client.pay_fine(fine_id=1) is True
+    result = await test_client.sweep_overdue(now=now + timedelta(days=1))
+
+    assert result.fines_created == 1
+    assert result.fines_accrued == 2
+
+    unpaid = await test_client.get_unpaid_fines_members()
+    assert [(row.total_unpaid, row.unpaid_fine_count) for row in unpaid] == [
+        (2.00 + 1.00 + 0.50, 3)
+    ]
+    assert await test_client.check_member_balances() == []
+
+
+@pytest.mark.asyncio
+async def test_end_overdue_loan(test_client: Client) -> None:
+    """Test that a loan marked overdue can still be returned."""
+
+    now = datetime.now(tz=None)
+    await create_loans(test_client, now)
+    await test_client.sweep_overdue(now=now)
+
+    assert await test_client.end_loan(loan_id=1) is True
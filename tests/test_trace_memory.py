@@ -0,0 +1,66 @@
+import tracemalloc
+from collections.abc import Iterator
+
+import pytest
+
+from sjsu_cmpe180b_f25.client import Client
+from sjsu_cmpe180b_f25.memory import MemoryTracer
+from sjsu_cmpe180b_f25.population import populate_db
+from sjsu_cmpe180b_f25.reports import run_reports, top_books_report
+
+
+@pytest.fixture
+def tracer() -> Iterator[MemoryTracer]:
+    tracer = MemoryTracer()
+    tracer.start()
+    yield tracer
+    tracer.stop()
+
+
+def test_memory_phase(tracer: MemoryTracer) -> None:
+    """Test that a phase's peak covers memory it freed and its kept memory
+    only what it held on to.
+    """
+
+    kept = [bytearray(1000) for _ in range(100)]
+    freed = [bytearray(1000) for _ in range(1000)]
+    del freed
+    phase = tracer.phase("allocate", rows=len(kept))
+
+    assert phase.retained >= 100_000
+    assert phase.peak >= 1_000_000
+    assert phase.bytes_per_row is not None
+    assert phase.bytes_per_row >= 10_000
+    assert phase.top
+    assert tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_trace_memory_phases(test_client: Client, tracer: MemoryTracer) -> None:
+    """Test that population and reports mark a phase per table and report."""
+
+    await populate_db(
+        test_client,
+        num_authors=10,
+        num_books=10,
+        num_members=10,
+        copies_per_book=2,
+        num_loans=10,
+        tracer=tracer,
+    )
+    await run_reports([top_books_report(test_client, 5)], tracer=tracer)
+
+    phases = {phase.name: phase for phase in tracer.phases}
+    assert list(phases) == [
+        "populate authors",
+        "populate books",
+        "populate members",
+        "populate copies",
+        "populate loans",
+        "report top-books",
+    ]
+    assert phases["populate authors"].rows == 10
+    # Loans are random, so fewer than five books may have been loaned
+    top_books = await test_client.get_top_books(5)
+    assert phases["report top-books"].rows == len(top_books)
+    assert "report top-books" in tracer.summary()